@@ -11,7 +11,14 @@ setuptools.setup(
     description = "Package containing data aquisition modules.",
     long_description = long_description,
     long_description_content_type = "text/markdown",
-    packages = setuptools.find_packages(),
+    # The modules import each other as 'collector.packages'
+    packages = ["collector.packages"],
+    package_dir = {"collector.packages": "src/example_data_aquisition_package"},
+    entry_points = {
+        "console_scripts": [
+            "collector = collector.packages.cli:main",
+        ],
+    },
     url = "https://test.pypi.org/project/_example_data_aquisition_package/",
     project_urls = {
         "Bug Tracker": "https://github.com/OR98/example_data_aquisition_package/issues",
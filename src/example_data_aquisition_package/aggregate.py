@@ -1,15 +1,120 @@
 # !/usr/bin/env python
 
-import glob
-import json
-from json import JSONDecodeError
 import os
 import sys
 import time
 sys.path.append('..')
 
 
-from collector.packages.save import save_data
+from collector.packages.catalog import count_records, get_checksum, list_files, register_file
+from collector.packages.dedupe import ReviewDeduplicator, deduplicate_reviews
+from collector.packages.delta import ReviewsDelta, write_products_delta
+from collector.packages.index import write_indexed_json
+from collector.packages.ledger import end_run, start_run
+from collector.packages.metrics import CORRUPT_FILES
+from collector.packages.normalize import denormalize_reviews, is_normalized, normalize_reviews
+from collector.packages.records import to_records
+from collector.packages.save import (atomic_write, iter_segment_records, load_json_file, save_data,
+                                     write_json_array)
+from collector.packages.serializer import check_records, dumps, loads
+from collector.packages.utils import convert_n_reviews_to_int
+
+
+def iter_saved_data(folder_path, corrupt_files=None, data_type=None):
+    """Iterates the data saved in a folder, from its JSON files (compressed or not)
+    and its segments.
+
+    The JSON files and the segment records which can't be decoded, or which don't
+    match the schema of `data_type`, are skipped and appended to `corrupt_files`.
+    The normalized reviews are joined with their products.
+
+    Args:
+        folder_path (str): path of the folder.
+        corrupt_files (list): list to which the corrupt files (and the segment records,
+                              as 'path@offset') are appended.
+        data_type (str): data type of the records, checked against its schema if given.
+
+    Yields:
+        object, Data of each save.
+    """
+
+    for file_path in list_files(folder_path=folder_path):
+        yield from iter_file_data(file_path=file_path, corrupt_files=corrupt_files,
+                                  data_type=data_type)
+
+
+def iter_file_data(file_path, corrupt_files=None, data_type=None):
+    """Iterates the data saved in a JSON file (one save) or a segment (one save per record).
+
+    Args:
+        file_path (str): path of the file.
+        corrupt_files (list): list to which the file (or the segment records, as
+                              'path@offset') is appended if it is corrupt.
+        data_type (str): data type of the records, checked against its schema if given.
+
+    Yields:
+        object, Data of each save.
+    """
+
+    if file_path.endswith('.segment.jsonl'):
+        corrupt_records = []
+        for data in iter_segment_records(segment_path=file_path,
+                                         corrupt_records=corrupt_records,
+                                         data_type=data_type):
+            yield denormalize_saved_data(data, data_type=data_type)
+        if corrupt_files is not None:
+            corrupt_files.extend(f"{path}@{offset}" for path, offset in corrupt_records)
+        return
+
+    try:
+        data = load_json_file(file_path=file_path, data_type=data_type)
+        data = denormalize_saved_data(data, data_type=data_type)
+    except (ValueError, OSError, EOFError):
+        if corrupt_files is not None:
+            corrupt_files.append(file_path)
+        return
+    yield data
+
+
+def denormalize_saved_data(data, data_type=None):
+    """Joins saved data with its products if it is a normalized reviews document.
+
+    Args:
+        data (object): saved data.
+        data_type (str): data type of the records, checked against its schema if given.
+
+    Returns:
+        object, Saved data, the review dictionaries if it was normalized.
+    """
+
+    if not is_normalized(data):
+        return data
+
+    reviews_dicts = denormalize_reviews(data)
+    if data_type is not None:
+        check_records(reviews_dicts, data_type=data_type)
+
+    return reviews_dicts
+
+
+def report_corrupt_files(corrupt_files, folder_path):
+    """Reports the corrupt files found while aggregating a folder.
+
+    Args:
+        corrupt_files (list[str]): corrupt files (and segment records) of the folder.
+        folder_path (str): path of the folder.
+    """
+
+    if not corrupt_files:
+        return
+
+    CORRUPT_FILES.inc(len(corrupt_files))
+    print(f"[LOG] [CORRUPT] {len(corrupt_files)} corrupt or partial files have been skipped "
+          f"in {folder_path}:")
+    for corrupt_file in corrupt_files[:20]:
+        print(f"[LOG] [CORRUPT] {corrupt_file}")
+    if len(corrupt_files) > 20:
+        print(f"[LOG] [CORRUPT] ... and {len(corrupt_files) - 20} more.")
 
 
 def aggregate_new_urls(source_dict, 
@@ -24,12 +129,17 @@ def aggregate_new_urls(source_dict,
     """
 
     print("[LOG] Start to aggregate new URLs.")
+    start_run(run_type='aggregate_new_urls', source=source_dict['source'])
 
     # Load and aggregate the new URLs
     new_urls_dicts = []
-    for new_url_dicts_file in glob.glob(os.path.join(new_urls_folder_path, '*.json')):
-        for new_url_dict in json.load(open(new_url_dicts_file, 'r', encoding='utf8')):
+    corrupt_files = []
+    for new_url_dicts in iter_saved_data(folder_path=new_urls_folder_path,
+                                         corrupt_files=corrupt_files,
+                                         data_type='new_urls'):
+        for new_url_dict in new_url_dicts:
             new_urls_dicts.append(new_url_dict)
+    report_corrupt_files(corrupt_files=corrupt_files, folder_path=new_urls_folder_path)
 
     # Save the aggregated new URLs in 'aggregated_urls' folder
     save_data(data=new_urls_dicts, 
@@ -40,6 +150,7 @@ def aggregate_new_urls(source_dict,
     print("[LOG] The new URLs files have been aggregated.")
     print(f"[LOG] {len(new_urls_dicts)} aggregated URLs have been saved "
            "in 'aggregated_urls' folder.")
+    end_run(n_urls=len(new_urls_dicts))
 
 
 def remove_duplicates(dicts, key):
@@ -152,9 +263,13 @@ def filter_urls(source_dict,
 
     # Load and aggregate the new URLs
     new_urls_dicts = []
-    for new_url_dicts_file in glob.glob(os.path.join(new_urls_folder_path, '*.json')):
-        for new_url_dict in json.load(open(new_url_dicts_file, 'r', encoding='utf8')):
+    corrupt_files = []
+    for new_url_dicts in iter_saved_data(folder_path=new_urls_folder_path,
+                                         corrupt_files=corrupt_files,
+                                         data_type='new_urls'):
+        for new_url_dict in new_url_dicts:
             new_urls_dicts.append(new_url_dict)
+    report_corrupt_files(corrupt_files=corrupt_files, folder_path=new_urls_folder_path)
 
     # Filter the new URLs
     # Remove the duplicates
@@ -199,7 +314,8 @@ def generate_urls_to_collect_dicts(filtered_urls_dicts):
 
     Returns:
         list[dict], List of dictionaries containing the product urls, 
-                    their category, and whether they have been collected.
+                    their category, and whether they have been collected, with
+                    their number of reviews when the new URLs have one.
     """
 
     urls_to_collect_dicts = [
@@ -209,6 +325,11 @@ def generate_urls_to_collect_dicts(filtered_urls_dicts):
         }
         for u in filtered_urls_dicts
     ]
+
+    # Keep the number of reviews of the products-listing pages to forecast the collect
+    for url_to_collect_dict, u in zip(urls_to_collect_dicts, filtered_urls_dicts):
+        if u.get('n_reviews') is not None:
+            url_to_collect_dict['n_reviews'] = convert_n_reviews_to_int(u['n_reviews'])
     
     return urls_to_collect_dicts
 
@@ -231,9 +352,8 @@ def generate_urls_to_collect(source_dict,
     print(f"[LOG] Filtered URLs object name: {filtered_urls_dicts_object_name}.")
    
     # Load the filtered URLs
-    with open(os.path.join(filtered_urls_dicts_object_name),
-              encoding='utf-8') as file_to_open:
-        filtered_urls_dicts = json.load(file_to_open)
+    with open(os.path.join(filtered_urls_dicts_object_name), 'rb') as file_to_open:
+        filtered_urls_dicts = loads(file_to_open.read())
     print(f"[LOG] There are {len(filtered_urls_dicts)} filtered URLs.")
 
     # Generate the URLs to collect
@@ -273,67 +393,169 @@ def generate_urls_to_collect(source_dict,
 
 def aggregate_products_files(source_dict,
                              products_folder_path, 
-                             aggregated_products_folder_path):
+                             aggregated_products_folder_path,
+                             compact_records=False,
+                             offset_index=False,
+                             delta_feed=False):
     """Aggregates the collected products files.
     
     Args:
         source (str): name of the source.
         products_folder_path (str): path to the products data files folder.
         aggregated_products_folder_path (str): path to the aggregated products folder.
+        compact_records (bool): to hold the products as compact records, saved without
+                                their None fields (see `records.Record`).
+        offset_index (bool): to write the offset index and the key index of the aggregated
+                             file, read by `index.IndexedJsonReader`.
+        delta_feed (bool): to write the new and changed products since the previous
+                           aggregation in the 'delta' folder of the aggregated products.
     """
 
     print("[LOG] Start to aggregate products files.")
+    start_run(run_type='aggregate_products', source=source_dict['source'])
     
     products_files = []
     
-    for products_file in glob.glob(os.path.join(products_folder_path, '*.json')):
-        try:
-            with open(products_file, 'r', encoding='utf8') as f:
-                open_product_file = json.load(f)
-                products_files.append(open_product_file)
-        except JSONDecodeError:
-            pass
+    corrupt_files = []
+    for open_product_file in iter_saved_data(folder_path=products_folder_path,
+                                             corrupt_files=corrupt_files,
+                                             data_type='products'):
+        if compact_records:
+            open_product_file = to_records(open_product_file, data_type='products')
+        products_files.append(open_product_file)
+    report_corrupt_files(corrupt_files=corrupt_files, folder_path=products_folder_path)
 
     aggregated_products_file_name = os.path.join(
         aggregated_products_folder_path, 
         f"{time.strftime('%Y_%m_%d_%H_%M_%S')}_aggregated_products_{source_dict['source']}.json")
     
-    with open(aggregated_products_file_name, 'w', encoding='utf-8') as file_to_dump:
-        json.dump(products_files, file_to_dump, indent=4, ensure_ascii=False)
+    if offset_index:
+        _, n_bytes, checksum = write_indexed_json(file_path=aggregated_products_file_name,
+                                                  records=products_files)
+    else:
+        content = dumps(products_files)
+        atomic_write(file_path=aggregated_products_file_name, content=content)
+        n_bytes, checksum = len(content), get_checksum(content)
+    register_file(file_path=aggregated_products_file_name,
+                  n_records=count_records(products_files),
+                  n_bytes=n_bytes,
+                  checksum=checksum)
+    if delta_feed:
+        write_products_delta(file_path=aggregated_products_file_name,
+                             products_files=products_files,
+                             source=source_dict['source'],
+                             delta_folder_path=os.path.join(aggregated_products_folder_path, 'delta'))
     
     print("[LOG] The products files have been aggregated.")
     print(f"[LOG] There are {len(products_files)} aggregated products.")
+    end_run(n_records_aggregated=len(products_files))
+
+
+def iter_aggregated_reviews(reviews_folder_path, compact_records=False, deduplicator=None):
+    """Iterates the reviews of the collected reviews files, one at a time, so that the
+    aggregation streams them to the aggregated file instead of holding them in memory.
+
+    Args:
+        reviews_folder_path (str): path to the reviews data files folder.
+        compact_records (bool): to yield the reviews as compact records.
+        deduplicator (ReviewDeduplicator): deduplicator dropping the reviews already
+                                           yielded, none if None. It is closed at the end.
+
+    Returns:
+        generator, Reviews.
+    """
+
+    corrupt_files = []
+    for reviews_dicts in iter_saved_data(folder_path=reviews_folder_path,
+                                         corrupt_files=corrupt_files,
+                                         data_type='reviews'):
+        if deduplicator is not None:
+            reviews_dicts = deduplicate_reviews(reviews_dicts=reviews_dicts,
+                                                deduplicator=deduplicator)
+        if compact_records:
+            reviews_dicts = to_records(reviews_dicts, data_type='reviews')
+        yield from reviews_dicts
+    report_corrupt_files(corrupt_files=corrupt_files, folder_path=reviews_folder_path)
+    if deduplicator is not None:
+        print(f"[LOG] {deduplicator.n_duplicates} duplicate reviews have been dropped.")
+        deduplicator.close()
 
 
 def aggregate_reviews_files(source_dict,
                             reviews_folder_path, 
-                            aggregated_reviews_folder_path):
+                            aggregated_reviews_folder_path,
+                            compact_records=False,
+                            normalized_output=False,
+                            deduplicate=False,
+                            max_memory_hashes=5_000_000,
+                            offset_index=False,
+                            delta_feed=False):
     """Aggregates the collected reviews files.
+
+    The reviews are streamed from the collected files to the aggregated file, so that
+    only the reviews of one collected file are in memory at a time (plus the review hashes
+    of the deduplication and of the delta feed). The normalized output groups the reviews
+    by product, so it still holds all the reviews in memory.
     
     Args:
         source_dict (str): name of the source.
         reviews_folder_path (str): path to the reviews data files folder.
         aggregated_reviews_folder_path (str): path to the aggregated reviews folder.
+        compact_records (bool): to hold the reviews as compact records, saved without
+                                their None fields (see `records.Record`).
+        normalized_output (bool): to save the aggregated reviews as a normalized reviews
+                                  document, the product fields being stored once per
+                                  product (see `normalize.denormalize_reviews` to join them).
+        deduplicate (bool): to drop the reviews collected several times, e.g. when a
+                            product is collected again after a retry.
+        max_memory_hashes (int): number of review hashes kept in memory by the
+                                 deduplication before spilling them to disk.
+        offset_index (bool): to write the offset index and the key index of the aggregated
+                             file, read by `index.IndexedJsonReader`. The normalized
+                             reviews aren't indexed.
+        delta_feed (bool): to write the new reviews since the previous aggregation in
+                           the 'delta' folder of the aggregated reviews.
     """
 
     print("[LOG] Start to aggregate reviews files.")
+    start_run(run_type='aggregate_reviews', source=source_dict['source'])
 
-    reviews_files = []
-
-    for reviews_file in glob.glob(os.path.join(reviews_folder_path, '*.json')):
-        try:
-            with open(reviews_file, 'r', encoding='utf8') as f:
-                reviews_dicts = json.load(f)
-                reviews_files.extend(reviews_dicts)
-        except JSONDecodeError:
-            pass
+    deduplicator = ReviewDeduplicator(max_memory_hashes=max_memory_hashes) if deduplicate else None
+    reviews_files = iter_aggregated_reviews(reviews_folder_path=reviews_folder_path,
+                                            compact_records=compact_records,
+                                            deduplicator=deduplicator)
 
     aggregated_reviews_file_name = os.path.join(
         aggregated_reviews_folder_path, 
         f"{time.strftime('%Y_%m_%d_%H_%M_%S')}_aggregated_reviews_{source_dict['source']}.json")
-    
-    with open(aggregated_reviews_file_name, 'w', encoding='utf-8') as file_to_dump:
-        json.dump(reviews_files, file_to_dump, indent=4, ensure_ascii=False)
+
+    reviews_delta = ReviewsDelta(file_path=aggregated_reviews_file_name) if delta_feed else None
+    if reviews_delta is not None:
+        reviews_files = reviews_delta.iter_reviews(reviews_files)
+
+    try:
+        if normalized_output:
+            reviews_files = list(reviews_files)
+            content = dumps(normalize_reviews(reviews_files))
+            atomic_write(file_path=aggregated_reviews_file_name, content=content)
+            n_reviews, n_bytes, checksum = len(reviews_files), len(content), get_checksum(content)
+        elif offset_index:
+            n_reviews, n_bytes, checksum = write_indexed_json(file_path=aggregated_reviews_file_name,
+                                                              records=reviews_files)
+        else:
+            n_reviews, n_bytes, checksum = write_json_array(file_path=aggregated_reviews_file_name,
+                                                            records=reviews_files)
+    finally:
+        if reviews_delta is not None:
+            reviews_delta.close()
+    register_file(file_path=aggregated_reviews_file_name,
+                  n_records=n_reviews,
+                  n_bytes=n_bytes,
+                  checksum=checksum)
+    if reviews_delta is not None:
+        reviews_delta.write(source=source_dict['source'],
+                            delta_folder_path=os.path.join(aggregated_reviews_folder_path, 'delta'))
 
     print("[LOG] The reviews files have been aggregated.")
-    print(f"[LOG] There are {len(reviews_files)} aggregated reviews.")
+    print(f"[LOG] There are {n_reviews} aggregated reviews.")
+    end_run(n_records_aggregated=n_reviews)
@@ -0,0 +1,663 @@
+#!/usr/bin/env python
+
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append('..')
+
+from collector.packages import serializer
+from collector.packages.init_dicts import init_review_dict
+from collector.packages.records import to_records
+
+
+# Commands of the collector command line which don't use a browser
+NON_BROWSER_COMMANDS = ['filter', 'generate', 'progress', 'aggregate', 'clean']
+
+# Modules imported by each non-browser command
+COMMANDS_MODULES = {
+    'filter': 'collector.packages.aggregate',
+    'generate': 'collector.packages.aggregate',
+    'progress': 'collector.packages.collect',
+    'aggregate': 'collector.packages.aggregate',
+    'clean': 'collector.packages.cleaning',
+}
+
+# Modules which mustn't be imported by the non-browser commands
+HEAVY_MODULES = ['selenium', 'psutil', 'pandas']
+
+# Cases of the pipeline benchmark, each run in a process of its own for its peak RSS
+PIPELINE_CASES = ['filter_urls', 'remove_duplicates', 'remove_elements_with_keywords',
+                  'select_elements_with_keywords', 'generate_urls_to_collect', 'aggregate_new_urls',
+                  'aggregate_products_files', 'aggregate_reviews_files',
+                  'evaluate_collect_progression']
+
+# Configurations of the end-to-end benchmark: tabs of one browser and pool of warm drivers
+END_TO_END_CONFIGURATIONS = [
+    {'name': 'browser_per_page', 'n_tabs': 1, 'driver_pool': False},
+    {'name': 'driver_pool', 'n_tabs': 1, 'driver_pool': True},
+    {'name': 'tabs_4', 'n_tabs': 4, 'driver_pool': False},
+    {'name': 'tabs_4_driver_pool', 'n_tabs': 4, 'driver_pool': True},
+]
+
+# Differences with the baseline below which a case doesn't regress, whatever its ratio,
+# so that the timer and allocator noise of the short cases isn't reported
+MIN_WALL_TIME_DIFFERENCE = 0.05
+MIN_PEAK_RSS_DIFFERENCE_MB = 16
+
+
+def run_python(code_or_argv, n_runs=1):
+    """Runs a Python subprocess and measures its wall time.
+
+    Args:
+        code_or_argv (str | list): code to run with `-c`, or arguments of the interpreter.
+        n_runs (int): number of runs.
+
+    Returns:
+        tuple, Median wall time in seconds and output of the last run.
+    """
+
+    argv = ['-c', code_or_argv] if isinstance(code_or_argv, str) else code_or_argv
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+
+    wall_times = []
+    for _ in range(n_runs):
+        start_time = time.perf_counter()
+        completed_process = subprocess.run([sys.executable] + argv, env=env,
+                                           capture_output=True, text=True)
+        wall_times.append(time.perf_counter() - start_time)
+
+    return statistics.median(wall_times), completed_process.stdout
+
+
+def benchmark_cli_startup(commands=NON_BROWSER_COMMANDS, n_runs=10, max_startup_time=0.1):
+    """Measures the startup time of the collector command line commands.
+
+    The startup time is the wall time of a process importing the command line and
+    the modules of the command and building the parser, minus the startup time of
+    the bare interpreter.
+
+    Args:
+        commands (list): commands to measure.
+        n_runs (int): number of runs per command, the median is kept.
+        max_startup_time (float): startup time in seconds not to exceed.
+
+    Returns:
+        dict, Startup time in seconds and heavy modules imported for each command.
+    """
+
+    interpreter_time, _ = run_python('pass', n_runs=n_runs)
+    print(f"[LOG] [BENCHMARK] Interpreter startup: {1000 * interpreter_time:.1f} ms.")
+
+    results_dict = {}
+    for command in commands:
+        # Import the modules of the command, build the parser and list the heavy modules
+        command_time, output = run_python(
+            "import json, sys\n"
+            "import collector.packages.cli as cli\n"
+            f"import {COMMANDS_MODULES[command]}\n"
+            "cli.get_arg_parser()\n"
+            f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))",
+            n_runs=n_runs)
+        heavy_modules = json.loads(output.strip().splitlines()[-1]) if output.strip() else None
+
+        startup_time = max(0.0, command_time - interpreter_time)
+        results_dict[command] = {
+            'startup_time': round(startup_time, 4),
+            'heavy_modules': heavy_modules,
+            'passed': startup_time < max_startup_time and not heavy_modules,
+        }
+        print(f"[LOG] [BENCHMARK] '{command}' startup: {1000 * startup_time:.1f} ms, "
+              f"heavy modules imported: {heavy_modules}.")
+
+    return results_dict
+
+
+def generate_reviews_dicts(n_reviews=2000, text_length=600):
+    """Generates review dictionaries of the size of the collected ones.
+
+    Args:
+        n_reviews (int): number of reviews.
+        text_length (int): number of characters of the review texts.
+
+    Returns:
+        list[dict], Review dictionaries.
+    """
+
+    source_dict = {'source': 'benchmark', 'country': 'France', 'language': 'fr'}
+    words = ['très', 'bon', 'produit', 'crème', 'peau', 'sèche', 'texture', 'légère', 'odeur',
+             'agréable', 'efficace', 'prix', 'élevé', 'je', 'recommande', 'flacon', 'pratique']
+
+    reviews_dicts = []
+    for i in range(n_reviews):
+        review_dict = init_review_dict(source_dict)
+        text = ' '.join(words[(i + j) % len(words)] for j in range(text_length // 6))
+        review_dict.update({
+            'id': i,
+            'product_name': f"Crème hydratante {i % 50}",
+            'product_brand': f"Marque {i % 7}",
+            'url': f"https://www.example.com/produit/{i % 50}",
+            'code_source': str(100000 + i % 50),
+            'writer_pseudo': f"utilisateur_{i}",
+            'writer_information_dict': {'age': f"{20 + i % 40} ans", 'skin': 'mixte'},
+            'review_rating': str(1 + i % 5),
+            'review_date': f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            'review_title': text[:40],
+            'review_text': text[:text_length],
+            'utility_yes': str(i % 13),
+            'utility_no': str(i % 3),
+            'verified_purchase': 'true',
+        })
+        reviews_dicts.append(review_dict)
+
+    return reviews_dicts
+
+
+def benchmark_serializers(file_path=None, n_reviews=2000, n_runs=5):
+    """Compares the encode and decode times and the sizes of the serializer backends.
+
+    Args:
+        file_path (str): reviews file to benchmark, generated reviews if None.
+        n_reviews (int): number of generated reviews, without file.
+        n_runs (int): number of runs per backend and format, the median is kept.
+
+    Returns:
+        dict, Encode and decode times in seconds and size in bytes for each backend and format.
+    """
+
+    if file_path is not None:
+        with open(file_path, 'rb') as file_to_open:
+            data = serializer.loads(file_to_open.read(), backend='json')
+    else:
+        data = generate_reviews_dicts(n_reviews=n_reviews)
+    print(f"[LOG] [BENCHMARK] Serializers on {len(data)} records.")
+
+    results_dict = {}
+    for backend in serializer.get_available_backends():
+        for pretty in [True, False]:
+            encode_times, decode_times = [], []
+            for _ in range(n_runs):
+                start_time = time.perf_counter()
+                content = serializer.dumps(data, pretty=pretty, backend=backend)
+                encode_times.append(time.perf_counter() - start_time)
+                start_time = time.perf_counter()
+                serializer.loads(content, backend=backend)
+                decode_times.append(time.perf_counter() - start_time)
+
+            key = f"{backend} ({'pretty' if pretty else 'compact'})"
+            results_dict[key] = {
+                'encode_time': round(statistics.median(encode_times), 4),
+                'decode_time': round(statistics.median(decode_times), 4),
+                'n_bytes': len(content),
+            }
+            print(f"[LOG] [BENCHMARK] {key}: encode {1000 * results_dict[key]['encode_time']:.1f} ms, "
+                  f"decode {1000 * results_dict[key]['decode_time']:.1f} ms, "
+                  f"{len(content) / 1024 / 1024:.2f} MB.")
+
+    return results_dict
+
+
+def benchmark_records_memory(n_reviews=20000):
+    """Compares the memory of the reviews held as dictionaries and as compact records.
+
+    Args:
+        n_reviews (int): number of generated reviews.
+
+    Returns:
+        dict, Memory in bytes per review of the dictionaries and of the records.
+    """
+
+    # The reviews are decoded from JSON, as when they are aggregated
+    content = serializer.dumps(generate_reviews_dicts(n_reviews=n_reviews), pretty=False)
+
+    results_dict = {}
+    for name, convert in [('dicts', lambda reviews_dicts: reviews_dicts),
+                          ('records', lambda reviews_dicts: to_records(reviews_dicts, 'reviews'))]:
+        tracemalloc.start()
+        reviews = convert(serializer.loads(content))
+        n_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del reviews
+
+        results_dict[name] = round(n_bytes / n_reviews)
+        print(f"[LOG] [BENCHMARK] Reviews as {name}: {results_dict[name]} bytes per review.")
+
+    return results_dict
+
+
+def benchmark_cleaning(n_reviews=1_000_000):
+    """Measures the time of the cleaning of reviews with mixed formats of ratings,
+    counts and dates (see `cleaning.clean_records`).
+
+    Args:
+        n_reviews (int): number of generated reviews.
+
+    Returns:
+        dict, Cleaning time in seconds and cleaning report of each field.
+    """
+
+    from collector.packages.cleaning import clean_records
+
+    ratings = ['4', '4,5', '4.5/5', '3 sur 5', '', None]
+    counts = ['12', '1 234', '(56)', '1,2k', 'aucun', None]
+    dates = ['2024-01-31', '31/01/2024', '31 janvier 2024', 'January 31, 2024',
+             'Publié le 1er mars 2023', 'hier']
+    reviews_dicts = [{'review_rating': ratings[i % len(ratings)],
+                      'utility_yes': counts[i % len(counts)],
+                      'review_date': dates[i % len(dates)]} for i in range(n_reviews)]
+
+    start_time = time.perf_counter()
+    report_dict = clean_records(records=reviews_dicts)
+    cleaning_time = time.perf_counter() - start_time
+    print(f"[LOG] [BENCHMARK] Cleaning of {n_reviews} reviews: {cleaning_time:.2f} s.")
+
+    return {'cleaning_time': round(cleaning_time, 2), 'report': report_dict}
+
+
+def get_peak_rss():
+    """Gets the peak resident set size of the process in bytes, None if it is unknown."""
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def run_pipeline_case(case, folder_paths):
+    """Runs a case of the pipeline benchmark on a synthetic corpus, and prints its wall
+    time and the peak RSS of the process as JSON.
+
+    The new URLs of the filter cases are loaded before the timing. The case
+    'generate_urls_to_collect' includes the 2-second tempo of `generate_urls_to_collect`.
+
+    Args:
+        case (str): case of `PIPELINE_CASES`.
+        folder_paths (dict): folders of the synthetic corpus (see `synthetic.write_synthetic_corpus`).
+    """
+
+    from collector.packages import aggregate
+    from collector.packages.catalog import get_most_recent_file, list_files
+    from collector.packages.collect import evaluate_collect_progression
+    from collector.packages.ledger import LEDGER_FILE_ENVIRONMENT_VARIABLE
+    from collector.packages.synthetic import (KEYWORDS_FOR_REMOVING, KEYWORDS_FOR_SELECTING,
+                                              SYNTHETIC_SOURCE_DICT)
+
+    # The synthetic runs mustn't be recorded in the ledger of the collects
+    os.environ.pop(LEDGER_FILE_ENVIRONMENT_VARIABLE, None)
+
+    new_urls_dicts = None
+    if case in ('remove_duplicates', 'remove_elements_with_keywords', 'select_elements_with_keywords'):
+        new_urls_dicts = [new_url_dict for new_url_dicts in aggregate.iter_saved_data(
+            folder_path=folder_paths['new_urls'], data_type='new_urls') for new_url_dict in new_url_dicts]
+    if case == 'generate_urls_to_collect' and not list_files(folder_paths['filtered_urls'],
+                                                             data_type='filtered_urls'):
+        run_pipeline_case(case='filter_urls', folder_paths=folder_paths)
+
+    start_time = time.perf_counter()
+    if case == 'filter_urls':
+        aggregate.filter_urls(source_dict=SYNTHETIC_SOURCE_DICT,
+                              keywords_for_removing=KEYWORDS_FOR_REMOVING,
+                              keywords_for_selecting=KEYWORDS_FOR_SELECTING,
+                              new_urls_folder_path=folder_paths['new_urls'],
+                              filtered_urls_folder_path=folder_paths['filtered_urls'])
+    elif case == 'remove_duplicates':
+        aggregate.remove_duplicates(dicts=new_urls_dicts, key='url')
+    elif case == 'remove_elements_with_keywords':
+        aggregate.remove_elements_with_keywords(dicts=new_urls_dicts, keys=['product_name', 'url'],
+                                                keywords=KEYWORDS_FOR_REMOVING)
+    elif case == 'select_elements_with_keywords':
+        aggregate.select_elements_with_keywords(dicts=new_urls_dicts, keys=['product_name', 'url'],
+                                                keywords=KEYWORDS_FOR_SELECTING)
+    elif case == 'generate_urls_to_collect':
+        aggregate.generate_urls_to_collect(
+            source_dict=SYNTHETIC_SOURCE_DICT,
+            filtered_urls_dicts_object_name=get_most_recent_file(folder_paths['filtered_urls'],
+                                                                 data_type='filtered_urls'),
+            urls_to_collect_folder_path=folder_paths['urls_to_collect'],
+            urls_to_collect_anchor_folder_path=folder_paths['urls_to_collect_anchor'],
+            n_parts=1)
+    elif case == 'aggregate_new_urls':
+        aggregate.aggregate_new_urls(source_dict=SYNTHETIC_SOURCE_DICT,
+                                     new_urls_folder_path=folder_paths['new_urls'],
+                                     aggregated_urls_folder_path=folder_paths['aggregated_urls'])
+    elif case == 'aggregate_products_files':
+        aggregate.aggregate_products_files(
+            source_dict=SYNTHETIC_SOURCE_DICT,
+            products_folder_path=folder_paths['products'],
+            aggregated_products_folder_path=folder_paths['aggregated_products'])
+    elif case == 'aggregate_reviews_files':
+        aggregate.aggregate_reviews_files(
+            source_dict=SYNTHETIC_SOURCE_DICT,
+            reviews_folder_path=folder_paths['reviews'],
+            aggregated_reviews_folder_path=folder_paths['aggregated_reviews'])
+    elif case == 'evaluate_collect_progression':
+        # The synthetic URLs to collect file is the oldest one, the others being generated
+        evaluate_collect_progression(urls_to_collect_object_name=list_files(
+            folder_paths['urls_to_collect'], data_type='urls_to_collect')[0])
+    else:
+        raise ValueError(f"Unknown pipeline case '{case}', expected one of {PIPELINE_CASES}.")
+    wall_time = time.perf_counter() - start_time
+
+    print(json.dumps({'wall_time': wall_time, 'peak_rss': get_peak_rss()}))
+
+
+def compare_with_baseline(results_dict, baseline_dict, tolerance=0.2):
+    """Compares the results of the pipeline benchmark with a baseline.
+
+    A case regresses when its wall time or its peak RSS increases by more than the
+    tolerance, and by more than `MIN_WALL_TIME_DIFFERENCE` seconds or
+    `MIN_PEAK_RSS_DIFFERENCE_MB` MB.
+
+    Args:
+        results_dict (dict): results of `benchmark_pipeline`.
+        baseline_dict (dict): results of a previous run.
+        tolerance (float): relative increase of the wall time or of the peak RSS above
+                           which a case is a regression.
+
+    Returns:
+        dict, Wall time and peak RSS ratios of each case of both runs, and if it regressed.
+    """
+
+    if (results_dict['n_urls'], results_dict['n_reviews']) != \
+            (baseline_dict['n_urls'], baseline_dict['n_reviews']):
+        print(f"[LOG] [BENCHMARK] The baseline has {baseline_dict['n_urls']} URLs and "
+              f"{baseline_dict['n_reviews']} reviews, the comparison is only indicative.")
+
+    comparison_dict = {}
+    for case, case_dict in results_dict['cases'].items():
+        baseline_case_dict = baseline_dict['cases'].get(case)
+        if baseline_case_dict is None:
+            continue
+        ratios = {
+            key: round(case_dict[key] / baseline_case_dict[key], 3)
+            for key in ['wall_time', 'peak_rss_mb']
+            if case_dict.get(key) is not None and baseline_case_dict.get(key)
+        }
+        min_differences = {'wall_time': MIN_WALL_TIME_DIFFERENCE,
+                           'peak_rss_mb': MIN_PEAK_RSS_DIFFERENCE_MB}
+        comparison_dict[case] = dict(ratios, regression=any(
+            ratio > 1 + tolerance and case_dict[key] - baseline_case_dict[key] > min_differences[key]
+            for key, ratio in ratios.items()))
+        print(f"[LOG] [BENCHMARK] {case}: wall time x{ratios.get('wall_time')}, "
+              f"peak RSS x{ratios.get('peak_rss_mb')} of the baseline"
+              f"{' [REGRESSION]' if comparison_dict[case]['regression'] else ''}.")
+
+    return comparison_dict
+
+
+def benchmark_pipeline(n_urls=10_000, n_reviews=100_000, folder_path=None, cases=PIPELINE_CASES,
+                       n_runs=5, baseline_file_path=None, save_baseline=False, tolerance=0.2):
+    """Benchmarks the offline pipeline on a synthetic corpus: wall time and peak RSS of
+    the filter, the generation of the URLs to collect, the aggregators and the
+    evaluation of the collect progression.
+
+    Args:
+        n_urls (int): number of new URLs of the corpus.
+        n_reviews (int): approximate number of reviews of the corpus.
+        folder_path (str): folder of the corpus, reused if it exists, a temporary
+                           folder removed after the benchmark if None.
+        cases (list[str]): cases of `PIPELINE_CASES` to run.
+        n_runs (int): number of runs per case, the median wall time and the max peak
+                      RSS are kept.
+        baseline_file_path (str): JSON file of the baseline results.
+        save_baseline (bool): to save the results as the new baseline.
+        tolerance (float): relative increase above which a case is a regression.
+
+    Returns:
+        dict, Results of each case, and comparison with the baseline if any.
+    """
+
+    from collector.packages.save import atomic_write
+    from collector.packages.synthetic import SYNTHETIC_FOLDERS, write_synthetic_corpus
+
+    temporary_folder_path = None
+    if folder_path is None:
+        folder_path = temporary_folder_path = tempfile.mkdtemp(prefix='collector_benchmark_')
+    try:
+        if os.path.isdir(os.path.join(folder_path, 'new_urls')):
+            folder_paths = {folder_name: os.path.join(folder_path, folder_name)
+                            for folder_name in SYNTHETIC_FOLDERS}
+            print(f"[LOG] [BENCHMARK] Synthetic corpus of {folder_path} reused.")
+        else:
+            folder_paths = write_synthetic_corpus(folder_path=folder_path, n_urls=n_urls,
+                                                  n_reviews=n_reviews)
+
+        results_dict = {'n_urls': n_urls, 'n_reviews': n_reviews, 'cases': {}}
+        for case in cases:
+            wall_times = []
+            peak_rss_values = []
+            for _ in range(n_runs):
+                _, output = run_python(
+                    "from collector.packages.benchmark import run_pipeline_case\n"
+                    f"run_pipeline_case(case={case!r}, folder_paths={folder_paths!r})")
+                if not output.strip():
+                    raise RuntimeError(f"The pipeline case '{case}' has failed.")
+                case_run_dict = json.loads(output.strip().splitlines()[-1])
+                wall_times.append(case_run_dict['wall_time'])
+                peak_rss_values.append(case_run_dict['peak_rss'])
+            peak_rss = max(peak_rss_values) if None not in peak_rss_values else None
+            results_dict['cases'][case] = {
+                'wall_time': round(statistics.median(wall_times), 4),
+                'peak_rss_mb': round(peak_rss / 1024 / 1024, 1) if peak_rss is not None else None,
+            }
+            print(f"[LOG] [BENCHMARK] {case}: {results_dict['cases'][case]['wall_time']:.3f} s, "
+                  f"peak RSS {results_dict['cases'][case]['peak_rss_mb']} MB.")
+    finally:
+        if temporary_folder_path is not None:
+            shutil.rmtree(temporary_folder_path, ignore_errors=True)
+
+    if baseline_file_path and os.path.exists(baseline_file_path) and not save_baseline:
+        with open(baseline_file_path, 'rb') as baseline_file:
+            baseline_dict = json.loads(baseline_file.read())
+        results_dict['comparison'] = compare_with_baseline(results_dict=results_dict,
+                                                           baseline_dict=baseline_dict,
+                                                           tolerance=tolerance)
+    if baseline_file_path and save_baseline:
+        atomic_write(file_path=baseline_file_path,
+                     content=json.dumps(results_dict, indent=2).encode('utf-8'))
+        print(f"[LOG] [BENCHMARK] Baseline saved in {baseline_file_path}.")
+
+    return results_dict
+
+
+def run_end_to_end_configuration(configuration, test_site, driver_dict, folder_path,
+                                 n_max_reviews=None):
+    """Collects the URLs and the pages of a test site with a configuration of the
+    end-to-end benchmark, and measures each stage.
+
+    Args:
+        configuration (dict): configuration of `END_TO_END_CONFIGURATIONS`.
+        test_site (TestSite): site collected.
+        driver_dict (dict): driver parameters dictionary, copied with the pool of the
+                            configuration.
+        folder_path (str): folder of the collected data.
+        n_max_reviews (int): max number of reviews to collect per product.
+
+    Returns:
+        dict, Pages per minute, wall time of each stage, driver start and quit time,
+        save functions time, site latency and statuses of the collected URLs.
+    """
+
+    from collector.packages import aggregate, metrics, save
+    from collector.packages.collect import collect_pages, collect_urls
+    from collector.packages.driver import DriverPool
+    from collector.packages.testsite import (TEST_SITE_SOURCE_DICT, save_product_page_data,
+                                             save_products_listing_page_data)
+
+    folder_paths = {folder_name: os.path.join(folder_path, folder_name)
+                    for folder_name in ['new_urls', 'urls_to_collect', 'products', 'reviews']}
+    for configuration_folder_path in folder_paths.values():
+        os.makedirs(configuration_folder_path, exist_ok=True)
+
+    driver_pool = DriverPool(max_size=1) if configuration['driver_pool'] else None
+    driver_dict = dict(driver_dict, driver_pool=driver_pool)
+    n_requests_at_start = test_site.n_requests
+    latency_seconds_at_start = test_site.latency_seconds
+    metrics_at_start = {
+        'driver_start_seconds': metrics.DRIVER_START_SECONDS.total(),
+        'driver_quit_seconds': metrics.DRIVER_QUIT_SECONDS.total(),
+        'collect_seconds': metrics.PAGE_COLLECT_SECONDS.total(),
+        'n_pages': metrics.PAGES.total(),
+    }
+
+    stages_dict = {}
+    try:
+        start_time = time.perf_counter()
+        collect_urls(save_products_listing_page_data=save_products_listing_page_data,
+                     driver_dict=driver_dict,
+                     source_dict=TEST_SITE_SOURCE_DICT,
+                     products_listing_pages_dicts=test_site.get_products_listing_pages_dicts(),
+                     new_urls_folder_path=folder_paths['new_urls'],
+                     n_tabs=configuration['n_tabs'])
+        save.close_segment_writers()
+        stages_dict['collect_urls'] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        new_urls_dicts = [new_url_dict for new_urls_dicts in aggregate.iter_saved_data(
+            folder_path=folder_paths['new_urls'], data_type='new_urls') for new_url_dict in new_urls_dicts]
+        urls_to_collect_dicts = aggregate.generate_urls_to_collect_dicts(
+            aggregate.remove_duplicates(dicts=new_urls_dicts, key='url'))
+        urls_to_collect_dicts_object_name = os.path.join(
+            folder_paths['urls_to_collect'],
+            f"{time.strftime('%Y_%m_%d_%H_%M_%S')}_urls_to_collect_{TEST_SITE_SOURCE_DICT['source']}.json")
+        save.save_urls_to_collect(urls_to_collect_dicts=urls_to_collect_dicts,
+                                  urls_to_collect_dicts_object_name=urls_to_collect_dicts_object_name)
+        stages_dict['generate_urls_to_collect'] = time.perf_counter() - start_time
+
+        # The 'issue' URLs aren't retried, their backoff delays would be measured
+        start_time = time.perf_counter()
+        collect_pages(save_product_page_data=save_product_page_data,
+                      driver_dict=driver_dict,
+                      source_dict=TEST_SITE_SOURCE_DICT,
+                      urls_to_collect_dicts_object_name=urls_to_collect_dicts_object_name,
+                      urls_to_collect_status='no',
+                      n_max_reviews=n_max_reviews,
+                      min_date_year=None,
+                      products_folder_path=folder_paths['products'],
+                      reviews_folder_path=folder_paths['reviews'],
+                      retry_issues=False,
+                      n_tabs=configuration['n_tabs'])
+        save.close_segment_writers()
+        stages_dict['collect_pages'] = time.perf_counter() - start_time
+    finally:
+        if driver_pool is not None:
+            driver_pool.close()
+
+    with open(urls_to_collect_dicts_object_name, 'rb') as urls_to_collect_file:
+        n_statuses = {}
+        for url_to_collect_dict in serializer.loads(urls_to_collect_file.read()):
+            n_statuses[url_to_collect_dict['collected']] = \
+                n_statuses.get(url_to_collect_dict['collected'], 0) + 1
+
+    n_pages = metrics.PAGES.total() - metrics_at_start['n_pages']
+    n_requests = test_site.n_requests - n_requests_at_start
+
+    return {
+        'n_urls': len(urls_to_collect_dicts),
+        'n_pages': n_pages,
+        'n_requests': n_requests,
+        'pages_per_minute': round(60 * n_pages / stages_dict['collect_pages'], 1),
+        'requests_per_minute': round(60 * n_requests / sum(stages_dict.values()), 1),
+        'stages_seconds': {stage: round(seconds, 3) for stage, seconds in stages_dict.items()},
+        'driver_start_seconds': round(metrics.DRIVER_START_SECONDS.total()
+                                      - metrics_at_start['driver_start_seconds'], 3),
+        'driver_quit_seconds': round(metrics.DRIVER_QUIT_SECONDS.total()
+                                     - metrics_at_start['driver_quit_seconds'], 3),
+        'collect_seconds': round(metrics.PAGE_COLLECT_SECONDS.total()
+                                 - metrics_at_start['collect_seconds'], 3),
+        'latency_seconds': round(test_site.latency_seconds - latency_seconds_at_start, 3),
+        'n_drivers_started': driver_pool.n_started if driver_pool is not None else None,
+        'n_statuses': n_statuses,
+    }
+
+
+def benchmark_end_to_end(n_products=100, mean_n_reviews=20, latency=0.05, error_rate=0.0,
+                         captcha_rate=0.0, driver_start_time=0.5, n_max_reviews=None,
+                         configurations=END_TO_END_CONFIGURATIONS, driver_dict=None, seed=0):
+    """Benchmarks the orchestration of `collect_urls` and `collect_pages` end to end on
+    a local test site, without network: pages per minute, wall time of each stage,
+    and time spent starting and quitting the drivers, in the save functions and
+    waiting for the site, for each number of tabs and with or without driver pool.
+
+    The site is browsed by fake drivers (see `fakedriver`) whose start takes
+    `driver_start_time`, or by the drivers of `driver_dict` (e.g. a headless Chrome)
+    through the HTTP server of the site. The data is saved in segments, as files named
+    by the second would overwrite each other at this throughput, in a temporary folder.
+
+    Args:
+        n_products (int): number of products of the site.
+        mean_n_reviews (float): mean number of reviews per product.
+        latency (float): mean seconds to serve a page.
+        error_rate (float): share of the requests answered with a server error.
+        captcha_rate (float): share of the requests answered with a captcha page.
+        driver_start_time (float): simulated seconds to start a fake driver.
+        n_max_reviews (int): max number of reviews to collect per product.
+        configurations (list[dict]): configurations of `END_TO_END_CONFIGURATIONS` to run.
+        driver_dict (dict): driver parameters dictionary of real drivers, fake drivers if None.
+        seed (int): seed of the site.
+
+    Returns:
+        dict, Results of each configuration (see `run_end_to_end_configuration`).
+    """
+
+    from collector.packages import save
+    from collector.packages.fakedriver import get_fake_driver_dict
+    from collector.packages.ledger import LEDGER_FILE_ENVIRONMENT_VARIABLE
+    from collector.packages.testsite import TestSite
+
+    test_site = TestSite(n_products=n_products, mean_n_reviews=mean_n_reviews, latency=latency,
+                         error_rate=error_rate, captcha_rate=captcha_rate, seed=seed)
+    if driver_dict is None:
+        driver_dict = get_fake_driver_dict(test_site=test_site, start_time=driver_start_time)
+    else:
+        test_site.start()
+
+    # The benchmark runs mustn't be recorded in the ledger of the collects
+    ledger_file_path = os.environ.pop(LEDGER_FILE_ENVIRONMENT_VARIABLE, None)
+    segments_settings = save.SEGMENTS_SETTINGS
+    save.enable_segments()
+    folder_path = tempfile.mkdtemp(prefix='collector_end_to_end_')
+    results_dict = {}
+    try:
+        for configuration in configurations:
+            results_dict[configuration['name']] = configuration_dict = run_end_to_end_configuration(
+                configuration=configuration,
+                test_site=test_site,
+                driver_dict=driver_dict,
+                folder_path=os.path.join(folder_path, configuration['name']),
+                n_max_reviews=n_max_reviews)
+            print(f"[LOG] [BENCHMARK] {configuration['name']}: "
+                  f"{configuration_dict['pages_per_minute']} pages/min, "
+                  f"{configuration_dict['n_requests']} requests, "
+                  f"stages {configuration_dict['stages_seconds']} s, "
+                  f"driver start {configuration_dict['driver_start_seconds']} s, "
+                  f"driver quit {configuration_dict['driver_quit_seconds']} s, "
+                  f"save functions {configuration_dict['collect_seconds']} s "
+                  f"(site latency {configuration_dict['latency_seconds']} s), "
+                  f"statuses {configuration_dict['n_statuses']}.")
+    finally:
+        save.close_segment_writers()
+        save.SEGMENTS_SETTINGS = segments_settings
+        if ledger_file_path is not None:
+            os.environ[LEDGER_FILE_ENVIRONMENT_VARIABLE] = ledger_file_path
+        test_site.stop()
+        shutil.rmtree(folder_path, ignore_errors=True)
+
+    return results_dict
+
+
+if __name__ == '__main__':
+    startup_results_dict = benchmark_cli_startup()
+    benchmark_serializers(file_path=sys.argv[1] if len(sys.argv) > 1 else None)
+    benchmark_records_memory()
+    sys.exit(0 if all(r['passed'] for r in startup_results_dict.values()) else 1)
@@ -0,0 +1,338 @@
+#!/usr/bin/env python
+
+import glob
+import gzip
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+sys.path.append('..')
+
+from collector.packages.normalize import is_normalized
+from collector.packages.serializer import loads
+
+
+# Catalog file of each folder, hidden from the '*.json' globs
+CATALOG_FILE_NAME = '.catalog.sqlite'
+
+# Data types of the files saved by the collector, the longest first for the parsing of the names
+DATA_TYPES = sorted([
+    'url_new',
+    'new_urls',
+    'products',
+    'reviews',
+    'filtered_urls',
+    'urls_to_collect',
+    'urls_to_collect_anchor',
+    'aggregated_urls',
+    'aggregated_products',
+    'aggregated_reviews',
+    'delta_products',
+    'delta_reviews',
+    'cleaned_products',
+    'cleaned_reviews',
+], key=len, reverse=True)
+
+FILE_NAME_PATTERN = re.compile(
+    r'^(\d{4}_\d{2}_\d{2}_\d{2}_\d{2}_\d{2})_(.+?)(?:\.\d+-\d+\.segment\.jsonl|\.json|\.json\.gz)$')
+
+# Extensions of the files holding saved data (JSON files, compressed or not, and segments)
+DATA_FILE_PATTERNS = ['*.json', '*.json.gz', '*.segment.jsonl']
+
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    file_name TEXT PRIMARY KEY,
+    data_type TEXT,
+    source TEXT,
+    timestamp TEXT,
+    n_records INTEGER,
+    n_bytes INTEGER,
+    checksum TEXT,
+    catalog_time REAL
+);
+CREATE INDEX IF NOT EXISTS files_data_type ON files (data_type, file_name);
+"""
+
+# Connection to the catalog of each folder
+CATALOG_CONNECTIONS = {}
+CATALOG_LOCK = threading.Lock()
+
+
+def get_catalog_connection(folder_path, create=True):
+    """Gets the connection to the catalog of a folder.
+
+    Args:
+        folder_path (str): path of the folder.
+        create (bool): to create the catalog if it doesn't exist.
+
+    Returns:
+        sqlite3.Connection, Connection to the catalog, None if it doesn't exist.
+    """
+
+    folder_path = os.path.abspath(folder_path)
+    with CATALOG_LOCK:
+        connection = CATALOG_CONNECTIONS.get(folder_path)
+        if connection is None:
+            catalog_path = os.path.join(folder_path, CATALOG_FILE_NAME)
+            if not create and not os.path.exists(catalog_path):
+                return None
+            # Several collects can save in the same folder at the same time
+            connection = sqlite3.connect(catalog_path, timeout=30, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(CATALOG_SCHEMA)
+            CATALOG_CONNECTIONS[folder_path] = connection
+
+    return connection
+
+
+def parse_file_name(file_name):
+    """Parses the timestamp, data type and source of a file name of the collector.
+
+    Args:
+        file_name (str): file name, e.g. '2024_01_31_12_00_00_products_source.json' or
+                         '2024_01_31_12_00_00_products_source.1234-0.segment.jsonl'.
+
+    Returns:
+        tuple, Timestamp, data type and source, None if they can't be parsed.
+    """
+
+    match = FILE_NAME_PATTERN.match(file_name)
+    if match is None:
+        return None, None, None
+
+    timestamp, data_type_and_source = match.groups()
+    for data_type in DATA_TYPES:
+        if data_type_and_source.startswith(data_type + '_'):
+            return timestamp, data_type, data_type_and_source[len(data_type) + 1:]
+
+    return timestamp, data_type_and_source, None
+
+
+def count_records(data):
+    """Counts the records of saved data: the items of a list, the reviews of a
+    normalized reviews document, else 1."""
+
+    if is_normalized(data):
+        return len(data['reviews'])
+
+    return len(data) if isinstance(data, list) else 1
+
+
+def get_checksum(content):
+    """Gets the checksum of the content of a file.
+
+    Args:
+        content (bytes): content of the file.
+
+    Returns:
+        str, BLAKE2b checksum of the content.
+    """
+
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def register_file(file_path, n_records, content=None, data_type=None, source=None,
+                  n_bytes=None, checksum=None):
+    """Registers a file in the catalog of its folder.
+
+    Args:
+        file_path (str): path of the file.
+        n_records (int): number of records of the file.
+        content (bytes): content of the file, for its size and checksum.
+        data_type (str): data type of the file, parsed from its name if None.
+        source (str): source of the file, parsed from its name if None.
+        n_bytes (int): size of the file, when its content isn't given.
+        checksum (str): checksum of the file, when its content isn't given.
+    """
+
+    folder_path, file_name = os.path.split(os.path.abspath(file_path))
+    timestamp, parsed_data_type, parsed_source = parse_file_name(file_name)
+
+    connection = get_catalog_connection(folder_path)
+    with CATALOG_LOCK, connection:
+        connection.execute(
+            "INSERT OR REPLACE INTO files (file_name, data_type, source, timestamp, n_records, "
+            "n_bytes, checksum, catalog_time) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (file_name, data_type or parsed_data_type, source or parsed_source, timestamp,
+             n_records, len(content) if content is not None else n_bytes,
+             get_checksum(content) if content is not None else checksum, time.time()))
+
+
+def unregister_files(folder_path, file_names):
+    """Removes files from the catalog of their folder.
+
+    Args:
+        folder_path (str): path of the folder.
+        file_names (list[str]): names of the files to remove.
+    """
+
+    connection = get_catalog_connection(folder_path)
+    with CATALOG_LOCK, connection:
+        connection.executemany("DELETE FROM files WHERE file_name = ?",
+                               [(file_name,) for file_name in file_names])
+
+
+def list_files(folder_path, data_type=None):
+    """Lists the data files (JSON files and segments) of a folder from its catalog,
+    sorted by name (so by date).
+
+    Without catalog, the folder is globbed. The catalog is first updated with the files
+    it misses (see `update_catalog`), e.g. files copied in the folder or saved by a
+    source without `save_data`.
+
+    Args:
+        folder_path (str): path of the folder.
+        data_type (str): data type of the files, all the files if None.
+
+    Returns:
+        list[str], Paths of the files.
+    """
+
+    connection = get_catalog_connection(folder_path, create=False)
+    if connection is None:
+        return sorted(file_path for pattern in DATA_FILE_PATTERNS
+                      for file_path in glob.glob(os.path.join(folder_path, pattern)))
+
+    update_catalog(folder_path=folder_path)
+    with CATALOG_LOCK:
+        rows = connection.execute(
+            "SELECT file_name FROM files WHERE (? IS NULL OR data_type = ?) ORDER BY file_name",
+            (data_type, data_type)).fetchall()
+
+    return [os.path.join(folder_path, file_name) for file_name, in rows]
+
+
+def get_most_recent_file(folder_path, data_type=None):
+    """Gets the most recent JSON file of a folder from its catalog, updated first with
+    the files it misses (see `update_catalog`).
+
+    Without catalog, or when the file of the catalog has been removed, the folder
+    is globbed.
+
+    Args:
+        folder_path (str): path of the folder.
+        data_type (str): data type of the file, any type if None.
+
+    Returns:
+        str, Path of the most recent file, None if the folder has no file.
+    """
+
+    connection = get_catalog_connection(folder_path, create=False)
+    if connection is not None:
+        update_catalog(folder_path=folder_path)
+        with CATALOG_LOCK:
+            row = connection.execute(
+                "SELECT file_name FROM files WHERE (? IS NULL OR data_type = ?) "
+                "AND file_name LIKE '%.json' ORDER BY file_name DESC LIMIT 1",
+                (data_type, data_type)).fetchone()
+        if row is not None and os.path.exists(os.path.join(folder_path, row[0])):
+            return os.path.join(folder_path, row[0])
+
+    json_files = sorted(glob.glob(os.path.join(folder_path, '*.json')))
+
+    return json_files[-1] if json_files else None
+
+
+def catalog_files(folder_path):
+    """Catalogs the data files (JSON files and segments) of a folder which aren't in its
+    catalog or have changed since they were cataloged, and removes from the catalog the
+    files which don't exist anymore.
+
+    The files are compared by name, size and modification time, so the files which
+    haven't changed since they were cataloged aren't read again.
+
+    Args:
+        folder_path (str): path of the folder.
+
+    Returns:
+        tuple, Names of the files of the folder, number of files read and number of
+        files removed from the catalog.
+    """
+
+    connection = get_catalog_connection(folder_path)
+    with CATALOG_LOCK:
+        cataloged = {file_name: (n_bytes, catalog_time) for file_name, n_bytes, catalog_time
+                     in connection.execute("SELECT file_name, n_bytes, catalog_time FROM files")}
+
+    file_names = set()
+    n_read_files = 0
+    for file_path in [file_path for pattern in DATA_FILE_PATTERNS
+                      for file_path in glob.glob(os.path.join(folder_path, pattern))]:
+        file_name = os.path.basename(file_path)
+        try:
+            file_stat = os.stat(file_path)
+        except FileNotFoundError:
+            # Removed meanwhile, e.g. by a compaction
+            continue
+        file_names.add(file_name)
+        if file_name in cataloged and cataloged[file_name][0] == file_stat.st_size \
+           and cataloged[file_name][1] >= file_stat.st_mtime:
+            continue
+
+        with open(file_path, 'rb') as file_to_open:
+            content = file_to_open.read()
+        try:
+            if file_path.endswith('.segment.jsonl'):
+                # One record per complete line of the segment
+                n_records = content.count(b'\n')
+            elif file_path.endswith('.gz'):
+                n_records = count_records(loads(gzip.decompress(content)))
+            else:
+                n_records = count_records(loads(content))
+        except (ValueError, OSError, EOFError):
+            print(f"[LOG] [CATALOG] The file {file_path} is corrupt.")
+            n_records = None
+        register_file(file_path=file_path, n_records=n_records, content=content)
+        n_read_files += 1
+
+    # Remove the files which don't exist anymore
+    removed_file_names = [file_name for file_name in cataloged if file_name not in file_names]
+    if removed_file_names:
+        unregister_files(folder_path=folder_path, file_names=removed_file_names)
+
+    return file_names, n_read_files, len(removed_file_names)
+
+
+def update_catalog(folder_path):
+    """Updates the catalog of a folder with a scan of the folder (see `catalog_files`),
+    so that the files not saved through `save_data` nor `register_file` (files of the
+    callbacks of a source, copied or restored files) are listed too.
+
+    Args:
+        folder_path (str): path of the folder.
+
+    Returns:
+        int, Number of files in the catalog.
+    """
+
+    file_names, n_read_files, n_removed_files = catalog_files(folder_path=folder_path)
+    if n_read_files or n_removed_files:
+        print(f"[LOG] [CATALOG] The catalog of {folder_path} wasn't up to date: {n_read_files} "
+              f"files added or changed, {n_removed_files} removed.")
+
+    return len(file_names)
+
+
+def rebuild_catalog(folder_path):
+    """Rebuilds the catalog of a folder from its data files (JSON files and segments).
+
+    The files whose size and modification time haven't changed since they were
+    cataloged aren't read again.
+
+    Args:
+        folder_path (str): path of the folder.
+
+    Returns:
+        int, Number of files in the catalog.
+    """
+
+    file_names, n_read_files, n_removed_files = catalog_files(folder_path=folder_path)
+
+    print(f"[LOG] [CATALOG] {len(file_names)} files cataloged in {folder_path} "
+          f"({n_read_files} read, {n_removed_files} removed).")
+
+    return len(file_names)
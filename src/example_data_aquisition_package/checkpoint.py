@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+
+import inspect
+import sys
+import time
+
+sys.path.append('..')
+
+from collector.packages.save import flush_background_writer
+
+
+def accepts_argument(function, argument_name):
+    """Checks if a function accepts an argument.
+
+    Args:
+        function (function): function to check.
+        argument_name (str): name of the argument.
+
+    Returns:
+        bool, Whether the function accepts the argument.
+    """
+
+    try:
+        parameters = inspect.signature(function).parameters
+    except (TypeError, ValueError):
+        return False
+
+    return argument_name in parameters or \
+        any(p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters.values())
+
+
+def get_checkpoint(product_page_dict):
+    """Gets the pagination checkpoint of a product page.
+
+    Args:
+        product_page_dict (dict): product page dictionary (URL to collect dictionary).
+
+    Returns:
+        dict, Checkpoint with the keys 'cursor', 'n_saved_reviews' and 'time',
+              or None if the product page has no checkpoint.
+    """
+
+    return product_page_dict.get('checkpoint')
+
+
+def get_checkpoint_cursor(product_page_dict, default=None):
+    """Gets the pagination cursor to resume the collect of a product page from.
+
+    Args:
+        product_page_dict (dict): product page dictionary (URL to collect dictionary).
+        default (object): cursor to return if the product page has no checkpoint.
+
+    Returns:
+        object, Pagination cursor saved by the last checkpoint.
+    """
+
+    checkpoint_dict = get_checkpoint(product_page_dict)
+    if checkpoint_dict is None:
+        return default
+
+    return checkpoint_dict['cursor']
+
+
+def get_checkpoint_n_saved_reviews(product_page_dict):
+    """Gets the number of reviews saved before the last checkpoint of a product page.
+
+    Args:
+        product_page_dict (dict): product page dictionary (URL to collect dictionary).
+
+    Returns:
+        int, Number of reviews saved before the checkpoint.
+    """
+
+    checkpoint_dict = get_checkpoint(product_page_dict)
+    if checkpoint_dict is None:
+        return 0
+
+    return checkpoint_dict['n_saved_reviews']
+
+
+def clear_checkpoint(product_page_dict):
+    """Removes the pagination checkpoint of a product page.
+
+    Args:
+        product_page_dict (dict): product page dictionary (URL to collect dictionary).
+    """
+
+    product_page_dict.pop('checkpoint', None)
+
+
+def make_checkpoint_function(product_page_dict, save_status, checkpoint_interval,
+                             heartbeat=None):
+    """Makes the checkpoint function given to the save function of a product page.
+
+    The save function calls `checkpoint(cursor, n_saved_reviews)` with the current
+    pagination cursor (page number, next page URL, ...) and the number of reviews it
+    has saved so far. The checkpoint is kept in the product page dictionary, next to
+    the URL status, and persisted with `save_status` at most every `checkpoint_interval`
+    seconds, once the saves of the background writer are written.
+
+    Args:
+        product_page_dict (dict): product page dictionary (URL to collect dictionary).
+        save_status (function): function persisting the URLs to collect file.
+        checkpoint_interval (float): minimum number of seconds between two persisted checkpoints.
+        heartbeat (function): function called at each checkpoint to signal progress.
+
+    Returns:
+        function, Checkpoint function.
+    """
+
+    n_resumed_reviews = get_checkpoint_n_saved_reviews(product_page_dict)
+    last_save_time = [0.0]
+
+    def checkpoint(cursor, n_saved_reviews):
+        product_page_dict['checkpoint'] = {
+            'cursor': cursor,
+            'n_saved_reviews': n_resumed_reviews + n_saved_reviews,
+            'time': time.time(),
+        }
+
+        if heartbeat is not None:
+            heartbeat()
+
+        if save_status is not None and \
+           time.time() - last_save_time[0] >= checkpoint_interval:
+            # The reviews counted by the checkpoint must be written before it is persisted
+            writer_error = flush_background_writer()
+            if writer_error is not None:
+                raise RuntimeError("The background writer has failed, the checkpoint "
+                                   "can't be persisted.") from writer_error
+            save_status()
+            last_save_time[0] = time.time()
+
+    return checkpoint
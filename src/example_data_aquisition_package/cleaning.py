@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+
+import os
+import sys
+import time
+
+sys.path.append('..')
+
+from collector.packages.aggregate import iter_file_data, report_corrupt_files
+from collector.packages.catalog import get_most_recent_file, parse_file_name, register_file
+from collector.packages.save import atomic_write
+from collector.packages.serializer import dumps
+
+
+# Parser of each field of the products and reviews
+FIELD_PARSERS = {
+    'n_reviews': 'count',
+    'utility_yes': 'count',
+    'utility_no': 'count',
+    'product_price': 'price',
+    'mean_rating': 'rating',
+    'review_rating': 'rating',
+    'review_date': 'date',
+}
+
+# Formats of the review dates, tried in this order on the dates not parsed yet
+DATE_FORMATS = ['%Y-%m-%d', '%d/%m/%Y', '%d.%m.%Y', '%d-%m-%Y', '%d/%m/%y',
+                '%d %B %Y', '%B %d, %Y', '%B %d %Y', '%d %b %Y', '%b %d, %Y']
+
+# French month names and abbreviations, replaced by the English names before parsing the dates
+FRENCH_MONTHS = {
+    'janvier': 'January', 'janv': 'January', 'février': 'February', 'fevrier': 'February',
+    'févr': 'February', 'fevr': 'February', 'mars': 'March', 'avril': 'April', 'avr': 'April',
+    'mai': 'May', 'juin': 'June', 'juillet': 'July', 'juil': 'July', 'août': 'August',
+    'aout': 'August', 'septembre': 'September', 'sept': 'September', 'octobre': 'October',
+    'oct': 'October', 'novembre': 'November', 'nov': 'November', 'décembre': 'December',
+    'decembre': 'December', 'déc': 'December', 'dec': 'December',
+}
+FRENCH_MONTHS_PATTERN = r'\b(' + '|'.join(sorted(FRENCH_MONTHS, key=len, reverse=True)) + r')\b\.?'
+
+# Number of failed values kept as examples in the report of each field
+N_FAILED_EXAMPLES = 5
+
+
+def import_pandas():
+    """Imports pandas when the cleaning stage runs, so that importing the package
+    doesn't need it.
+
+    Returns:
+        module, pandas module.
+    """
+
+    try:
+        import pandas
+    except ImportError as e:
+        raise ImportError("The cleaning stage needs pandas and NumPy: pip install pandas") from e
+
+    return pandas
+
+
+def parse_counts(values):
+    """Parses counts, e.g. '1 234 avis', '(56)', '1,2k' or 12.
+
+    Args:
+        values (pandas.Series): raw values, as strings.
+
+    Returns:
+        pandas.Series, Counts (Int64), null if they can't be parsed.
+    """
+
+    pd = import_pandas()
+
+    parts = values.str.extract(r'(\d[\d\s.,  ]*)\s*([kK])?')
+    number = parts[0].str.replace(r'[\s  ]', '', regex=True)
+    thousands = parts[1].notna()
+
+    # '1,2k' is a decimal number of thousands, '1.234' or '1,234' a number with separators
+    decimal = pd.to_numeric(number.where(thousands).str.replace(',', '.', regex=False),
+                            errors='coerce') * 1000
+    integer = pd.to_numeric(number.str.replace(r'[.,]', '', regex=True), errors='coerce')
+
+    return decimal.where(thousands, integer).round().astype('Int64')
+
+
+def parse_prices(values):
+    """Parses locale-formatted prices, e.g. '1 234,56 €', '€1,234.56' or '12.99'.
+
+    The last '.' or ',' followed by 1 or 2 digits is the decimal separator, the other
+    ones are thousands separators.
+
+    Args:
+        values (pandas.Series): raw values, as strings.
+
+    Returns:
+        pandas.Series, Prices (Float64), null if they can't be parsed.
+    """
+
+    pd = import_pandas()
+
+    number = values.str.extract(r'(\d[\d\s.,  ]*)')[0] \
+        .str.replace(r'[\s  ]', '', regex=True).str.rstrip('.,')
+    parts = number.str.extract(r'^(.*?)(?:[.,](\d{1,2}))?$')
+    integer_part = parts[0].str.replace(r'[.,]', '', regex=True)
+    decimal_part = parts[1].fillna('0')
+
+    return pd.to_numeric(integer_part + '.' + decimal_part, errors='coerce').astype('Float64')
+
+
+def parse_ratings(values):
+    """Parses ratings, e.g. '4,5', '4.5/5', '4 out of 5' or 4.
+
+    Args:
+        values (pandas.Series): raw values, as strings.
+
+    Returns:
+        pandas.Series, Ratings (Float64), null if they can't be parsed.
+    """
+
+    pd = import_pandas()
+
+    number = values.str.extract(r'(\d+(?:[.,]\d+)?)')[0].str.replace(',', '.', regex=False)
+
+    return pd.to_numeric(number, errors='coerce').astype('Float64')
+
+
+def parse_dates(values):
+    """Parses multi-format dates, e.g. '2024-01-31', '31/01/2024', '31 janvier 2024'
+    or 'January 31, 2024'.
+
+    Each format of `DATE_FORMATS` is tried on the whole column, only on the dates not
+    parsed by the previous formats.
+
+    Args:
+        values (pandas.Series): raw values, as strings.
+
+    Returns:
+        pandas.Series, Dates as 'YYYY-MM-DD' strings, null if they can't be parsed.
+    """
+
+    pd = import_pandas()
+
+    dates = values.str.strip().str.lower() \
+        .str.replace(r'^(?:publié|posté|reviewed|written)?\s*(?:le|on|in)?\s+', '', regex=True) \
+        .str.replace(r'\b1er\b', '1', regex=True) \
+        .str.replace(FRENCH_MONTHS_PATTERN, lambda match: FRENCH_MONTHS[match.group(1)], regex=True)
+    # ISO timestamps are parsed from their date
+    dates = dates.str.replace(r'^(\d{4}-\d{2}-\d{2})[t ].*$', r'\1', regex=True)
+
+    parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+    for date_format in DATE_FORMATS:
+        missing = parsed.isna() & dates.notna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(dates[missing], format=date_format, errors='coerce')
+
+    return parsed.dt.strftime('%Y-%m-%d').astype('string')
+
+
+PARSERS = {
+    'count': parse_counts,
+    'price': parse_prices,
+    'rating': parse_ratings,
+    'date': parse_dates,
+}
+
+
+def clean_records(records, fields=None, keep_raw=False):
+    """Normalizes the numeric and date fields of products or reviews, column-wise.
+
+    The distinct values of each field are parsed in bulk with the vectorized string
+    operations of pandas, and written back in the records: counts as int, prices and ratings as
+    float and dates as 'YYYY-MM-DD'. The values which can't be parsed are set to None
+    and counted in the report.
+
+    Args:
+        records (list[dict]): product or review dictionaries (or records).
+        fields (list[str]): fields to normalize, all the fields of `FIELD_PARSERS` if None.
+        keep_raw (bool): to keep the raw values in '<field>_raw' fields.
+
+    Returns:
+        dict, Report of each field: number of values, parsed values and failed values,
+        and examples of failed values.
+    """
+
+    pd = import_pandas()
+
+    report_dict = {}
+    for field in fields or list(FIELD_PARSERS):
+        raw_values = pd.Series([record.get(field) for record in records], dtype='object')
+        present = raw_values.notna()
+        if not present.any():
+            continue
+
+        # The values of a column repeat a lot (dates, ratings, counts), so only its
+        # distinct values are parsed, and the parsed values are taken from their codes
+        codes, unique_values = pd.factorize(raw_values.astype('string'))
+        parsed_unique_values = PARSERS[FIELD_PARSERS[field]](
+            pd.Series(unique_values, dtype='string'))
+        parsed = pd.Series(parsed_unique_values.array.take(codes, allow_fill=True))
+        failed = present & parsed.isna()
+        report_dict[field] = {
+            'n_values': int(present.sum()),
+            'n_parsed': int((present & parsed.notna()).sum()),
+            'n_failed': int(failed.sum()),
+            'failed_examples': raw_values[failed].drop_duplicates().head(N_FAILED_EXAMPLES).tolist(),
+        }
+
+        parsed_values = parsed.astype('object').where(parsed.notna(), None).tolist()
+        for record, raw_value, parsed_value in zip(records, raw_values.tolist(), parsed_values):
+            if raw_value is None:
+                continue
+            if keep_raw:
+                record[f"{field}_raw"] = raw_value
+            record[field] = parsed_value
+
+    return report_dict
+
+
+def print_cleaning_report(report_dict):
+    """Prints the parse failures of each field of a cleaning report."""
+
+    for field, field_report in report_dict.items():
+        print(f"[LOG] [CLEANING] {field}: {field_report['n_parsed']}/{field_report['n_values']} "
+              f"parsed, {field_report['n_failed']} failed"
+              + (f" (e.g. {field_report['failed_examples']})." if field_report['n_failed'] else "."))
+
+
+def clean_aggregated_file(file_path, data_type, cleaned_folder_path, keep_raw=False):
+    """Cleans an aggregated products or reviews file, saved in the cleaned folder as a
+    'cleaned_products' or 'cleaned_reviews' file.
+
+    Args:
+        file_path (str): path of the aggregated file.
+        data_type (str): 'products' or 'reviews'.
+        cleaned_folder_path (str): folder of the cleaned files.
+        keep_raw (bool): to keep the raw values in '<field>_raw' fields.
+
+    Returns:
+        dict, Cleaning report of each field (see `clean_records`).
+    """
+
+    # The aggregated products are saved as one list of products per collected file,
+    # which isn't checked against the products schema
+    records = []
+    corrupt_files = []
+    for data in iter_file_data(file_path=file_path, corrupt_files=corrupt_files,
+                               data_type='reviews' if data_type == 'reviews' else None):
+        for records_data in (data if isinstance(data, list) else [data]):
+            records.extend(records_data if isinstance(records_data, list) else [records_data])
+    report_corrupt_files(corrupt_files=corrupt_files, folder_path=os.path.dirname(file_path))
+
+    start_time = time.perf_counter()
+    report_dict = clean_records(records=records, keep_raw=keep_raw)
+    print(f"[LOG] [CLEANING] {len(records)} {data_type} of {os.path.basename(file_path)} "
+          f"cleaned in {time.perf_counter() - start_time:.2f} s.")
+    print_cleaning_report(report_dict)
+
+    _, _, source = parse_file_name(os.path.basename(file_path))
+    os.makedirs(cleaned_folder_path, exist_ok=True)
+    cleaned_file_path = os.path.join(
+        cleaned_folder_path, f"{time.strftime('%Y_%m_%d_%H_%M_%S')}_cleaned_{data_type}_{source}.json")
+    content = dumps(records)
+    atomic_write(file_path=cleaned_file_path, content=content)
+    register_file(file_path=cleaned_file_path, n_records=len(records), content=content)
+
+    return report_dict
+
+
+def clean_aggregated_files(aggregated_folder_path, data_type, keep_raw=False):
+    """Cleans the most recent aggregated file of a data type, in the 'cleaned' folder
+    of the aggregated files.
+
+    Returns:
+        dict, Cleaning report of each field, None if there is no aggregated file.
+    """
+
+    file_path = get_most_recent_file(folder_path=aggregated_folder_path,
+                                     data_type=f"aggregated_{data_type}")
+    if file_path is None:
+        print(f"[LOG] [CLEANING] No aggregated {data_type} file in {aggregated_folder_path}.")
+        return None
+
+    return clean_aggregated_file(file_path=file_path,
+                                 data_type=data_type,
+                                 cleaned_folder_path=os.path.join(aggregated_folder_path, 'cleaned'),
+                                 keep_raw=keep_raw)
@@ -0,0 +1,725 @@
+#!/usr/bin/env python
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+
+sys.path.append('..')
+
+from collector.packages.parser import (add_aggregate_arguments,
+                                       add_benchmark_arguments,
+                                       add_benchmark_collect_arguments,
+                                       add_catalog_arguments,
+                                       add_clean_arguments,
+                                       add_collect_pages_arguments,
+                                       add_collect_urls_arguments,
+                                       add_compact_arguments,
+                                       add_daemon_arguments,
+                                       add_create_products_listing_pages_files_arguments,
+                                       add_evaluate_collect_progression_arguments,
+                                       add_forecast_arguments,
+                                       add_generate_urls_to_collect_arguments,
+                                       add_quality_arguments,
+                                       add_query_arguments,
+                                       add_runs_arguments,
+                                       add_store_arguments,
+                                       add_synthetic_arguments,
+                                       add_testsite_arguments,
+                                       get_urls_object_name)
+from collector.packages.serializer import set_serializer
+
+
+# The source module gives the source-specific objects to the commands:
+# ** source_dict (dict): dictionary with information from the source.
+# ** driver_path (str): path to the driver.
+# ** get_driver_options (function): function returning the selenium options of the driver.
+# ** folder_paths (dict): path of each folder, with the keys 'products_listing_pages',
+#    'new_urls', 'aggregated_urls', 'filtered_urls', 'urls_to_collect',
+#    'urls_to_collect_anchor', 'products', 'reviews', 'aggregated_products'
+#    and 'aggregated_reviews'.
+# ** create_products_listing_pages_brands, save_products_listing_page_data and
+#    save_product_page_data (function): save functions of the source.
+# ** brands_page_dict (dict), brands, categories and search_keywords (list):
+#    products-listing pages of the source.
+# ** keywords_for_removing and keywords_for_selecting (list): keywords to filter the URLs.
+SOURCE_MODULE_ENVIRONMENT_VARIABLE = 'COLLECTOR_SOURCE_MODULE'
+
+# Options of the collector command line before the command, inherited by the jobs of the daemon
+GLOBAL_ARGUMENTS = ['source_module', 'ledger_file', 'json_backend', 'json_format']
+
+# Pool of warm drivers of the daemon, used by the drivers of the commands it runs
+DRIVER_POOL = None
+
+
+def load_source_module(args):
+    """Imports the source module given in the command line or in the environment.
+
+    Args:
+        args (namespace): parsed arguments.
+
+    Returns:
+        module, Source module.
+    """
+
+    source_module_name = args.source_module or os.environ.get(SOURCE_MODULE_ENVIRONMENT_VARIABLE)
+    if not source_module_name:
+        raise SystemExit(f"[LOG] [COMMAND LINE] The command '{args.command}' needs a source module "
+                         f"(--source_module or {SOURCE_MODULE_ENVIRONMENT_VARIABLE}).")
+
+    return importlib.import_module(source_module_name)
+
+
+def start_saving(args):
+    """Sets the durability of the saved data, and saves it from a background writer
+    and/or in segments if requested in the arguments.
+
+    Returns:
+        function, Function writing the data left, closing the segments and syncing the
+        saved files.
+    """
+
+    from collector.packages.save import (close_segment_writers, enable_background_writer,
+                                         enable_normalized_output, enable_segments,
+                                         set_durability, stop_background_writer)
+
+    set_durability(policy=args.durability, n_records=args.durability_n_records)
+    if args.normalized_output:
+        enable_normalized_output()
+    if args.segments:
+        enable_segments(max_segment_bytes=args.segment_max_mb * 1024 * 1024)
+    if args.background_writer:
+        enable_background_writer(max_queue_size=args.writer_queue_size, compress=args.compress)
+
+    def stop_saving():
+        # The background writer appends to the segments, so it is stopped first
+        try:
+            stop_background_writer()
+        finally:
+            close_segment_writers()
+
+    return stop_saving
+
+
+def start_quality_profiler(args):
+    """Starts the profiling of the saved products and reviews if requested in the arguments.
+
+    Returns:
+        function, Function stopping the profiler and reporting the profiled records.
+    """
+
+    if not args.quality_profile:
+        return lambda: None
+
+    from collector.packages.quality import start_quality_profiler as start_profiler
+
+    return start_profiler(report_file_path=args.quality_report_file,
+                          report_interval=args.quality_report_interval)
+
+
+def get_source_driver_dict(source_module, args):
+    """Gets the driver parameters dictionary of the source.
+
+    Args:
+        source_module (module): source module.
+        args (namespace): parsed arguments.
+
+    Returns:
+        dict, Driver parameters dictionary.
+    """
+
+    from collector.packages.driver import get_driver_dict
+
+    driver_dict = get_driver_dict(driver_path=source_module.driver_path,
+                                  options=source_module.get_driver_options(),
+                                  args=args)
+    driver_dict['driver_pool'] = DRIVER_POOL
+
+    return driver_dict
+
+
+def run_create_listing_pages(args):
+    """Runs the create-listing-pages command."""
+
+    from collector.packages.collect import create_products_listing_pages_files
+
+    source_module = load_source_module(args)
+    create_products_listing_pages_files(
+        create_products_listing_pages_brands=source_module.create_products_listing_pages_brands,
+        driver_dict=get_source_driver_dict(source_module, args),
+        brands_page_dict=source_module.brands_page_dict,
+        products_listing_pages_folder_path=source_module.folder_paths['products_listing_pages'])
+
+
+def run_collect_urls(args):
+    """Runs the collect-urls command."""
+
+    from collector.packages.collect import (collect_urls,
+                                            get_products_listing_pages_dicts_to_collect)
+    from collector.packages.metrics import start_metrics_exporter
+
+    source_module = load_source_module(args)
+    stop_metrics_exporter = start_metrics_exporter(file_path=args.metrics_file,
+                                                   port=args.metrics_port)
+    stop_saving = start_saving(args)
+    products_listing_pages_dicts = get_products_listing_pages_dicts_to_collect(
+        brands=getattr(source_module, 'brands', []),
+        categories=getattr(source_module, 'categories', []),
+        search_keywords=getattr(source_module, 'search_keywords', []),
+        args=args)
+    try:
+        collect_urls(save_products_listing_page_data=source_module.save_products_listing_page_data,
+                     driver_dict=get_source_driver_dict(source_module, args),
+                     source_dict=source_module.source_dict,
+                     products_listing_pages_dicts=products_listing_pages_dicts,
+                     new_urls_folder_path=source_module.folder_paths['new_urls'],
+                     n_tabs=args.n_tabs)
+    finally:
+        stop_saving()
+        stop_metrics_exporter()
+
+
+def run_filter(args):
+    """Runs the filter command."""
+
+    from collector.packages.aggregate import filter_urls
+
+    source_module = load_source_module(args)
+    filter_urls(source_dict=source_module.source_dict,
+                keywords_for_removing=getattr(source_module, 'keywords_for_removing', []),
+                keywords_for_selecting=getattr(source_module, 'keywords_for_selecting', []),
+                new_urls_folder_path=source_module.folder_paths['new_urls'],
+                filtered_urls_folder_path=source_module.folder_paths['filtered_urls'])
+
+
+def run_generate(args):
+    """Runs the generate command."""
+
+    from collector.packages.aggregate import generate_urls_to_collect
+
+    source_module = load_source_module(args)
+    folder_paths = source_module.folder_paths
+    generate_urls_to_collect(
+        source_dict=source_module.source_dict,
+        filtered_urls_dicts_object_name=get_urls_object_name(
+            args_urls_file_name=args.filtered_urls_file_name,
+            urls_folder_path=folder_paths['filtered_urls']),
+        urls_to_collect_folder_path=folder_paths['urls_to_collect'],
+        urls_to_collect_anchor_folder_path=folder_paths['urls_to_collect_anchor'],
+        n_parts=args.n_parts)
+
+
+def run_collect_pages(args):
+    """Runs the collect-pages command."""
+
+    from collector.packages.collect import collect_pages
+    from collector.packages.metrics import start_metrics_exporter
+    from collector.packages.tracing import start_tracing
+
+    source_module = load_source_module(args)
+    folder_paths = source_module.folder_paths
+    stop_metrics_exporter = start_metrics_exporter(file_path=args.metrics_file,
+                                                   port=args.metrics_port)
+    stop_tracing = start_tracing(trace_file_path=args.trace_file,
+                                 profile_folder_path=args.profile_folder,
+                                 n_profiled_urls=args.n_profiled_urls)
+    stop_quality_profiler = start_quality_profiler(args)
+    stop_saving = start_saving(args)
+    try:
+        collect_pages(save_product_page_data=source_module.save_product_page_data,
+                      driver_dict=get_source_driver_dict(source_module, args),
+                      source_dict=source_module.source_dict,
+                      urls_to_collect_dicts_object_name=get_urls_object_name(
+                          args_urls_file_name=args.urls_to_collect_file_name,
+                          urls_folder_path=folder_paths['urls_to_collect']),
+                      urls_to_collect_status=args.urls_to_collect_status,
+                      n_max_reviews=args.n_max_reviews,
+                      min_date_year=args.min_date_year,
+                      products_folder_path=folder_paths['products'],
+                      reviews_folder_path=folder_paths['reviews'],
+                      retry_issues=args.retry_issues,
+                      n_tabs=args.n_tabs)
+    finally:
+        stop_saving()
+        stop_quality_profiler()
+        stop_tracing()
+        stop_metrics_exporter()
+
+
+def run_progress(args):
+    """Runs the progress command.
+
+    With a URLs to collect file name, the progress of this file is displayed, else the
+    progress of all the partitions. Without source module, the URLs to collect file name
+    is a path and the folders of the partitions are given in the arguments.
+    """
+
+    from collector.packages.collect import evaluate_collect_progression
+    from collector.packages.progress import display_progress
+
+    folder_paths = {}
+    if args.source_module or os.environ.get(SOURCE_MODULE_ENVIRONMENT_VARIABLE):
+        folder_paths = load_source_module(args).folder_paths
+
+    if args.urls_to_collect_file_name:
+        if folder_paths:
+            urls_to_collect_object_name = get_urls_object_name(
+                args_urls_file_name=args.urls_to_collect_file_name,
+                urls_folder_path=folder_paths['urls_to_collect'])
+        else:
+            urls_to_collect_object_name = args.urls_to_collect_file_name
+        evaluate_collect_progression(urls_to_collect_object_name=urls_to_collect_object_name)
+        return
+
+    urls_to_collect_folder_path = args.urls_to_collect_folder or folder_paths.get('urls_to_collect')
+    if not urls_to_collect_folder_path:
+        raise SystemExit("[LOG] [COMMAND LINE] The command 'progress' needs a URLs to collect file "
+                         "name, a URLs to collect folder or a source module.")
+
+    display_progress(
+        urls_to_collect_folder_path=urls_to_collect_folder_path,
+        urls_to_collect_anchor_folder_path=(args.urls_to_collect_anchor_folder
+                                            or folder_paths.get('urls_to_collect_anchor')),
+        refresh_interval=args.refresh,
+        as_json=args.json,
+        throughput_window=args.throughput_window)
+
+
+def run_aggregate(args):
+    """Runs the aggregate command."""
+
+    from collector.packages.aggregate import (aggregate_new_urls, aggregate_products_files,
+                                              aggregate_reviews_files)
+
+    source_module = load_source_module(args)
+    folder_paths = source_module.folder_paths
+
+    if args.data_type in ('new_urls', 'all'):
+        aggregate_new_urls(source_dict=source_module.source_dict,
+                           new_urls_folder_path=folder_paths['new_urls'],
+                           aggregated_urls_folder_path=folder_paths['aggregated_urls'])
+    if args.data_type in ('products', 'all'):
+        aggregate_products_files(source_dict=source_module.source_dict,
+                                 products_folder_path=folder_paths['products'],
+                                 aggregated_products_folder_path=folder_paths['aggregated_products'],
+                                 compact_records=args.compact_records,
+                                 offset_index=args.offset_index,
+                                 delta_feed=args.delta_feed)
+    if args.data_type in ('reviews', 'all'):
+        aggregate_reviews_files(source_dict=source_module.source_dict,
+                                reviews_folder_path=folder_paths['reviews'],
+                                aggregated_reviews_folder_path=folder_paths['aggregated_reviews'],
+                                compact_records=args.compact_records,
+                                normalized_output=args.normalized_output,
+                                deduplicate=args.deduplicate,
+                                max_memory_hashes=args.dedupe_max_memory_hashes,
+                                offset_index=args.offset_index,
+                                delta_feed=args.delta_feed)
+
+
+def run_clean(args):
+    """Runs the clean command."""
+
+    from collector.packages.cleaning import clean_aggregated_files
+
+    folder_paths = load_source_module(args).folder_paths
+    for data_type in ['products', 'reviews']:
+        if args.data_type in (data_type, 'all'):
+            clean_aggregated_files(aggregated_folder_path=folder_paths[f"aggregated_{data_type}"],
+                                   data_type=data_type,
+                                   keep_raw=args.keep_raw)
+
+
+def run_runs(args):
+    """Runs the runs command."""
+
+    from collector.packages.ledger import get_ledger
+
+    ledger = get_ledger()
+    if ledger is None:
+        raise SystemExit("[LOG] [COMMAND LINE] The command 'runs' needs a ledger file "
+                         "(--ledger_file or $COLLECTOR_LEDGER_FILE).")
+
+    for run_dict in ledger.get_runs(source=args.source, run_type=args.run_type,
+                                    n_runs=args.n_runs):
+        start_time = time.strftime('%Y-%m-%d %H:%M', time.localtime(run_dict['start_time']))
+        duration = (f"{(run_dict['end_time'] - run_dict['start_time']) / 3600:.2f} h"
+                    if run_dict['end_time'] else "interrupted")
+        print(f"[LOG] [LEDGER] #{run_dict['run_id']} {run_dict['run_type']} "
+              f"{run_dict['source']} {start_time} ({duration}): {run_dict['n_urls']} URLs, "
+              f"statuses {run_dict['n_statuses']}, {run_dict['n_reviews_saved']} reviews, "
+              f"{run_dict['urls_per_hour']} URLs/h, {run_dict['reviews_per_hour']} reviews/h"
+              + (f", {run_dict['n_records_aggregated']} records aggregated."
+                 if run_dict['n_records_aggregated'] is not None else "."))
+
+
+def run_forecast(args):
+    """Runs the forecast command."""
+
+    from collector.packages.ledger import forecast_run
+
+    source = args.source
+    urls_to_collect_object_name = args.urls_to_collect_file_name
+    if args.source_module or os.environ.get(SOURCE_MODULE_ENVIRONMENT_VARIABLE):
+        source_module = load_source_module(args)
+        source = source or source_module.source_dict['source']
+        urls_to_collect_object_name = get_urls_object_name(
+            args_urls_file_name=args.urls_to_collect_file_name,
+            urls_folder_path=source_module.folder_paths['urls_to_collect'])
+    if not source:
+        raise SystemExit("[LOG] [COMMAND LINE] The command 'forecast' needs a source "
+                         "(--source or a source module).")
+
+    forecast_dict = forecast_run(urls_to_collect_object_name=urls_to_collect_object_name,
+                                 source=source,
+                                 n_max_reviews=args.n_max_reviews,
+                                 n_workers=args.n_workers)
+    if forecast_dict is not None:
+        print(f"[LOG] [LEDGER] {forecast_dict['n_urls_left']} URLs and about "
+              f"{forecast_dict['n_reviews_left']} reviews left to collect "
+              f"({forecast_dict['n_urls_without_n_reviews']} URLs without number of reviews).")
+        print(f"[LOG] [LEDGER] Cost per URL: {forecast_dict['url_cost']}.")
+        print(f"[LOG] [LEDGER] Forecast: {forecast_dict['duration_hours']} h of collect, "
+              f"{forecast_dict['wall_duration_hours']} h with {forecast_dict['n_workers']} workers.")
+
+
+def run_catalog(args):
+    """Runs the catalog command."""
+
+    from collector.packages.catalog import rebuild_catalog
+
+    folder_paths = args.folders
+    if not folder_paths:
+        folder_paths = [folder_path for folder_path in load_source_module(args).folder_paths.values()
+                        if os.path.isdir(folder_path)]
+
+    for folder_path in folder_paths:
+        rebuild_catalog(folder_path=folder_path)
+
+
+def run_store(args):
+    """Runs the store command."""
+
+    from collector.packages.store import ReviewStore
+
+    folder_paths = args.folders
+    if not folder_paths:
+        source_folder_paths = load_source_module(args).folder_paths
+        folder_paths = [source_folder_paths[folder_name]
+                        for folder_name in ['products', 'reviews', 'aggregated_products',
+                                            'aggregated_reviews']
+                        if os.path.isdir(source_folder_paths.get(folder_name, ''))]
+
+    review_store = ReviewStore(file_path=args.store_file)
+    try:
+        for folder_path in folder_paths:
+            review_store.load_folder(folder_path=folder_path)
+        print(f"[LOG] [STORE] {review_store.count()} in {args.store_file}.")
+    finally:
+        review_store.close()
+
+
+def run_query(args):
+    """Runs the query command."""
+
+    from collector.packages.serializer import dumps
+    from collector.packages.store import ReviewStore
+
+    review_store = ReviewStore(file_path=args.store_file)
+    try:
+        start_time = time.perf_counter()
+        reviews_dicts = review_store.query_reviews(code_ean=args.ean,
+                                                   code_gtin=args.gtin,
+                                                   code_source=args.code_source,
+                                                   product_brand=args.brand,
+                                                   since=args.since,
+                                                   until=args.until,
+                                                   min_rating=args.min_rating,
+                                                   max_rating=args.max_rating,
+                                                   text=args.text,
+                                                   limit=args.limit)
+        query_time = time.perf_counter() - start_time
+    finally:
+        review_store.close()
+
+    for review_dict in reviews_dicts:
+        if args.json:
+            print(dumps(review_dict, pretty=False).decode('utf-8'))
+        else:
+            print(f"[LOG] [STORE] {review_dict.get('review_date')} "
+                  f"{review_dict.get('review_rating')} {review_dict.get('product_brand')} "
+                  f"{review_dict.get('product_name')}: {review_dict.get('review_title')}")
+    print(f"[LOG] [STORE] {len(reviews_dicts)} reviews found in {1000 * query_time:.1f} ms.")
+
+
+def run_quality(args):
+    """Runs the quality command."""
+
+    from collector.packages.quality import (QualityProfiler, print_quality_report,
+                                            profile_folders, save_quality_report)
+
+    folder_paths = args.folders
+    if not folder_paths:
+        source_folder_paths = load_source_module(args).folder_paths
+        folder_paths = [source_folder_paths[folder_name]
+                        for folder_name in ['products', 'reviews', 'aggregated_products',
+                                            'aggregated_reviews']
+                        if os.path.isdir(source_folder_paths.get(folder_name, ''))]
+
+    report_dict = profile_folders(folder_paths=folder_paths,
+                                  profiler=QualityProfiler(sample_size=args.sample_size))
+    print_quality_report(report_dict)
+    if args.report_file:
+        save_quality_report(report_dict=report_dict, file_path=args.report_file)
+
+
+def run_synthetic(args):
+    """Runs the synthetic command."""
+
+    from collector.packages.synthetic import write_synthetic_corpus
+
+    write_synthetic_corpus(folder_path=args.folder,
+                           n_urls=args.n_urls,
+                           n_reviews=args.n_reviews,
+                           records_per_file=args.records_per_file,
+                           products_per_file=args.products_per_file,
+                           seed=args.seed)
+
+
+def run_benchmark(args):
+    """Runs the benchmark command."""
+
+    from collector.packages.benchmark import PIPELINE_CASES, benchmark_pipeline
+
+    results_dict = benchmark_pipeline(n_urls=args.n_urls,
+                                      n_reviews=args.n_reviews,
+                                      folder_path=args.folder,
+                                      cases=args.cases or PIPELINE_CASES,
+                                      n_runs=args.n_runs,
+                                      baseline_file_path=args.baseline_file,
+                                      save_baseline=args.save_baseline,
+                                      tolerance=args.tolerance)
+    if any(case_dict['regression'] for case_dict in results_dict.get('comparison', {}).values()):
+        raise SystemExit(1)
+
+
+def run_benchmark_collect(args):
+    """Runs the benchmark-collect command."""
+
+    from collector.packages.benchmark import END_TO_END_CONFIGURATIONS, benchmark_end_to_end
+    from collector.packages.save import atomic_write
+
+    configurations = END_TO_END_CONFIGURATIONS
+    if args.configurations:
+        configurations = [configuration for configuration in END_TO_END_CONFIGURATIONS
+                          if configuration['name'] in args.configurations]
+    results_dict = benchmark_end_to_end(n_products=args.n_products,
+                                        mean_n_reviews=args.mean_n_reviews,
+                                        latency=args.latency,
+                                        error_rate=args.error_rate,
+                                        captcha_rate=args.captcha_rate,
+                                        driver_start_time=args.driver_start_time,
+                                        n_max_reviews=args.n_max_reviews,
+                                        configurations=configurations,
+                                        seed=args.seed)
+    if args.results_file:
+        atomic_write(file_path=args.results_file,
+                     content=json.dumps(results_dict, indent=2).encode('utf-8'))
+
+
+def run_testsite(args):
+    """Runs the testsite command."""
+
+    from collector.packages.testsite import TestSite
+
+    test_site = TestSite(n_products=args.n_products,
+                         mean_n_reviews=args.mean_n_reviews,
+                         latency=args.latency,
+                         error_rate=args.error_rate,
+                         captcha_rate=args.captcha_rate,
+                         seed=args.seed)
+    test_site.start(host=args.host, port=args.port)
+    for products_listing_page_dict in test_site.get_products_listing_pages_dicts():
+        print(f"[LOG] [TEST SITE] {products_listing_page_dict['url']}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        test_site.stop()
+        print(f"[LOG] [TEST SITE] {test_site.n_requests} requests served.")
+
+
+def run_daemon(args):
+    """Runs the daemon command."""
+
+    global DRIVER_POOL
+
+    from collector.packages.daemon import get_command_job_handlers, serve
+    from collector.packages.driver import DriverPool
+
+    if args.driver_pool_size > 0:
+        DRIVER_POOL = DriverPool(max_size=args.driver_pool_size)
+    try:
+        serve(job_handlers=get_command_job_handlers(),
+              socket_path=args.socket_path,
+              port=args.port,
+              driver_pool=DRIVER_POOL,
+              global_args=args)
+    finally:
+        DRIVER_POOL = None
+
+
+def run_compact(args):
+    """Runs the compact command."""
+
+    from collector.packages.save import compact_folder
+
+    folder_paths = args.folders
+    if not folder_paths:
+        source_folder_paths = load_source_module(args).folder_paths
+        folder_paths = [source_folder_paths[folder_name]
+                        for folder_name in ['new_urls', 'products', 'reviews']]
+
+    for folder_path in folder_paths:
+        compact_folder(folder_path=folder_path,
+                       max_segment_bytes=args.segment_max_mb * 1024 * 1024,
+                       remove_files=not args.keep_files)
+
+
+# Name, help, arguments and function of each command
+COMMANDS = [
+    ('create-listing-pages', "Creates products-listing pages files.",
+     add_create_products_listing_pages_files_arguments, run_create_listing_pages),
+    ('collect-urls', "Collects product-listing pages URLs data.",
+     add_collect_urls_arguments, run_collect_urls),
+    ('filter', "Filters the new URLs.",
+     None, run_filter),
+    ('generate', "Generates the URLs to collect file(s).",
+     add_generate_urls_to_collect_arguments, run_generate),
+    ('collect-pages', "Collects product pages data.",
+     add_collect_pages_arguments, run_collect_pages),
+    ('progress', "Evaluates the collect progression.",
+     add_evaluate_collect_progression_arguments, run_progress),
+    ('aggregate', "Aggregates the collected files.",
+     add_aggregate_arguments, run_aggregate),
+    ('clean', "Parses the counts, prices, ratings and dates of the aggregated files.",
+     add_clean_arguments, run_clean),
+    ('catalog', "Rebuilds the catalog of the files of the folders.",
+     add_catalog_arguments, run_catalog),
+    ('compact', "Packs the JSON files of the folders in segments.",
+     add_compact_arguments, run_compact),
+    ('store', "Loads the new products and reviews files in the review store.",
+     add_store_arguments, run_store),
+    ('query', "Queries the reviews of the review store.",
+     add_query_arguments, run_query),
+    ('quality', "Profiles the fields of the products and reviews files.",
+     add_quality_arguments, run_quality),
+    ('synthetic', "Writes a synthetic corpus of new URLs, URLs to collect, products and reviews.",
+     add_synthetic_arguments, run_synthetic),
+    ('benchmark', "Benchmarks the offline pipeline on a synthetic corpus.",
+     add_benchmark_arguments, run_benchmark),
+    ('benchmark-collect', "Benchmarks the collect of the URLs and pages of a local test site.",
+     add_benchmark_collect_arguments, run_benchmark_collect),
+    ('testsite', "Serves a local test site of products and reviews.",
+     add_testsite_arguments, run_testsite),
+    ('runs', "Displays the most recent runs of the ledger.",
+     add_runs_arguments, run_runs),
+    ('forecast', "Forecasts the duration of the collect of a URLs to collect file.",
+     add_forecast_arguments, run_forecast),
+    ('daemon', "Runs the commands sent by `daemon.py` one at a time, with warm imports and drivers.",
+     add_daemon_arguments, run_daemon),
+]
+
+
+def get_arg_parser():
+    """Provides the parser of the collector command line with one subcommand per stage.
+
+    Returns:
+        argparse.ArgumentParser, Parser of the command line.
+    """
+
+    # Without abbreviations, the '--json' option of a command isn't taken for '--json_backend'
+    parser = argparse.ArgumentParser(prog='collector', description="Data acquisition collector.",
+                                     allow_abbrev=False)
+    parser.add_argument(
+        "--source_module",
+        help=f"Module of the source (default: ${SOURCE_MODULE_ENVIRONMENT_VARIABLE}).",
+        type=str,
+        default=None)
+    parser.add_argument(
+        "--ledger_file",
+        help="SQLite ledger of the runs (default: $COLLECTOR_LEDGER_FILE).",
+        type=str,
+        default=None)
+    parser.add_argument(
+        "--json_backend",
+        help="Backend of the JSON serializer (default: the fastest installed).",
+        type=str,
+        choices=['orjson', 'msgspec', 'json'],
+        default=None)
+    parser.add_argument(
+        "--json_format",
+        help="Format of the saved JSON files: indented ('pretty') or 'compact'.",
+        type=str,
+        choices=['pretty', 'compact'],
+        default='pretty')
+
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    for command, command_help, add_arguments, run_command in COMMANDS:
+        subparser = subparsers.add_parser(command, help=command_help, description=command_help)
+        if add_arguments is not None:
+            add_arguments(subparser)
+        subparser.set_defaults(run_command=run_command)
+
+    return parser
+
+
+def run_parsed_command(args):
+    """Runs the command of the parsed arguments, then writes the data left in the
+    background writer and syncs the saved files not synced yet by the durability policy.
+
+    Args:
+        args (namespace): parsed arguments, with the function of the command.
+    """
+
+    try:
+        args.run_command(args)
+    finally:
+        if 'collector.packages.save' in sys.modules:
+            save_module = sys.modules['collector.packages.save']
+            try:
+                save_module.stop_background_writer()
+            finally:
+                save_module.sync_saved_files()
+
+
+def main(argv=None):
+    """Runs the collector command line.
+
+    Each command only imports the modules it needs, so the commands which don't
+    use a browser don't import selenium.
+
+    Args:
+        argv (list): arguments to parse, the command line arguments if None.
+
+    Returns:
+        int, Exit code.
+    """
+
+    args = get_arg_parser().parse_args(argv)
+    print(f"[LOG] Arguments parsed: {args}")
+    if args.ledger_file:
+        from collector.packages.ledger import open_ledger
+        open_ledger(file_path=args.ledger_file)
+    set_serializer(backend=args.json_backend, pretty=args.json_format == 'pretty')
+    run_parsed_command(args)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,14 +1,26 @@
 #!/usr/bin/env python
 
-import json
 import sys
 import time
 sys.path.append('..')
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-
-from collector.packages.driver import get_random_user_agent, quit_driver
+from collector.packages.checkpoint import (accepts_argument, clear_checkpoint,
+                                           get_checkpoint_n_saved_reviews,
+                                           make_checkpoint_function)
+from collector.packages.driver import create_driver, quit_driver
+from collector.packages.ledger import end_run, record_url, start_run
+from collector.packages.metrics import (PAGE_COLLECT_SECONDS, PAGES, PAGES_PER_MINUTE,
+                                        REVIEWS_SAVED, RETRIES, STATUS_TRANSITIONS,
+                                        observe_page_load_time)
+from collector.packages.progress import DONE_STATUSES, count_statuses
+from collector.packages.retry import (BROWSER_ERROR_CLASSES, RETRY_POLICIES, classify_exception,
+                                      classify_page, clear_retry, get_retry_queue,
+                                      record_failure, wait_next_attempt)
+from collector.packages.save import flush_background_writer, save_urls_to_collect
+from collector.packages.serializer import loads
+from collector.packages.tabs import dispatch_in_tabs
+from collector.packages.tracing import profile_url, span
+from collector.packages.watchdog import start_watchdog
 
 
 def create_products_listing_pages_files(create_products_listing_pages_brands,
@@ -26,24 +38,20 @@ def create_products_listing_pages_files(create_products_listing_pages_brands,
                                                   will be created.
     """
         
-    # Get a random user agent
-    driver_dict['options'].add_argument(f'user-agent={get_random_user_agent()}')
-
-    # Set the driver
-    if driver_dict['headless']:
-        driver_dict['options'].add_argument("--headless")
-        
-    service = Service(executable_path=driver_dict['driver_path'])
-    driver = webdriver.Chrome(service=service, options=driver_dict['options'])
-    
-    # Create the products-listing pages brands
-    create_products_listing_pages_brands(
-        driver=driver,
-        brands_page_dict=brands_page_dict,
-        products_listing_pages_folder_path=products_listing_pages_folder_path)
+    # Set the driver with a random user agent
+    driver = create_driver(driver_dict=driver_dict)
+    watchdog = start_watchdog(driver=driver, driver_dict=driver_dict)
     
-    # Quit the driver
-    quit_driver(driver=driver, delete_cookies=driver_dict['delete_cookies'])
+    try:
+        # Create the products-listing pages brands
+        create_products_listing_pages_brands(
+            driver=driver,
+            brands_page_dict=brands_page_dict,
+            products_listing_pages_folder_path=products_listing_pages_folder_path)
+    finally:
+        # Quit the driver
+        watchdog.stop()
+        quit_driver(driver=driver, delete_cookies=driver_dict['delete_cookies'])
 
 
 def generate_products_listing_pages_dicts(from_brands, 
@@ -137,7 +145,8 @@ def collect_urls(save_products_listing_page_data,
                  driver_dict, 
                  source_dict,
                  products_listing_pages_dicts, 
-                 new_urls_folder_path):
+                 new_urls_folder_path,
+                 n_tabs=1):
     """Collects the new URLs.
 
     Args:
@@ -146,27 +155,92 @@ def collect_urls(save_products_listing_page_data,
         source_dict (dict): dictionary with information from the source.
         products_listing_pages_dicts (list[dict]): list of products-listing pages dictionaries.
         new_urls_folder_path (str): path of the directory in which the URLs will be saved.
+        n_tabs (int): number of tabs of one browser collecting the pages concurrently.
+                      With 1 tab, a new browser is used for each products-listing page.
+
+    A products-listing page whose save raises an error is recorded as 'issue' in the
+    ledger, with the class of its error, and the collect goes on with the next pages.
     """
 
+    # Record the run in the ledger, for the capacity planning
+    start_run(run_type='collect_urls',
+              source=source_dict.get('source'),
+              n_urls=len(products_listing_pages_dicts),
+              parameters={'n_tabs': n_tabs})
+
+    # Number of products-listing pages of each outcome, 'issue' when their save has raised
+    n_statuses = {}
+
+    def save_products_listing_page(driver, watchdog, products_listing_page_dict):
+        # Collect and save new URLs data, the error class of an issue is returned
+        start_time = time.time()
+        status, error_class = 'yes', None
+        try:
+            save_products_listing_page_data(driver=driver, 
+                                            products_listing_page_dict=products_listing_page_dict,
+                                            source_dict=source_dict,
+                                            new_urls_folder_path=new_urls_folder_path)
+        except Exception as e:
+            print(f"[LOG] [Errors] There has been an issue with the current products-listing page.\n"
+                  f"[LOG] [EXCEPTION]\n{e}")
+            status, error_class = 'issue', watchdog.kill_reason or classify_exception(exception=e)
+        record_url(url=products_listing_page_dict['url'], status=status,
+                   duration=time.time() - start_time, error_class=error_class)
+        n_statuses[status] = n_statuses.get(status, 0) + 1
+
+        return error_class
+
+    if n_tabs > 1:
+        # Set one driver with a random user agent for all the tabs
+        driver = create_driver(driver_dict=driver_dict)
+        watchdog = start_watchdog(driver=driver, driver_dict=driver_dict)
+
+        def process_products_listing_page(tab_driver, products_listing_page_dict):
+            error_class = save_products_listing_page(driver=tab_driver,
+                                                     watchdog=watchdog,
+                                                     products_listing_page_dict=products_listing_page_dict)
+            watchdog.heartbeat()
+
+            # The dispatch stops when the browser is unusable
+            return error_class not in BROWSER_ERROR_CLASSES
+
+        try:
+            remaining_products_listing_pages_dicts = \
+                dispatch_in_tabs(driver=driver,
+                                 items=products_listing_pages_dicts,
+                                 get_url=lambda d: d['url'],
+                                 process_item=process_products_listing_page,
+                                 n_tabs=n_tabs,
+                                 load_timeout=driver_dict.get('page_load_timeout') or 120)
+        finally:
+            # Quit the driver
+            watchdog.stop()
+            quit_driver(driver=driver, delete_cookies=driver_dict['delete_cookies'])
+
+        if remaining_products_listing_pages_dicts:
+            print(f"[LOG] [TABS] {len(remaining_products_listing_pages_dicts)} "
+                   "products-listing pages haven't been collected.")
+            n_statuses['no'] = len(remaining_products_listing_pages_dicts)
+
+        end_run(n_statuses=n_statuses)
+
+        return
+
     for products_listing_page_dict in products_listing_pages_dicts:
-        # Get a random user agent
-        driver_dict['options'].add_argument(f'user-agent={get_random_user_agent()}')
-        
-        # Set the driver
-        if driver_dict['headless']:
-            driver_dict['options'].add_argument("--headless")
-            
-        service = Service(executable_path=driver_dict['driver_path'])
-        driver = webdriver.Chrome(service=service, options=driver_dict['options'])
-
-        # Collect and save new URLs data
-        save_products_listing_page_data(driver=driver, 
-                                        products_listing_page_dict=products_listing_page_dict,
-                                        source_dict=source_dict,
-                                        new_urls_folder_path=new_urls_folder_path)
-        
-        # Quit the driver
-        quit_driver(driver=driver, delete_cookies=driver_dict['delete_cookies'])
+        # Set the driver with a random user agent
+        driver = create_driver(driver_dict=driver_dict)
+        watchdog = start_watchdog(driver=driver, driver_dict=driver_dict)
+
+        try:
+            save_products_listing_page(driver=driver,
+                                       watchdog=watchdog,
+                                       products_listing_page_dict=products_listing_page_dict)
+        finally:
+            # Quit the driver
+            watchdog.stop()
+            quit_driver(driver=driver, delete_cookies=driver_dict['delete_cookies'])
+
+    end_run(n_statuses=n_statuses)
 
 
 def collect_page(save_product_page_data,
@@ -191,23 +265,511 @@ def collect_page(save_product_page_data,
     """
 
     # Set the driver
-    if driver_dict['headless']:
-        driver_dict['options'].add_argument("--headless")
-
-    service = Service(executable_path=driver_dict['driver_path'])
-    driver = webdriver.Chrome(service=service, options=driver_dict['options'])
-
-    # Collect the product and reviews data
-    save_product_page_data(driver=driver, 
-                           product_page_dict=product_page_dict, 
-                           source_dict=source_dict, 
-                           n_max_reviews=n_max_reviews,
-                           min_date_year=min_date_year,
-                           products_folder_path=products_folder_path, 
-                           reviews_folder_path=reviews_folder_path)
-    
-    # Quit the driver
-    quit_driver(driver=driver, delete_cookies=driver_dict['delete_cookies'])
+    driver = create_driver(driver_dict=driver_dict, random_user_agent=False)
+    watchdog = start_watchdog(driver=driver, driver_dict=driver_dict)
+
+    try:
+        # Collect the product and reviews data
+        save_product_page_data(driver=driver, 
+                               product_page_dict=product_page_dict, 
+                               source_dict=source_dict, 
+                               n_max_reviews=n_max_reviews,
+                               min_date_year=min_date_year,
+                               products_folder_path=products_folder_path, 
+                               reviews_folder_path=reviews_folder_path)
+    finally:
+        # Quit the driver
+        watchdog.stop()
+        quit_driver(driver=driver, delete_cookies=driver_dict['delete_cookies'])
+
+
+def set_url_to_collect_status(url_to_collect_dict, product_dict, n_saved_reviews):
+    """Sets the status of the URL to collect from the collected product data.
+
+    Args:
+        url_to_collect_dict (dict): URL to collect dictionary.
+        product_dict (dict): collected product data.
+        n_saved_reviews (int): number of saved reviews.
+    """
+
+    # Step 1
+    # ** What: product data has been collected
+    # ** How: 'product_dict' is not empty
+    if product_dict:
+
+        # Step 2
+        # ** What: product data contains the mandatory fields
+        # ** How: the fields 'product_name' and 'product_brand' aren't None
+        if product_dict['product_name'] is not None and \
+           product_dict['product_brand'] is not None:
+
+            # Step 3
+            # ** What: product data has the field 'n_reviews'
+            # The number of reviews for the product is displayed on the product page
+            # and has been saved
+            # ** How: the field 'n_reviews' is in the 'product_dict' and the value
+            # is not None
+            if product_dict.get('n_reviews') and \
+               product_dict['n_reviews'] is not None:
+
+                    # Step 5
+                    # ** What: the number of reviews for the product is displayed on the product page
+                    # and has been saved in the field 'n_reviews' in the correct integer type
+                    # ** How: the field 'n_reviews' in 'product_dict' is an integer
+                    if isinstance(product_dict['n_reviews'], int):
+
+                        # Step 6
+                        # ** What: the number of reviews on the product page has been saved
+                        # in the correct integer type and the product has reviews to collect
+                        # ** How: the field 'n_reviews' is strictly higher than 0
+                        if product_dict['n_reviews'] > 0:
+
+                            # Step 10
+                            # ** What: some reviews have been saved
+                            # ** How: `n_saved_reviews` is strictly higher than 0
+                            if n_saved_reviews > 0:
+
+                                # Step 11
+                                # ** What: the number of saved reviews is higher or equal to the number of displayed 
+                                # reviews on the product page
+                                # All the reviews available on the product page have been collected
+                                # ** How: `n_saved_reviews` is higher or equal than the field 'n_reviews' in the 'product_dict'
+                                # ** URL status: the current URL is saved as 'yes'
+                                if n_saved_reviews >= product_dict['n_reviews']:
+                                    url_to_collect_dict['collected'] = 'yes'
+                                    print("[LOG] [Step 11] All the reviews have been collected for the product.\n"
+                                          "[LOG] [Step 11] The current URL is saved as 'yes'.")
+
+                                # Step 11 (if not)
+                                # ** What: the number of saved reviews is lower than the number of displayed 
+                                # reviews on the product page
+                                # Not all the reviews available on the product page have been collected
+                                # ** How: `n_saved_reviews` is strictly lower than the field 'n_reviews' in the 'product_dict'
+                                # ** URL status: the current URL is saved as 'once'
+                                else:
+                                    url_to_collect_dict['collected'] = 'once'
+                                    print("[LOG] [Step 11 (if not)] Not all the reviews have been collected for the product.\n"
+                                          "[LOG] [Step 11 (if not)] Or the product has ratings without text.\n"
+                                          "[LOG] [Step 11 (if not)] The current URL is saved as 'once'.")                                      
+
+                            # Step 10 (if not)
+                            # ** What: no reviews have been saved
+                            # The product page displayed the product has reviews and the field
+                            # 'n_reviews' in the 'product_dict' has been correctly saved as a strictly
+                            # positive integer
+                            # There has been an issue with the reviews data collection
+                            # ** URL status: the current URL is saved as 'issue'
+                            else:
+                                url_to_collect_dict['collected'] = 'issue'
+                                print("[LOG] [Step 10 (if not)] There has been an issue with the current URL.\n"
+                                      "[LOG] [Step 10 (if not)] The current URL is saved as 'issue'.")
+
+                        # Step 6 (elif)
+                        # ** What: the number of reviews on the product page has been saved
+                        # in the correct integer type but the product hasn't any reviews to collect
+                        # ** How: the field 'n_reviews' is equal to 0 
+                        elif product_dict['n_reviews'] == 0:
+
+                            # Step 7
+                            # ** What: some reviews have been saved 
+                            # The number of saved reviews can't be compared with the number of reviews 
+                            # for the product because the information is displayed on the product page 
+                            # but has been saved as a null integer
+                            # There has been a problem with the product data collection
+                            # ** URL status: the current URL is saved as 'issue'
+                            if n_saved_reviews > 0:
+                                url_to_collect_dict['collected'] = 'issue'
+                                print("[LOG] [Step 7] There has been an issue with the current URL.\n"
+                                      "[LOG] [Step 7] The current URL is saved as 'issue'.")
+
+                            # Step 7 (if not)
+                            # ** What: no reviews have been saved
+                            # There aren't any saved reviews but the number of displayed reviews isn't correctly saved
+                            # There has been a problem with the product data collection
+                            # There has been a problem with the reviews data collecttion because 
+                            # the product is supposed to have reviews                                        
+                            # The current URL is saved as 'issue'
+                            else:
+                                url_to_collect_dict['collected'] = 'issue'
+                                print("[LOG] [Step 7 (if not)] There has been an issue with the current URL.\n"
+                                      "[LOG] [Step 7 (if not)] The current URL is saved as 'issue'.")
+
+                        # Step 6 (else)
+                        # ** What: The number of reviews on the product page has been saved
+                        # in the correct integer type but the product hasn't any reviews to collect
+                        # ** How: the field 'n_reviews' is lower than 0 
+                        else:
+
+                            # Step 8
+                            # ** What: some reviews have been saved 
+                            # The number of saved reviews can't be compared with the number of reviews 
+                            # for the product because the information is displayed on the product page 
+                            # but hasn't been saved correctly as a positive or null integer
+                            # It is impossible to know if all the reviews have been saved
+                            # ** How: `n_saved_reviews` is higher than 0
+                            # ** URL status: The current URL is saved as 'once'
+                            if n_saved_reviews > 0:
+                                url_to_collect_dict['collected'] = 'once'
+                                print("[LOG] [Step 8] Not all the reviews have been collected for the product.\n"
+                                      "[LOG] [Step 8] The current URL is saved as 'once'.") 
+
+                            # Step 9 (if not)
+                            # What: no reviews have been saved
+                            # There aren't any saved reviews but the number of displayed reviews is 
+                            # accessible on the product page and has been saved in the correct integer format
+                            # There has been a problem with the product data collection because 
+                            # the number of reviews is not in the correct positive or null integer format
+                            # There has been a problem with the reviews data collecttion because 
+                            # the product is supposed to have reviews
+                            # ** How: `n_saved_reviews` is equal to 0
+                            # ** URL status: The current URL is saved as 'issue'
+                            else:
+                                url_to_collect_dict['collected'] = 'issue'
+                                print("[LOG] [Step 9 (if not)] There has been an issue with the current URL.\n"
+                                      "[LOG] [Step 9 (if not)] The current URL is saved as 'issue'.")
+
+                    # Step 5 (if not)
+                    # ** What: the number of reviews for the product is displayed on the product page
+                    # and has been saved in the field 'n_reviews' but the type isn't correct
+                    # There has been a problem with the product data collection or the conversion of the
+                    # field 'n_reviews' to integer                                
+                    # How: the field 'n_reviews' in 'product_dict' isn't an integer         
+                    else:
+
+                        # Step 12
+                        # ** What: some reviews have been saved 
+                        # The number of saved reviews can't be compare with the number of reviews for 
+                        # the product because the information is displayed on the product page 
+                        # but hasn't been saved correctly in the type integer
+                        # It is impossible to know if all the reviews have been saved
+                        # ** How: `n_saved_reviews` is higher than 0
+                        # ** URL status: The current URL is saved as 'once'
+                        if n_saved_reviews > 0:
+                            url_to_collect_dict['collected'] = 'once'
+                            print("[LOG] [Step 12] Not all the reviews have been collected for the product.\n"
+                                  "[LOG] [Step 12] The current URL is saved as 'once'.")
+
+                        # Step 12 (if not)
+                        # What: no reviews have been saved
+                        # There aren't any saved reviews but the number of displayed reviews is accessible 
+                        # on the product page
+                        # There has been a problem with the product data collection because the number 
+                        # of reviews hasn't been in the correct integer type
+                        # And product is supposed to have reviews, so the number of saved reviews should be
+                        # higher than 0
+                        # ** How: `n_saved_reviews` is equal to 0
+                        # ** URL status: The current URL is saved as 'issue'
+                        else:
+                            url_to_collect_dict['collected'] = 'issue'
+                            print("[LOG] [Step 12 (if not)] There has been an issue with the current URL.\n"
+                                  "[LOG] [Step 12 (if not)] The current URL is saved as 'issue'.")     
+
+            # Step 3 (if not)
+            # ** What: product data doesn't contain the field 'n_reviews' or hasn't been able
+            # to point to the information in the product page
+            # The number of reviews for the product isn't displayed on the product page or hasn't been
+            # successfully saved
+            # ** How: the field 'n_reviews' isn't in the 'product_dict'
+            else:
+
+                # Step 4
+                # ** What: some reviews have been saved 
+                # The number of saved reviews can't be compared with the number of 
+                # reviews for the product because the information isn't displayed 
+                # on the product page
+                # It is impossible to know if all the reviews have been saved
+                # ** How: `n_saved_reviews` is higher than 0
+                # ** URL status: The current URL is saved as 'once'
+                if n_saved_reviews > 0:
+                    url_to_collect_dict['collected'] = 'once'
+                    print("[LOG] [Step 4] Not all the reviews have been collected for the product.\n"
+                          "[LOG] [Step 4] The current URL is saved as 'once'.")
+
+                # Step 4 (if not)
+                # What: no reviews have been saved
+                # There aren't any saved reviews and the number of displayed reviews isn't 
+                # accessible on the product page
+                # The product hasn't any reviews
+                # ** How: `n_saved_reviews` is equal to 0
+                # ** URL status: The current URL is saved as 'yes'
+                else:
+                    url_to_collect_dict['collected'] = 'yes'
+                    print("[LOG] [Step 4 (if not)] All the reviews have been collected for the product.\n"
+                          "[LOG] [Step 4 (if not)] The current URL is saved as 'yes'.")
+
+        # Step 2 (if not)
+        # ** What: product data doesn't contain the mandatory fields
+        # The fields 'product_name' and 'product_brand' are both None
+        # There has been a problem with the product data collection
+        # ** How: one of the fields 'product_name' or 'product_brand' is None
+        # ** URL status: the current URL is saved as 'issue'
+        else:
+            url_to_collect_dict['collected'] = 'issue'
+            print("[LOG] [Step 2 (if not)] There has been an issue with the current URL.\n"
+                  "[LOG] [Step 2 (if not)] The current URL is saved as 'issue'.")
+
+    # Step 1 (if not)
+    # ** What: product data hasn't been collected
+    # There has been a problem with the product data collection
+    # ** How: 'product_dict' is empty
+    # ** URL status: the current URL is saved as a 'issue'
+    else:
+        url_to_collect_dict['collected'] = 'issue'
+        print("[LOG] [Step 1 (if not)] There has been an issue with the current URL.\n"
+              "[LOG] [Step 1 (if not)] The current URL is saved as 'issue'.")
+
+
+def collect_url_to_collect(save_product_page_data,
+                           driver_dict,
+                           source_dict,
+                           url_to_collect_dict,
+                           n_max_reviews,
+                           min_date_year,
+                           products_folder_path,
+                           reviews_folder_path,
+                           retry_policies=RETRY_POLICIES,
+                           save_status=None,
+                           checkpoint_interval=30,
+                           driver=None,
+                           watchdog=None):
+    """Collects the data from one URL to collect and sets its status.
+
+    Args:
+        save_product_page_data (function): Function used for saving product page data.
+        driver_dict (dict): Dictionary with information of the driver.
+        source_dict (dict): Dictionary with information from the source.
+        url_to_collect_dict (dict): URL to collect dictionary.
+        n_max_reviews (int): Max number of reviews to collect.
+        min_date_year (int): Oldest review year to collect.
+        products_folder_path (str): Path to the 'products' folder.
+        reviews_folder_path (str): Path to the 'reviews' folder.
+        retry_policies (dict): Retry policy of each error class.
+        save_status (function): Function persisting the URLs to collect file, used by the
+                                checkpoints.
+        checkpoint_interval (float): Minimum number of seconds between two persisted checkpoints.
+        driver (WebDriver): Driver to use (a tab of a shared browser), else a new driver is
+                            created and quit for the URL.
+        watchdog (DriverWatchdog): Watchdog of the given driver.
+
+    Returns:
+        str, Error class of the failed attempt, or None if the URL has been collected.
+
+    If `save_product_page_data` accepts a `checkpoint` argument, it receives a function
+    `checkpoint(cursor, n_saved_reviews)` to call with its pagination cursor and the number
+    of reviews it has saved so far. On the next attempt, the cursor is available with
+    `get_checkpoint_cursor(product_page_dict)` so the collect resumes from it, and the
+    returned number of saved reviews only counts the reviews saved since the checkpoint.
+
+    The save function can open its own tracing spans with `span(name, **args)`, e.g. around
+    `driver.get` and the pagination, nested in the span of the URL.
+    """
+
+    # Trace the collect of the URL and profile it to keep the stacks of the slowest URLs
+    with span('collect_url', url=url_to_collect_dict['url']), \
+         profile_url(url=url_to_collect_dict['url']):
+
+        # Set the driver with a random user agent, watched for hung pages and memory bloat
+        own_driver = driver is None
+        if own_driver:
+            driver = create_driver(driver_dict=driver_dict)
+            watchdog = start_watchdog(driver=driver, driver_dict=driver_dict)
+        print(f"[LOG] Time: {time.strftime('%H:%M:%S')}")
+        start_time = time.time()
+        error_class = None
+        previous_status = url_to_collect_dict['collected']
+        n_saved_reviews = 0
+
+        # Resume from the pagination checkpoint of a previous attempt
+        n_resumed_reviews = get_checkpoint_n_saved_reviews(product_page_dict=url_to_collect_dict)
+        save_product_page_data_kwargs = {}
+        if accepts_argument(function=save_product_page_data, argument_name='checkpoint'):
+            save_product_page_data_kwargs['checkpoint'] = \
+                make_checkpoint_function(product_page_dict=url_to_collect_dict,
+                                         save_status=save_status,
+                                         checkpoint_interval=checkpoint_interval,
+                                         heartbeat=watchdog.heartbeat)
+            if n_resumed_reviews:
+                print(f"[LOG] [CHECKPOINT] Resume the collect after {n_resumed_reviews} saved reviews.")
+
+        try:
+            # Collect and save the product and reviews data
+            # --------------------------------------------------------
+            with PAGE_COLLECT_SECONDS.time(), span('save_product_page_data'):
+                product_dict, n_saved_reviews = save_product_page_data(
+                    driver=driver,
+                    product_page_dict=url_to_collect_dict,
+                    source_dict=source_dict,
+                    products_folder_path=products_folder_path,
+                    reviews_folder_path=reviews_folder_path,
+                    n_max_reviews=n_max_reviews,
+                    min_date_year=min_date_year,
+                    **save_product_page_data_kwargs)
+            observe_page_load_time(driver=driver)
+            n_saved_reviews += n_resumed_reviews
+
+            # The URL is collected only once its data handed off to the background writer
+            # is written
+            writer_error = flush_background_writer()
+            if writer_error is not None:
+                raise RuntimeError("The background writer has failed, the data of the URL "
+                                   "may not be written.") from writer_error
+
+            # Change the status of the URL to collect
+            # --------------------------------------------------------
+            set_url_to_collect_status(url_to_collect_dict=url_to_collect_dict,
+                                      product_dict=product_dict,
+                                      n_saved_reviews=n_saved_reviews)
+
+            # Classify the issue from the loaded page to know if it can be retried
+            if url_to_collect_dict['collected'] == 'issue':
+                error_class = classify_page(driver=driver)
+                record_failure(url_to_collect_dict=url_to_collect_dict,
+                               error_class=error_class,
+                               retry_policies=retry_policies)
+            else:
+                clear_retry(url_to_collect_dict=url_to_collect_dict)
+                clear_checkpoint(product_page_dict=url_to_collect_dict)
+
+        # Errors
+        # --------------------------------------------------------
+        # The collect for the current URL has raised an error so the error is classified
+        # and the current URL is saved as 'issue' or 'dead' according to its retry policy
+        # If the watchdog has killed the browser, its kill reason is the error class
+        except Exception as e:
+            print(f"[LOG] [Errors] There has been an issue with the current URL.\n"
+                  f"[LOG] [EXCEPTION]\n{e}")
+            error_class = watchdog.kill_reason or classify_exception(exception=e)
+            record_failure(url_to_collect_dict=url_to_collect_dict,
+                           error_class=error_class,
+                           retry_policies=retry_policies)
+
+            # The reviews counted by the checkpoint may not be written if the background
+            # writer has failed, so the next attempt starts over
+            if flush_background_writer() is not None:
+                clear_checkpoint(product_page_dict=url_to_collect_dict)
+
+        finally:
+            # Quit the driver
+            if own_driver:
+                watchdog.stop()
+                quit_driver(driver=driver, delete_cookies=driver_dict['delete_cookies'])
+
+            # Time of the end of the collect of the URL, for the throughput of the progress
+            if url_to_collect_dict['collected'] in DONE_STATUSES:
+                url_to_collect_dict['collected_time'] = round(time.time(), 3)
+
+            record_url(url=url_to_collect_dict['url'],
+                       status=url_to_collect_dict['collected'],
+                       duration=time.time() - start_time,
+                       error_class=error_class,
+                       n_reviews=url_to_collect_dict.get('n_reviews'),
+                       n_saved_reviews=n_saved_reviews)
+
+            PAGES.inc(status=url_to_collect_dict['collected'])
+            REVIEWS_SAVED.observe(n_saved_reviews)
+            STATUS_TRANSITIONS.inc(from_status=previous_status, to_status=url_to_collect_dict['collected'])
+
+        return error_class
+
+
+def collect_urls_to_collect_in_tabs(save_product_page_data,
+                                    driver_dict,
+                                    source_dict,
+                                    urls_to_collect_queue,
+                                    n_max_reviews,
+                                    min_date_year,
+                                    products_folder_path,
+                                    reviews_folder_path,
+                                    retry_policies,
+                                    save_status,
+                                    checkpoint_interval,
+                                    n_tabs):
+    """Collects the URLs to collect in the tabs of one browser.
+
+    The browser is replaced when it crashes, hangs or bloats, and the URLs not
+    processed yet are dispatched to the tabs of the new browser.
+
+    Args:
+        save_product_page_data (function): Function used for saving product page data.
+        driver_dict (dict): Dictionary with information of the driver.
+        source_dict (dict): Dictionary with information from the source.
+        urls_to_collect_queue (list[dict]): URLs to collect dictionaries to collect.
+        n_max_reviews (int): Max number of reviews to collect.
+        min_date_year (int): Oldest review year to collect.
+        products_folder_path (str): Path to the 'products' folder.
+        reviews_folder_path (str): Path to the 'reviews' folder.
+        retry_policies (dict): Retry policy of each error class.
+        save_status (function): Function persisting the URLs to collect file.
+        checkpoint_interval (float): Minimum number of seconds between two persisted checkpoints.
+        n_tabs (int): Number of tabs of the browser.
+    """
+
+    remaining_urls_to_collect = urls_to_collect_queue
+    while remaining_urls_to_collect:
+        n_remaining_urls_to_collect = len(remaining_urls_to_collect)
+
+        # Set one driver with a random user agent for all the tabs
+        driver = create_driver(driver_dict=driver_dict)
+        watchdog = start_watchdog(driver=driver, driver_dict=driver_dict)
+
+        def process_url_to_collect(tab_driver, url_to_collect_dict):
+            try:
+                error_class = collect_url_to_collect(
+                    save_product_page_data=save_product_page_data,
+                    driver_dict=driver_dict,
+                    source_dict=source_dict,
+                    url_to_collect_dict=url_to_collect_dict,
+                    n_max_reviews=n_max_reviews,
+                    min_date_year=min_date_year,
+                    products_folder_path=products_folder_path,
+                    reviews_folder_path=reviews_folder_path,
+                    retry_policies=retry_policies,
+                    save_status=save_status,
+                    checkpoint_interval=checkpoint_interval,
+                    driver=tab_driver,
+                    watchdog=watchdog)
+            finally:
+                save_status()
+            watchdog.heartbeat()
+
+            # Stop the dispatch to replace the browser
+            return error_class not in BROWSER_ERROR_CLASSES
+
+        try:
+            remaining_urls_to_collect = dispatch_in_tabs(
+                driver=driver,
+                items=remaining_urls_to_collect,
+                get_url=lambda d: d['url'],
+                process_item=process_url_to_collect,
+                n_tabs=n_tabs,
+                load_timeout=driver_dict.get('page_load_timeout') or 120)
+        finally:
+            # Quit the driver
+            watchdog.stop()
+            quit_driver(driver=driver, delete_cookies=driver_dict['delete_cookies'])
+
+        if remaining_urls_to_collect:
+            print(f"[LOG] [TABS] Replace the browser, {len(remaining_urls_to_collect)} "
+                   "URLs left to collect.")
+
+        # The browser hasn't been able to start any URL, so the first one is collected
+        # with its own driver to classify its error
+        if len(remaining_urls_to_collect) == n_remaining_urls_to_collect:
+            try:
+                collect_url_to_collect(save_product_page_data=save_product_page_data,
+                                       driver_dict=driver_dict,
+                                       source_dict=source_dict,
+                                       url_to_collect_dict=remaining_urls_to_collect[0],
+                                       n_max_reviews=n_max_reviews,
+                                       min_date_year=min_date_year,
+                                       products_folder_path=products_folder_path,
+                                       reviews_folder_path=reviews_folder_path,
+                                       retry_policies=retry_policies,
+                                       save_status=save_status,
+                                       checkpoint_interval=checkpoint_interval)
+            finally:
+                save_status()
+            remaining_urls_to_collect = remaining_urls_to_collect[1:]
 
 
 def collect_pages(save_product_page_data, 
@@ -218,7 +780,11 @@ def collect_pages(save_product_page_data,
                   n_max_reviews, 
                   min_date_year, 
                   products_folder_path, 
-                  reviews_folder_path):
+                  reviews_folder_path,
+                  retry_issues=True,
+                  retry_policies=RETRY_POLICIES,
+                  checkpoint_interval=30,
+                  n_tabs=1):
     """Collects the data from URLs to collect.
 
     Args:
@@ -231,291 +797,117 @@ def collect_pages(save_product_page_data,
         min_date_year (int): Oldest review year to collect.
         products_folder_path (str): Path to the 'products' folder.
         reviews_folder_path (str): Path to the 'reviews' folder.
+        retry_issues (bool): Whether to retry the 'issue' URLs at the end of the pass.
+        retry_policies (dict): Retry policy of each error class.
+        checkpoint_interval (float): Minimum number of seconds between two persisted 
+                                     pagination checkpoints.
+        n_tabs (int): Number of tabs of one browser collecting the URLs concurrently.
+                      With 1 tab, a new browser is used for each URL.
 
     The function performs the following steps:
     1. Loads the most recent URLs to collect object name.
     2. Iterates through the URLs to collect data and performs the following steps:
        a. Collects and saves the product and reviews data.
        b. Checks the collected product data and sets the URL status accordingly based on specific conditions.
-    3. Handles errors during data collection and sets the URL status as 'issue'.
+    3. Handles errors during data collection, classifies them and sets the URL status as 'issue'
+       while the retry policy of the error class allows another attempt, else as 'dead'.
     4. Writes the updated URLs to collect dictionary back to the file.
+    5. Retries the 'issue' URLs once their backoff delay has elapsed, until none is left.
+
+    The pagination checkpoints of the save function are persisted with the URL status,
+    so that an interrupted product is resumed from its last cursor on the next run.
 
     The function is expected to be used for data collection and status management of URLs.
     """
 
     # Load the most recent URLs to collect object name
-    urls_to_collect_dicts = json.load(
-        open(urls_to_collect_dicts_object_name, 'r', encoding='utf-8'))
-
+    with open(urls_to_collect_dicts_object_name, 'rb') as file_to_open:
+        urls_to_collect_dicts = loads(file_to_open.read())
+
+    start_time = time.time()
+    n_pages_at_start = PAGES.total()
+
+    def save_status():
+        # The statuses are persisted once the data of their URLs is written
+        flush_background_writer()
+        save_urls_to_collect(urls_to_collect_dicts=urls_to_collect_dicts,
+                             urls_to_collect_dicts_object_name=urls_to_collect_dicts_object_name)
+        PAGES_PER_MINUTE.set(
+            round(60 * (PAGES.total() - n_pages_at_start) / max(1, time.time() - start_time), 3))
+
+    # Collect the URLs with the requested status, then the retry queue
+    retry_queue = []
     for url_to_collect_dict in urls_to_collect_dicts:
         if url_to_collect_dict['collected'] == urls_to_collect_status:
-
-            # Get a random user agent
-            driver_dict['options'].add_argument(f'user-agent={get_random_user_agent()}')
-
-            # Set the driver
-            if driver_dict['headless']:
-                driver_dict['options'].add_argument("--headless")
-
-            service = Service(executable_path=driver_dict['driver_path'])
-            driver = webdriver.Chrome(service=service, options=driver_dict['options'])
-            print(f"[LOG] Time: {time.strftime('%H:%M:%S')}")
+            retry_queue.append(url_to_collect_dict)
+
+    # Record the run in the ledger, for the capacity planning
+    start_run(run_type='collect_pages',
+              source=source_dict.get('source'),
+              n_urls=len(retry_queue),
+              parameters={'urls_to_collect_dicts_object_name': urls_to_collect_dicts_object_name,
+                          'n_max_reviews': n_max_reviews,
+                          'n_tabs': n_tabs})
+
+    while retry_queue:
+        RETRIES.inc(sum(1 for d in retry_queue if d.get('retry')))
+        if n_tabs > 1:
+            # Wait for the backoff delay of all the URLs of the queue: the latest next attempt time
+            # (the first queue is in file order, not sorted by next attempt time)
+            waiting_urls_to_collect_dicts = [
+                url_to_collect_dict for url_to_collect_dict in retry_queue
+                if url_to_collect_dict.get('retry') and
+                   url_to_collect_dict['retry']['next_attempt_time'] is not None]
+            if waiting_urls_to_collect_dicts:
+                wait_next_attempt(url_to_collect_dict=max(
+                    waiting_urls_to_collect_dicts, key=lambda d: d['retry']['next_attempt_time']))
+
+            collect_urls_to_collect_in_tabs(save_product_page_data=save_product_page_data,
+                                            driver_dict=driver_dict,
+                                            source_dict=source_dict,
+                                            urls_to_collect_queue=retry_queue,
+                                            n_max_reviews=n_max_reviews,
+                                            min_date_year=min_date_year,
+                                            products_folder_path=products_folder_path,
+                                            reviews_folder_path=reviews_folder_path,
+                                            retry_policies=retry_policies,
+                                            save_status=save_status,
+                                            checkpoint_interval=checkpoint_interval,
+                                            n_tabs=n_tabs)
+            retry_queue = []
+
+        for url_to_collect_dict in retry_queue:
+            if url_to_collect_dict.get('retry') and \
+               url_to_collect_dict['retry']['next_attempt_time'] is not None:
+                wait_next_attempt(url_to_collect_dict=url_to_collect_dict)
 
             try:
-                # Collect and save the product and reviews data
-                # --------------------------------------------------------
-                product_dict, n_saved_reviews = save_product_page_data(
-                    driver=driver,
-                    product_page_dict=url_to_collect_dict,
-                    source_dict=source_dict,
-                    products_folder_path=products_folder_path,
-                    reviews_folder_path=reviews_folder_path,
-                    n_max_reviews=n_max_reviews,
-                    min_date_year=min_date_year)
-
-                # Change the status of the URL to collect
-                # --------------------------------------------------------
-                # Step 1
-                # ** What: product data has been collected
-                # ** How: 'product_dict' is not empty
-                if product_dict:
-
-                    # Step 2
-                    # ** What: product data contains the mandatory fields
-                    # ** How: the fields 'product_name' and 'product_brand' aren't None
-                    if product_dict['product_name'] is not None and \
-                       product_dict['product_brand'] is not None:
-
-                        # Step 3
-                        # ** What: product data has the field 'n_reviews'
-                        # The number of reviews for the product is displayed on the product page
-                        # and has been saved
-                        # ** How: the field 'n_reviews' is in the 'product_dict' and the value
-                        # is not None
-                        if product_dict.get('n_reviews') and \
-                           product_dict['n_reviews'] is not None:
-                                
-                                # Step 5
-                                # ** What: the number of reviews for the product is displayed on the product page
-                                # and has been saved in the field 'n_reviews' in the correct integer type
-                                # ** How: the field 'n_reviews' in 'product_dict' is an integer
-                                if isinstance(product_dict['n_reviews'], int):
-                                
-                                    # Step 6
-                                    # ** What: the number of reviews on the product page has been saved
-                                    # in the correct integer type and the product has reviews to collect
-                                    # ** How: the field 'n_reviews' is strictly higher than 0
-                                    if product_dict['n_reviews'] > 0:
-
-                                        # Step 10
-                                        # ** What: some reviews have been saved
-                                        # ** How: `n_saved_reviews` is strictly higher than 0
-                                        if n_saved_reviews > 0:
-
-                                            # Step 11
-                                            # ** What: the number of saved reviews is higher or equal to the number of displayed 
-                                            # reviews on the product page
-                                            # All the reviews available on the product page have been collected
-                                            # ** How: `n_saved_reviews` is higher or equal than the field 'n_reviews' in the 'product_dict'
-                                            # ** URL status: the current URL is saved as 'yes'
-                                            if n_saved_reviews >= product_dict['n_reviews']:
-                                                url_to_collect_dict['collected'] = 'yes'
-                                                print("[LOG] [Step 11] All the reviews have been collected for the product.\n"
-                                                      "[LOG] [Step 11] The current URL is saved as 'yes'.")
-
-                                            # Step 11 (if not)
-                                            # ** What: the number of saved reviews is lower than the number of displayed 
-                                            # reviews on the product page
-                                            # Not all the reviews available on the product page have been collected
-                                            # ** How: `n_saved_reviews` is strictly lower than the field 'n_reviews' in the 'product_dict'
-                                            # ** URL status: the current URL is saved as 'once'
-                                            else:
-                                                url_to_collect_dict['collected'] = 'once'
-                                                print("[LOG] [Step 11 (if not)] Not all the reviews have been collected for the product.\n"
-                                                      "[LOG] [Step 11 (if not)] Or the product has ratings without text.\n"
-                                                      "[LOG] [Step 11 (if not)] The current URL is saved as 'once'.")                                      
-
-                                        # Step 10 (if not)
-                                        # ** What: no reviews have been saved
-                                        # The product page displayed the product has reviews and the field
-                                        # 'n_reviews' in the 'product_dict' has been correctly saved as a strictly
-                                        # positive integer
-                                        # There has been an issue with the reviews data collection
-                                        # ** URL status: the current URL is saved as 'issue'
-                                        else:
-                                            url_to_collect_dict['collected'] = 'issue'
-                                            print("[LOG] [Step 10 (if not)] There has been an issue with the current URL.\n"
-                                                  "[LOG] [Step 10 (if not)] The current URL is saved as 'issue'.")
-
-                                    # Step 6 (elif)
-                                    # ** What: the number of reviews on the product page has been saved
-                                    # in the correct integer type but the product hasn't any reviews to collect
-                                    # ** How: the field 'n_reviews' is equal to 0 
-                                    elif product_dict['n_reviews'] == 0:
-
-                                        # Step 7
-                                        # ** What: some reviews have been saved 
-                                        # The number of saved reviews can't be compared with the number of reviews 
-                                        # for the product because the information is displayed on the product page 
-                                        # but has been saved as a null integer
-                                        # There has been a problem with the product data collection
-                                        # ** URL status: the current URL is saved as 'issue'
-                                        if n_saved_reviews > 0:
-                                            url_to_collect_dict['collected'] = 'issue'
-                                            print("[LOG] [Step 7] There has been an issue with the current URL.\n"
-                                                  "[LOG] [Step 7] The current URL is saved as 'issue'.")
-                                            
-                                        # Step 7 (if not)
-                                        # ** What: no reviews have been saved
-                                        # There aren't any saved reviews but the number of displayed reviews isn't correctly saved
-                                        # There has been a problem with the product data collection
-                                        # There has been a problem with the reviews data collecttion because 
-                                        # the product is supposed to have reviews                                        
-                                        # The current URL is saved as 'issue'
-                                        else:
-                                            url_to_collect_dict['collected'] = 'issue'
-                                            print("[LOG] [Step 7 (if not)] There has been an issue with the current URL.\n"
-                                                  "[LOG] [Step 7 (if not)] The current URL is saved as 'issue'.")
-                                                                                
-                                    # Step 6 (else)
-                                    # ** What: The number of reviews on the product page has been saved
-                                    # in the correct integer type but the product hasn't any reviews to collect
-                                    # ** How: the field 'n_reviews' is lower than 0 
-                                    else:
-
-                                        # Step 8
-                                        # ** What: some reviews have been saved 
-                                        # The number of saved reviews can't be compared with the number of reviews 
-                                        # for the product because the information is displayed on the product page 
-                                        # but hasn't been saved correctly as a positive or null integer
-                                        # It is impossible to know if all the reviews have been saved
-                                        # ** How: `n_saved_reviews` is higher than 0
-                                        # ** URL status: The current URL is saved as 'once'
-                                        if n_saved_reviews > 0:
-                                            url_to_collect_dict['collected'] = 'once'
-                                            print("[LOG] [Step 8] Not all the reviews have been collected for the product.\n"
-                                                  "[LOG] [Step 8] The current URL is saved as 'once'.") 
-
-                                        # Step 9 (if not)
-                                        # What: no reviews have been saved
-                                        # There aren't any saved reviews but the number of displayed reviews is 
-                                        # accessible on the product page and has been saved in the correct integer format
-                                        # There has been a problem with the product data collection because 
-                                        # the number of reviews is not in the correct positive or null integer format
-                                        # There has been a problem with the reviews data collecttion because 
-                                        # the product is supposed to have reviews
-                                        # ** How: `n_saved_reviews` is equal to 0
-                                        # ** URL status: The current URL is saved as 'issue'
-                                        else:
-                                            url_to_collect_dict['collected'] = 'issue'
-                                            print("[LOG] [Step 9 (if not)] There has been an issue with the current URL.\n"
-                                                  "[LOG] [Step 9 (if not)] The current URL is saved as 'issue'.")
-
-                                # Step 5 (if not)
-                                # ** What: the number of reviews for the product is displayed on the product page
-                                # and has been saved in the field 'n_reviews' but the type isn't correct
-                                # There has been a problem with the product data collection or the conversion of the
-                                # field 'n_reviews' to integer                                
-                                # How: the field 'n_reviews' in 'product_dict' isn't an integer         
-                                else:
+                collect_url_to_collect(save_product_page_data=save_product_page_data,
+                                       driver_dict=driver_dict,
+                                       source_dict=source_dict,
+                                       url_to_collect_dict=url_to_collect_dict,
+                                       n_max_reviews=n_max_reviews,
+                                       min_date_year=min_date_year,
+                                       products_folder_path=products_folder_path,
+                                       reviews_folder_path=reviews_folder_path,
+                                       retry_policies=retry_policies,
+                                       save_status=save_status,
+                                       checkpoint_interval=checkpoint_interval)
+            finally:
+                save_status()
 
-                                    # Step 12
-                                    # ** What: some reviews have been saved 
-                                    # The number of saved reviews can't be compare with the number of reviews for 
-                                    # the product because the information is displayed on the product page 
-                                    # but hasn't been saved correctly in the type integer
-                                    # It is impossible to know if all the reviews have been saved
-                                    # ** How: `n_saved_reviews` is higher than 0
-                                    # ** URL status: The current URL is saved as 'once'
-                                    if n_saved_reviews > 0:
-                                        url_to_collect_dict['collected'] = 'once'
-                                        print("[LOG] [Step 12] Not all the reviews have been collected for the product.\n"
-                                              "[LOG] [Step 12] The current URL is saved as 'once'.")
-
-                                    # Step 12 (if not)
-                                    # What: no reviews have been saved
-                                    # There aren't any saved reviews but the number of displayed reviews is accessible 
-                                    # on the product page
-                                    # There has been a problem with the product data collection because the number 
-                                    # of reviews hasn't been in the correct integer type
-                                    # And product is supposed to have reviews, so the number of saved reviews should be
-                                    # higher than 0
-                                    # ** How: `n_saved_reviews` is equal to 0
-                                    # ** URL status: The current URL is saved as 'issue'
-                                    else:
-                                        url_to_collect_dict['collected'] = 'issue'
-                                        print("[LOG] [Step 12 (if not)] There has been an issue with the current URL.\n"
-                                              "[LOG] [Step 12 (if not)] The current URL is saved as 'issue'.")     
-                                                                                                    
-                        # Step 3 (if not)
-                        # ** What: product data doesn't contain the field 'n_reviews' or hasn't been able
-                        # to point to the information in the product page
-                        # The number of reviews for the product isn't displayed on the product page or hasn't been
-                        # successfully saved
-                        # ** How: the field 'n_reviews' isn't in the 'product_dict'
-                        else:
-                            
-                            # Step 4
-                            # ** What: some reviews have been saved 
-                            # The number of saved reviews can't be compared with the number of 
-                            # reviews for the product because the information isn't displayed 
-                            # on the product page
-                            # It is impossible to know if all the reviews have been saved
-                            # ** How: `n_saved_reviews` is higher than 0
-                            # ** URL status: The current URL is saved as 'once'
-                            if n_saved_reviews > 0:
-                                url_to_collect_dict['collected'] = 'once'
-                                print("[LOG] [Step 4] Not all the reviews have been collected for the product.\n"
-                                      "[LOG] [Step 4] The current URL is saved as 'once'.")
-                                
-                            # Step 4 (if not)
-                            # What: no reviews have been saved
-                            # There aren't any saved reviews and the number of displayed reviews isn't 
-                            # accessible on the product page
-                            # The product hasn't any reviews
-                            # ** How: `n_saved_reviews` is equal to 0
-                            # ** URL status: The current URL is saved as 'yes'
-                            else:
-                                url_to_collect_dict['collected'] = 'yes'
-                                print("[LOG] [Step 4 (if not)] All the reviews have been collected for the product.\n"
-                                      "[LOG] [Step 4 (if not)] The current URL is saved as 'yes'.")
-                                
-                    # Step 2 (if not)
-                    # ** What: product data doesn't contain the mandatory fields
-                    # The fields 'product_name' and 'product_brand' are both None
-                    # There has been a problem with the product data collection
-                    # ** How: one of the fields 'product_name' or 'product_brand' is None
-                    # ** URL status: the current URL is saved as 'issue'
-                    else:
-                        url_to_collect_dict['collected'] = 'issue'
-                        print("[LOG] [Step 2 (if not)] There has been an issue with the current URL.\n"
-                              "[LOG] [Step 2 (if not)] The current URL is saved as 'issue'.")
-                        
-                # Step 1 (if not)
-                # ** What: product data hasn't been collected
-                # There has been a problem with the product data collection
-                # ** How: 'product_dict' is empty
-                # ** URL status: the current URL is saved as a 'issue'
-                else:
-                    url_to_collect_dict['collected'] = 'issue'
-                    print("[LOG] [Step 1 (if not)] There has been an issue with the current URL.\n"
-                          "[LOG] [Step 1 (if not)] The current URL is saved as 'issue'.")
-                    
-            # Errors
-            # --------------------------------------------------------
-            # The collect for the current URL has raised an error so the current URL is saved as a 'issue'
-            except:
-                url_to_collect_dict['collected'] = 'issue'
-                print("[LOG] [Errors] There has been an issue with the current URL.\n"
-                      "[LOG] [Errors] The current URL is saved as 'issue'.")
+        if not retry_issues:
+            break
 
-            finally:
-                with open(urls_to_collect_dicts_object_name, 
-                          'w', encoding='utf-8') as file_to_dump:
-                    json.dump(urls_to_collect_dicts, file_to_dump, indent=4, ensure_ascii=False)
-    
-            # Quit the driver
-            quit_driver(driver=driver, delete_cookies=driver_dict['delete_cookies'])
+        retry_queue = get_retry_queue(urls_to_collect_dicts=urls_to_collect_dicts)
+        if retry_queue:
+            print(f"[LOG] [RETRY] {len(retry_queue)} URLs with the status 'issue' to retry.")
+
+    n_statuses = {}
+    for url_to_collect_dict in urls_to_collect_dicts:
+        n_statuses[url_to_collect_dict['collected']] = \
+            n_statuses.get(url_to_collect_dict['collected'], 0) + 1
+    end_run(n_statuses=n_statuses)
 
 
 def evaluate_collect_progression(urls_to_collect_object_name):
@@ -526,29 +918,16 @@ def evaluate_collect_progression(urls_to_collect_object_name):
         url_to_collect_file_name: url to collect file name to evaluate.    
     """
 
-    # Load the most recent URLs
-    most_recent_urls_to_collect_dicts_object_name = urls_to_collect_object_name
-    urls_to_collect_dicts = json.load(
-        open(most_recent_urls_to_collect_dicts_object_name, 'r', encoding='utf-8'))
+    # Get the number of urls 'yes', 'once', 'issue', 'dead' and 'no', without decoding the file
+    n_statuses = count_statuses(urls_to_collect_object_name)['n_statuses']
+    n_status_yes = n_statuses['yes']
+    n_status_no = n_statuses['no']
+    n_status_once = n_statuses['once']
+    n_status_issue = n_statuses['issue']
+    n_status_dead = n_statuses['dead']
 
     # Get the number of urls to collect
-    n_urls_to_collect = len(urls_to_collect_dicts)
-
-    # Get the number of urls 'yes', 'once', 'issue' and 'no'.
-    n_status_yes = 0
-    n_status_no = 0
-    n_status_once = 0
-    n_status_issue = 0
-    for urls_to_collect_dict in urls_to_collect_dicts:
-        url_status = urls_to_collect_dict['collected']
-        if url_status == 'yes':
-            n_status_yes += 1
-        elif url_status == 'no':
-            n_status_no += 1
-        elif url_status == 'once':
-            n_status_once += 1
-        elif url_status == 'issue':
-            n_status_issue += 1
+    n_urls_to_collect = sum(n_statuses.values())
 
     # Define the width for alignment
     field_width_n_status = 5
@@ -568,3 +947,6 @@ def evaluate_collect_progression(urls_to_collect_object_name):
     print(f"[LOG] {str(n_status_issue).ljust(field_width_n_status)} "
           f"({str(int(100 * n_status_issue / n_urls_to_collect)).ljust(field_width_p_status)} %) "
            "URLs with the status ISSUE.")
+    print(f"[LOG] {str(n_status_dead).ljust(field_width_n_status)} "
+          f"({str(int(100 * n_status_dead / n_urls_to_collect)).ljust(field_width_p_status)} %) "
+           "URLs with the status DEAD.")
@@ -0,0 +1,328 @@
+#!/usr/bin/env python
+
+import argparse
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import time
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+
+sys.path.append('..')
+
+from collector.packages.cli import COMMANDS, GLOBAL_ARGUMENTS, run_parsed_command
+
+
+# Name of the socket of the daemon, in a folder of the user only
+SOCKET_FILE_NAME = 'collector.sock'
+
+
+def get_default_socket_path():
+    """Gets the default path of the socket of the daemon: in $XDG_RUNTIME_DIR, else in
+    ~/.collector, which aren't writable by the other users.
+
+    Returns:
+        str, Path of the socket.
+    """
+
+    folder_path = os.environ.get('XDG_RUNTIME_DIR') or os.path.join(os.path.expanduser('~'), '.collector')
+
+    return os.path.join(folder_path, SOCKET_FILE_NAME)
+
+
+class TeeOutput(io.TextIOBase):
+    """Text output writing to the daemon output and to a buffer sent back to the client.
+
+    Args:
+        output (io.TextIOBase): output of the daemon.
+    """
+
+    def __init__(self, output):
+        self.output = output
+        self.buffer = io.StringIO()
+
+    def write(self, text):
+        self.output.write(text)
+        return self.buffer.write(text)
+
+    def flush(self):
+        self.output.flush()
+
+
+def get_job_arg_parser(command):
+    """Gets the parser of the arguments of a job, the one of its command in the collector
+    command line (see `cli.COMMANDS`).
+
+    Args:
+        command (str): name of the job.
+
+    Returns:
+        argparse.ArgumentParser, Parser of the arguments, without arguments for a job
+        which isn't a command.
+    """
+
+    arg_parser = argparse.ArgumentParser(prog=command, allow_abbrev=False)
+    for command_name, command_help, add_arguments, run_command in COMMANDS:
+        if command_name == command:
+            arg_parser.description = command_help
+            if add_arguments is not None:
+                add_arguments(arg_parser)
+            arg_parser.set_defaults(command=command, run_command=run_command)
+
+    return arg_parser
+
+
+def get_command_job_handlers():
+    """Gets the job handlers running the commands of the collector command line.
+
+    Returns:
+        dict, Function called with the parsed arguments for each command but 'daemon'.
+    """
+
+    return {command: run_parsed_command for command, _, _, _ in COMMANDS if command != 'daemon'}
+
+
+def parse_job_args(command, argv, global_args=None):
+    """Parses the arguments of a job with the parser of its command.
+
+    Args:
+        command (str): name of the job.
+        argv (list): arguments of the job.
+        global_args (namespace): arguments of the daemon, whose global options
+                                 (see `cli.GLOBAL_ARGUMENTS`) the job inherits.
+
+    Returns:
+        namespace, Parsed arguments.
+    """
+
+    namespace = argparse.Namespace(**{argument: getattr(global_args, argument, None)
+                                      for argument in GLOBAL_ARGUMENTS})
+
+    return get_job_arg_parser(command).parse_args(argv, namespace=namespace)
+
+
+def run_job(job_handlers, job_dict, global_args=None):
+    """Runs a job and returns its response.
+
+    Args:
+        job_handlers (dict): function called with the parsed arguments for each job name.
+        job_dict (dict): job with the keys 'command' and 'argv'.
+        global_args (namespace): arguments of the daemon, inherited by the job.
+
+    Returns:
+        dict, Response with the keys 'status', 'output', 'duration' and 'error'.
+    """
+
+    command = job_dict.get('command')
+    tee_output = TeeOutput(sys.stdout)
+    start_time = time.time()
+    response_dict = {'status': 'ok', 'error': None}
+
+    with redirect_stdout(tee_output), redirect_stderr(tee_output):
+        print(f"[LOG] [DAEMON] Job '{command}' started at {time.strftime('%H:%M:%S')}.")
+        try:
+            if command not in job_handlers:
+                raise KeyError(f"Unknown job '{command}', the jobs are {sorted(job_handlers)}.")
+            args = parse_job_args(command=command, argv=job_dict.get('argv', []),
+                                  global_args=global_args)
+            job_handlers[command](args)
+        except SystemExit as e:
+            # Raised by argparse on invalid arguments, or by a command with its error message
+            response_dict = {'status': 'error',
+                             'error': e.code if isinstance(e.code, str)
+                             else f"Invalid arguments (exit code {e.code})."}
+        except Exception as e:
+            traceback.print_exc(file=tee_output)
+            response_dict = {'status': 'error', 'error': repr(e)}
+
+    response_dict['output'] = tee_output.buffer.getvalue()
+    response_dict['duration'] = round(time.time() - start_time, 3)
+
+    return response_dict
+
+
+def make_request_handler(job_handlers, server_state, global_args=None):
+    """Makes the handler of the requests of the daemon socket.
+
+    Each request is one JSON line with the job, answered with one JSON line.
+
+    Args:
+        job_handlers (dict): function called with the parsed arguments for each job name.
+        server_state (dict): state shared with the server, to request its shutdown.
+        global_args (namespace): arguments of the daemon, inherited by the jobs.
+
+    Returns:
+        class, Request handler class.
+    """
+
+    def answer_job(job_dict):
+        if job_dict.get('command') == 'ping':
+            return {'status': 'ok', 'output': 'pong', 'error': None}
+        if job_dict.get('command') == 'shutdown':
+            server_state['shutdown'] = True
+            return {'status': 'ok', 'output': 'shutting down', 'error': None}
+
+        return run_job(job_handlers=job_handlers, job_dict=job_dict, global_args=global_args)
+
+    class JobRequestHandler(socketserver.StreamRequestHandler):
+
+        def handle(self):
+            line = self.rfile.readline()
+            if not line:
+                return
+            try:
+                job_dict = json.loads(line.decode('utf-8'))
+                if not isinstance(job_dict, dict):
+                    raise ValueError("the job isn't a JSON object")
+            except ValueError as e:
+                response_dict = {'status': 'error', 'output': '', 'error': f"Invalid job: {e}."}
+            else:
+                response_dict = answer_job(job_dict)
+
+            self.wfile.write((json.dumps(response_dict, ensure_ascii=False) + '\n').encode('utf-8'))
+
+    return JobRequestHandler
+
+
+def remove_stale_socket(socket_path):
+    """Removes the socket of a daemon which has stopped without removing it.
+
+    Args:
+        socket_path (str): path of the Unix socket.
+
+    Raises:
+        RuntimeError: if the path isn't a socket or a daemon answers on it.
+    """
+
+    if not os.path.exists(socket_path):
+        return
+    if not stat.S_ISSOCK(os.stat(socket_path).st_mode):
+        raise RuntimeError(f"{socket_path} exists and isn't a socket.")
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        print(f"[LOG] [DAEMON] Remove the stale socket {socket_path}.")
+        os.remove(socket_path)
+        return
+    finally:
+        client.close()
+
+    raise RuntimeError(f"A daemon already listens on {socket_path}.")
+
+
+def serve(job_handlers=None, socket_path=None, port=None, driver_pool=None, global_args=None):
+    """Runs the collector daemon until a 'shutdown' job is received.
+
+    The daemon keeps the imports, the driver pool and any state of the job handlers
+    warm between the jobs. The jobs are run one at a time, in their order of arrival.
+
+    Args:
+        job_handlers (dict): function called with the parsed arguments for each job name,
+                             the commands of the collector command line if None
+                             (see `get_command_job_handlers`).
+        socket_path (str): path of the Unix socket the daemon listens on, readable and
+                           writable by the user only (see `get_default_socket_path` if None).
+        port (int): local TCP port to listen on instead of the Unix socket.
+        driver_pool (DriverPool): driver pool quit when the daemon stops.
+        global_args (namespace): arguments of the daemon, inherited by the jobs.
+    """
+
+    if job_handlers is None:
+        job_handlers = get_command_job_handlers()
+    server_state = {'shutdown': False}
+    request_handler = make_request_handler(job_handlers=job_handlers, server_state=server_state,
+                                           global_args=global_args)
+
+    if port is not None:
+        server = socketserver.TCPServer(('127.0.0.1', port), request_handler)
+        address = f"127.0.0.1:{port}"
+    else:
+        if socket_path is None:
+            socket_path = get_default_socket_path()
+            os.makedirs(os.path.dirname(socket_path), mode=0o700, exist_ok=True)
+        remove_stale_socket(socket_path)
+        server = socketserver.UnixStreamServer(socket_path, request_handler)
+        os.chmod(socket_path, 0o600)
+        address = socket_path
+
+    print(f"[LOG] [DAEMON] Listening on {address} for the jobs {sorted(job_handlers)}.")
+    try:
+        with server:
+            while not server_state['shutdown']:
+                server.handle_request()
+    finally:
+        if port is None and os.path.exists(socket_path):
+            os.remove(socket_path)
+        if driver_pool is not None:
+            driver_pool.close()
+        print("[LOG] [DAEMON] Stopped.")
+
+
+def send_job(command, argv=None, socket_path=None, port=None):
+    """Sends a job to the collector daemon and waits for its response.
+
+    Args:
+        command (str): name of the job.
+        argv (list): arguments of the job, as for the script of the stage.
+        socket_path (str): path of the Unix socket of the daemon
+                           (see `get_default_socket_path` if None).
+        port (int): local TCP port of the daemon instead of the Unix socket.
+
+    Returns:
+        dict, Response with the keys 'status', 'output', 'duration' and 'error'.
+    """
+
+    if port is not None:
+        client = socket.create_connection(('127.0.0.1', port))
+    else:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(socket_path or get_default_socket_path())
+
+    with client, client.makefile('rwb') as stream:
+        stream.write((json.dumps({'command': command, 'argv': argv or []}) + '\n').encode('utf-8'))
+        stream.flush()
+        response_dict = json.loads(stream.readline().decode('utf-8'))
+
+    return response_dict
+
+
+def client_main(argv=None):
+    """Client command line of the collector daemon.
+
+    Usage: `daemon.py [--socket_path PATH | --port PORT] JOB [JOB ARGUMENTS]`, where the
+    job is a command of the collector command line with its arguments
+    (e.g. `collect-pages --headless True`), the daemon being started by `collector daemon`.
+
+    Args:
+        argv (list): arguments to parse, the command line arguments if None.
+
+    Returns:
+        int, Exit code.
+    """
+
+    parser = argparse.ArgumentParser(description="Sends a job to the collector daemon.")
+    parser.add_argument("--socket_path", help="Unix socket of the daemon.", type=str,
+                        default=None)
+    parser.add_argument("--port", help="Local TCP port of the daemon.", type=int, default=None)
+    parser.add_argument("command", help="Job name, 'ping' or 'shutdown'.", type=str)
+    args, job_argv = parser.parse_known_args(argv)
+
+    response_dict = send_job(command=args.command, argv=job_argv,
+                             socket_path=args.socket_path, port=args.port)
+
+    print(response_dict.get('output', ''), end='')
+    if response_dict['status'] != 'ok':
+        print(f"[LOG] [DAEMON] [ERROR] {response_dict['error']}")
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(client_main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+
+import hashlib
+import heapq
+import mmap
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.append('..')
+
+from collector.packages.normalize import get_product_key
+
+
+# Fields identifying a review, with the key of its product
+REVIEW_HASH_FIELDS = ['writer_pseudo', 'review_date', 'review_title', 'review_text']
+
+# Size in bytes of the hash of a review
+REVIEW_HASH_SIZE = 16
+
+
+def get_review_hash(review_dict):
+    """Gets the stable hash of a review, from its product key, writer, date, title and text.
+
+    The whitespaces of the fields are normalized, so that the same review collected
+    twice with a different layout has the same hash.
+
+    Args:
+        review_dict (dict): review dictionary (or record).
+
+    Returns:
+        bytes, BLAKE2b hash of the review.
+    """
+
+    values = [get_product_key(review_dict)] + [review_dict.get(field) for field in REVIEW_HASH_FIELDS]
+    content = '\x1f'.join('' if value is None else ' '.join(str(value).split()) for value in values)
+
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=REVIEW_HASH_SIZE).digest()
+
+
+def iter_run(run_path, entry_size=REVIEW_HASH_SIZE):
+    """Iterates the hashes (or fixed-width entries) of a sorted run."""
+
+    with open(run_path, 'rb') as run_file:
+        while True:
+            review_hash = run_file.read(entry_size)
+            if not review_hash:
+                return
+            yield review_hash
+
+
+def run_contains(run_mmap, review_hash):
+    """Checks if a sorted run contains a hash, by bisection of its memory map."""
+
+    low, high = 0, len(run_mmap) // REVIEW_HASH_SIZE
+    while low < high:
+        middle = (low + high) // 2
+        if run_mmap[middle * REVIEW_HASH_SIZE:(middle + 1) * REVIEW_HASH_SIZE] < review_hash:
+            low = middle + 1
+        else:
+            high = middle
+
+    return run_mmap[low * REVIEW_HASH_SIZE:(low + 1) * REVIEW_HASH_SIZE] == review_hash
+
+
+class ReviewDeduplicator:
+    """Set of the hashes of the reviews seen, spilled to sorted runs on disk.
+
+    The hashes are kept in memory until `max_memory_hashes`, then written to a sorted
+    run of fixed-width hashes, searched by bisection of its memory map. When there are
+    more than `max_runs` runs, they are merged in one, so that a lookup reads a bounded
+    number of runs. With the defaults, the memory stays under 1 GB whatever the number
+    of reviews, the runs taking 16 bytes per review on disk.
+
+    Args:
+        max_memory_hashes (int): number of hashes kept in memory before spilling a run.
+        max_runs (int): number of runs before merging them.
+        tmp_folder_path (str): folder of the runs, a temporary folder if None.
+    """
+
+    def __init__(self, max_memory_hashes=5_000_000, max_runs=8, tmp_folder_path=None):
+        self.max_memory_hashes = max_memory_hashes
+        self.max_runs = max_runs
+        self.tmp_folder_path = tempfile.mkdtemp(prefix='dedupe_', dir=tmp_folder_path)
+        self.memory_hashes = set()
+        self.runs = []
+        self.n_run_files = 0
+        self.n_seen = 0
+        self.n_duplicates = 0
+
+    def add(self, review_hash):
+        """Adds a hash to the set.
+
+        Returns:
+            bool, True if the hash has already been added (duplicate).
+        """
+
+        self.n_seen += 1
+        if review_hash in self.memory_hashes or \
+           any(run_contains(run_mmap, review_hash) for _, _, run_mmap in self.runs):
+            self.n_duplicates += 1
+            return True
+
+        self.memory_hashes.add(review_hash)
+        if len(self.memory_hashes) >= self.max_memory_hashes:
+            self.spill()
+
+        return False
+
+    def is_duplicate(self, review_dict):
+        """Checks if a review has already been seen, and adds it to the set."""
+
+        return self.add(get_review_hash(review_dict))
+
+    def write_run(self, review_hashes):
+        """Writes sorted hashes in a new run and opens its memory map."""
+
+        run_path = os.path.join(self.tmp_folder_path, f"{self.n_run_files:06d}.run")
+        self.n_run_files += 1
+        with open(run_path, 'wb') as run_file:
+            for review_hash in review_hashes:
+                run_file.write(review_hash)
+
+        run_file = open(run_path, 'rb')
+        self.runs.append((run_path, run_file, mmap.mmap(run_file.fileno(), 0, access=mmap.ACCESS_READ)))
+
+    def spill(self):
+        """Writes the hashes in memory to a sorted run."""
+
+        if not self.memory_hashes:
+            return
+
+        self.write_run(sorted(self.memory_hashes))
+        self.memory_hashes = set()
+        print(f"[LOG] [DEDUPE] {self.n_seen} reviews seen, {len(self.runs)} runs on disk.")
+
+        if len(self.runs) > self.max_runs:
+            self.merge_runs()
+
+    def merge_runs(self):
+        """Merges the runs in one run."""
+
+        runs, self.runs = self.runs, []
+        self.write_run(heapq.merge(*[iter_run(run_path) for run_path, _, _ in runs]))
+        for run_path, run_file, run_mmap in runs:
+            run_mmap.close()
+            run_file.close()
+            os.remove(run_path)
+
+    def close(self):
+        """Removes the runs."""
+
+        for _, run_file, run_mmap in self.runs:
+            run_mmap.close()
+            run_file.close()
+        self.runs = []
+        self.memory_hashes = set()
+        shutil.rmtree(self.tmp_folder_path, ignore_errors=True)
+
+
+def deduplicate_reviews(reviews_dicts, deduplicator):
+    """Drops the reviews already seen by the deduplicator.
+
+    Args:
+        reviews_dicts (iterable[dict]): review dictionaries (or records).
+        deduplicator (ReviewDeduplicator): hashes of the reviews already seen.
+
+    Returns:
+        list[dict], Reviews not seen before, in their order.
+    """
+
+    return [review_dict for review_dict in reviews_dicts
+            if not deduplicator.is_duplicate(review_dict)]
@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+
+import glob
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+
+sys.path.append('..')
+
+from collector.packages.catalog import register_file
+from collector.packages.dedupe import get_review_hash, run_contains
+from collector.packages.normalize import get_product_key
+from collector.packages.save import atomic_write, write_json_array
+from collector.packages.serializer import dumps, loads
+
+
+# Fields of the products whose changes are in the delta feed
+DELTA_PRODUCT_FIELDS = ['n_reviews', 'mean_rating', 'product_price']
+
+# Entry of the products state: hash of the product key and hash of its delta fields
+PRODUCT_STATE_ENTRY = struct.Struct('<8s8s')
+
+# Length of the timestamp at the start of the file names
+TIMESTAMP_LENGTH = len('2024_01_31_12_00_00')
+
+
+def get_hash(content):
+    """Gets the 8-byte hash of a string."""
+
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=8).digest()
+
+
+def get_state_path(file_path):
+    """Gets the path of the state of an aggregated file."""
+
+    return file_path + '.state'
+
+
+def get_previous_state_path(file_path):
+    """Gets the state of the previous generation of an aggregated file.
+
+    Args:
+        file_path (str): path of the aggregated file.
+
+    Returns:
+        str, Path of the state of the most recent previous aggregated file of the same
+        data type and source, None for the first generation.
+    """
+
+    folder_path, file_name = os.path.split(file_path)
+    state_paths = sorted(
+        state_path for state_path in glob.glob(
+            os.path.join(folder_path, '*' + file_name[TIMESTAMP_LENGTH:] + '.state'))
+        if os.path.basename(state_path) < file_name)
+
+    return state_paths[-1] if state_paths else None
+
+
+def iter_products(products_files):
+    """Iterates the products of the aggregated products files (one or several per file)."""
+
+    for products in products_files:
+        yield from (products if isinstance(products, list) else [products])
+
+
+def get_delta_path(data_type, source, delta_folder_path):
+    """Gets the path of a new delta file in the delta folder, created if needed."""
+
+    os.makedirs(delta_folder_path, exist_ok=True)
+
+    return os.path.join(
+        delta_folder_path, f"{time.strftime('%Y_%m_%d_%H_%M_%S')}_{data_type}_{source}.json")
+
+
+def save_delta(delta_dict, data_type, source, delta_folder_path):
+    """Saves a delta in the delta folder.
+
+    Returns:
+        str, Path of the delta file.
+    """
+
+    delta_file_path = get_delta_path(data_type=data_type, source=source,
+                                     delta_folder_path=delta_folder_path)
+    content = dumps(delta_dict)
+    atomic_write(file_path=delta_file_path, content=content)
+    register_file(file_path=delta_file_path,
+                  n_records=sum(len(records) for records in delta_dict.values()
+                                if isinstance(records, list)),
+                  content=content)
+
+    return delta_file_path
+
+
+def write_products_delta(file_path, products_files, source, delta_folder_path):
+    """Writes the state of an aggregated products file and its delta from the previous
+    generation: the new products, and the products whose number of reviews, mean
+    rating or price have changed.
+
+    The products are compared by the hashes of their keys and of their delta fields,
+    stored in the state of each generation.
+
+    Args:
+        file_path (str): path of the aggregated products file.
+        products_files (list): aggregated products.
+        source (str): name of the source.
+        delta_folder_path (str): folder of the delta files.
+
+    Returns:
+        dict, Delta of the products.
+    """
+
+    previous_state_path = get_previous_state_path(file_path)
+    previous_state = {}
+    if previous_state_path is not None:
+        with open(previous_state_path, 'rb') as state_file:
+            previous_state = dict(PRODUCT_STATE_ENTRY.iter_unpack(state_file.read()))
+
+    # The products collected several times are compared from their most recent collect
+    products_dicts = {}
+    for product in iter_products(products_files):
+        product_key = get_product_key(product)
+        if product_key is not None:
+            products_dicts[get_hash(product_key)] = product
+
+    state = {}
+    new_products = []
+    changed_products = []
+    for key_hash, product in products_dicts.items():
+        state[key_hash] = get_hash(dumps([product.get(field) for field in DELTA_PRODUCT_FIELDS],
+                                         pretty=False).decode('utf-8'))
+        if key_hash not in previous_state:
+            new_products.append(product)
+        elif previous_state[key_hash] != state[key_hash]:
+            changed_products.append(product)
+
+    atomic_write(file_path=get_state_path(file_path),
+                 content=b''.join(PRODUCT_STATE_ENTRY.pack(*entry) for entry in sorted(state.items())))
+
+    delta_dict = {
+        'generation': os.path.basename(file_path),
+        'previous_generation': os.path.basename(previous_state_path)[:-len('.state')]
+        if previous_state_path else None,
+        'new': new_products,
+        'changed': changed_products,
+    }
+    save_delta(delta_dict=delta_dict, data_type='delta_products', source=source,
+               delta_folder_path=delta_folder_path)
+    print(f"[LOG] [DELTA] {len(new_products)} new products and {len(changed_products)} "
+          f"changed products since the previous generation.")
+
+    return delta_dict
+
+
+class ReviewsDelta:
+    """Delta of an aggregated reviews file from the previous generation, built one review
+    at a time so that the aggregated reviews can be streamed to their file.
+
+    The state of a generation is the sorted hashes of its reviews (see
+    `dedupe.get_review_hash`), searched by bisection of its memory map. The hashes of the
+    generation are kept in memory, its new reviews are spooled to a temporary file as
+    they are found, then streamed to the delta file.
+
+    Args:
+        file_path (str): path of the aggregated reviews file.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.previous_state_path = get_previous_state_path(file_path)
+        self.previous_state_file = None
+        self.previous_state_mmap = None
+        if self.previous_state_path is not None and os.path.getsize(self.previous_state_path):
+            self.previous_state_file = open(self.previous_state_path, 'rb')
+            self.previous_state_mmap = mmap.mmap(self.previous_state_file.fileno(), 0,
+                                                 access=mmap.ACCESS_READ)
+        self.review_hashes = set()
+        self.new_reviews_file = tempfile.TemporaryFile()
+        self.n_new_reviews = 0
+
+    def add(self, review):
+        """Adds a review of the generation, new if it isn't in the previous state."""
+
+        review_hash = get_review_hash(review)
+        if review_hash in self.review_hashes:
+            return
+        self.review_hashes.add(review_hash)
+        if self.previous_state_mmap is None or not run_contains(self.previous_state_mmap, review_hash):
+            self.new_reviews_file.write(dumps(review, pretty=False) + b'\n')
+            self.n_new_reviews += 1
+
+    def iter_reviews(self, reviews):
+        """Yields the reviews, adding each of them to the delta."""
+
+        for review in reviews:
+            self.add(review)
+            yield review
+
+    def iter_new_reviews(self):
+        """Iterates the new reviews spooled to the temporary file."""
+
+        self.new_reviews_file.seek(0)
+        for line in self.new_reviews_file:
+            yield loads(line)
+
+    def close(self):
+        """Closes the memory map of the previous state."""
+
+        if self.previous_state_mmap is not None:
+            self.previous_state_mmap.close()
+            self.previous_state_file.close()
+            self.previous_state_mmap = None
+
+    def write(self, source, delta_folder_path):
+        """Writes the state of the generation and its delta: the new reviews.
+
+        Args:
+            source (str): name of the source.
+            delta_folder_path (str): folder of the delta files.
+
+        Returns:
+            dict, Generations of the delta and number of new reviews.
+        """
+
+        self.close()
+        atomic_write(file_path=get_state_path(self.file_path),
+                     content=b''.join(sorted(self.review_hashes)))
+
+        delta_dict = {
+            'generation': os.path.basename(self.file_path),
+            'previous_generation': os.path.basename(self.previous_state_path)[:-len('.state')]
+            if self.previous_state_path else None,
+        }
+        delta_file_path = get_delta_path(data_type='delta_reviews', source=source,
+                                         delta_folder_path=delta_folder_path)
+        try:
+            n_new_reviews, n_bytes, checksum = write_json_array(
+                file_path=delta_file_path, records=self.iter_new_reviews(),
+                fields=delta_dict, records_field='new')
+        finally:
+            self.new_reviews_file.close()
+        register_file(file_path=delta_file_path, n_records=n_new_reviews, n_bytes=n_bytes,
+                      checksum=checksum)
+        print(f"[LOG] [DELTA] {n_new_reviews} new reviews since the previous generation.")
+
+        return dict(delta_dict, n_new=n_new_reviews)
+
+
+def write_reviews_delta(file_path, reviews_files, source, delta_folder_path):
+    """Writes the state of an aggregated reviews file and its delta from the previous
+    generation: the new reviews (see `ReviewsDelta`).
+
+    Args:
+        file_path (str): path of the aggregated reviews file.
+        reviews_files (iterable): aggregated reviews.
+        source (str): name of the source.
+        delta_folder_path (str): folder of the delta files.
+
+    Returns:
+        dict, Generations of the delta and number of new reviews.
+    """
+
+    reviews_delta = ReviewsDelta(file_path=file_path)
+    try:
+        for review in reviews_files:
+            reviews_delta.add(review)
+    finally:
+        reviews_delta.close()
+
+    return reviews_delta.write(source=source, delta_folder_path=delta_folder_path)
@@ -2,9 +2,14 @@
 
 import sys
 import random
+import threading
+import time
 
 sys.path.append('..')
 
+from collector.packages.metrics import DRIVER_QUIT_SECONDS, DRIVER_START_SECONDS
+from collector.packages.tracing import span
+
 
 def get_random_user_agent():
     """Generates random user agent."""
@@ -45,21 +50,193 @@ def get_driver_dict(driver_path,
         'options': options,
         'headless': args.headless,
         'delete_cookies': args.delete_cookies,
+        'page_load_timeout': getattr(args, 'page_load_timeout', 120),
+        'script_timeout': getattr(args, 'script_timeout', 60),
+        'hang_timeout': getattr(args, 'hang_timeout', 1800),
+        'max_rss_mb': getattr(args, 'max_rss_mb', 3072),
     }
 
 
+def create_driver(driver_dict, random_user_agent=True):
+    """Creates the driver with its page-load and script timeouts.
+
+    Args:
+        driver_dict (dict): dictionary with information of the driver.
+        random_user_agent (bool): to set a random user agent or not.
+
+    Returns:
+        WebDriver, Selenium webdriver.
+    """
+
+    # Reuse a warm driver of the pool
+    if driver_dict.get('driver_pool') is not None:
+        with span('driver_start', pooled=True):
+            return driver_dict['driver_pool'].acquire(driver_dict=driver_dict,
+                                                      random_user_agent=random_user_agent)
+
+    with span('driver_start', pooled=False):
+        return start_driver(driver_dict=driver_dict, random_user_agent=random_user_agent)
+
+
+def start_driver(driver_dict, random_user_agent=True):
+    """Starts a new Chrome driver with its page-load and script timeouts.
+
+    A 'driver_factory' of the driver dictionary, called with the dictionary, starts the
+    driver instead of Chrome (e.g. the fake drivers of `fakedriver`).
+
+    Args:
+        driver_dict (dict): dictionary with information of the driver.
+        random_user_agent (bool): to set a random user agent or not.
+
+    Returns:
+        WebDriver, Selenium webdriver.
+    """
+
+    if driver_dict.get('driver_factory') is not None:
+        start_time = time.perf_counter()
+        driver = driver_dict['driver_factory'](driver_dict=driver_dict)
+        DRIVER_START_SECONDS.observe(time.perf_counter() - start_time)
+    else:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+
+        # Get a random user agent
+        if random_user_agent:
+            driver_dict['options'].add_argument(f'user-agent={get_random_user_agent()}')
+
+        # Set the driver
+        if driver_dict['headless']:
+            driver_dict['options'].add_argument("--headless")
+
+        start_time = time.perf_counter()
+        service = Service(executable_path=driver_dict['driver_path'])
+        driver = webdriver.Chrome(service=service, options=driver_dict['options'])
+        DRIVER_START_SECONDS.observe(time.perf_counter() - start_time)
+
+    # Set the timeouts so that a hung page raises instead of blocking the collect
+    if driver_dict.get('page_load_timeout'):
+        driver.set_page_load_timeout(driver_dict['page_load_timeout'])
+    if driver_dict.get('script_timeout'):
+        driver.set_script_timeout(driver_dict['script_timeout'])
+
+    return driver
+
+
 def quit_driver(driver, delete_cookies):
     """Quit the driver.
 
+    A driver acquired from a driver pool is released to the pool instead.
+
     Args:
         driver (WebDriver): selenium webdriver.
         delete_cookies (bool): to delete cookies or not.
     """
     
-    try:
-        driver.quit()
-        if delete_cookies:
-            driver.delete_all_cookies()
-    except Exception as e:
-        print(f"[LOG] [EXCEPTION]\n{e}")
+    driver_pool = getattr(driver, 'driver_pool', None)
+    if driver_pool is not None:
+        driver_pool.release(driver=driver, delete_cookies=delete_cookies)
+        return
+
+    start_time = time.perf_counter()
+    with span('driver_quit'):
+        try:
+            driver.quit()
+            if delete_cookies:
+                driver.delete_all_cookies()
+        except Exception as e:
+            print(f"[LOG] [EXCEPTION]\n{e}")
+    DRIVER_QUIT_SECONDS.observe(time.perf_counter() - start_time)
+
+
+class DriverPool:
+    """Pool of warm drivers reused between the collects of a long-running process.
+
+    A released driver is reset (extra tabs closed, cookies deleted, blank page) and
+    kept for the next `acquire`, so the Chrome startup is only paid once. A driver
+    which can't be reset (crashed or killed by the watchdog) is quit and dropped.
+    The user agent of a warm driver is the one set at its start.
+
+    Args:
+        max_size (int): maximum number of idle drivers kept in the pool.
+    """
+
+    def __init__(self, max_size=2):
+        self.max_size = max_size
+        self.idle_drivers = []
+        self.n_started = 0
+        self.n_reused = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, driver_dict, random_user_agent=True):
+        """Gets an idle driver, or starts a new one.
+
+        Args:
+            driver_dict (dict): dictionary with information of the driver.
+            random_user_agent (bool): to set a random user agent on a new driver or not.
+
+        Returns:
+            WebDriver, Selenium webdriver.
+        """
+
+        with self._lock:
+            driver = self.idle_drivers.pop() if self.idle_drivers else None
+
+        if driver is not None:
+            self.n_reused += 1
+            return driver
+
+        driver = start_driver(driver_dict=driver_dict, random_user_agent=random_user_agent)
+        driver.driver_pool = self
+        self.n_started += 1
+
+        return driver
+
+    def release(self, driver, delete_cookies):
+        """Resets the driver and keeps it idle in the pool.
+
+        Args:
+            driver (WebDriver): selenium webdriver acquired from the pool.
+            delete_cookies (bool): to delete cookies or not.
+        """
+
+        try:
+            for window_handle in driver.window_handles[1:]:
+                driver.switch_to.window(window_handle)
+                driver.close()
+            driver.switch_to.window(driver.window_handles[0])
+            if delete_cookies:
+                driver.delete_all_cookies()
+            driver.get('about:blank')
+        except Exception as e:
+            print(f"[LOG] [DRIVER POOL] The driver can't be reused.\n[LOG] [EXCEPTION]\n{e}")
+            self.discard(driver=driver)
+            return
+
+        with self._lock:
+            if len(self.idle_drivers) < self.max_size:
+                self.idle_drivers.append(driver)
+                return
+
+        self.discard(driver=driver)
+
+    def discard(self, driver):
+        """Quits a driver of the pool.
+
+        Args:
+            driver (WebDriver): selenium webdriver acquired from the pool.
+        """
+
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"[LOG] [EXCEPTION]\n{e}")
+
+    def close(self):
+        """Quits all the idle drivers of the pool."""
 
+        with self._lock:
+            idle_drivers, self.idle_drivers = self.idle_drivers, []
+        for driver in idle_drivers:
+            self.discard(driver=driver)
+        print(f"[LOG] [DRIVER POOL] {self.n_started} drivers started, "
+              f"{self.n_reused} drivers reused.")
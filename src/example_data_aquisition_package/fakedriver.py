@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+
+import itertools
+import re
+import sys
+import threading
+import time
+
+sys.path.append('..')
+
+
+# Seconds the previous document stays 'complete' after a navigation started by a script,
+# until the navigation commits as in a browser
+NAVIGATION_COMMIT_TIME = 0.05
+
+# Variable of the window in a script, e.g. 'window.collectorNavigating'
+WINDOW_VARIABLE_PATTERN = re.compile(r"window\.(collector\w+)")
+
+
+class FakeDriverException(Exception):
+    """Error of a fake driver, classified by its message like a `WebDriverException`."""
+
+
+class FakeSwitchTo:
+    """`switch_to` of a fake driver."""
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, window_handle):
+        self._driver.check_session()
+        if window_handle not in self._driver.windows:
+            raise FakeDriverException(f"no such window: {window_handle}")
+        self._driver.current_window_handle = window_handle
+
+    def new_window(self, type_hint=None):
+        self._driver.check_session()
+        self._driver.current_window_handle = self._driver.open_window()
+
+
+class FakeDriver:
+    """In-process stand-in of a selenium webdriver browsing a `testsite.TestSite`,
+    without browser nor network.
+
+    It implements what the collect uses of a webdriver: `get`, `page_source`, `title`,
+    `current_url`, the tabs (`switch_to`, `window_handles`, `close`), the scripts
+    starting a page load in a tab and polling its `document.readyState`, the
+    navigation timing, the cookies, the timeouts and `quit`. The pages are loaded with
+    the latency and the injections of the site, in a thread for the loads started by
+    a script, so the tabs load concurrently as in a browser. As in a browser, the
+    previous document of a navigation started by a script stays 'complete', with its
+    page source and the variables set on its `window`, until the navigation commits.
+
+    Args:
+        test_site (TestSite): site served to the driver.
+        start_time (float): simulated seconds to start the driver.
+    """
+
+    def __init__(self, test_site, start_time=0.0):
+        self.test_site = test_site
+        self.windows = {}
+        self.session_id = 'fake'
+        self._window_ids = itertools.count()
+        self._lock = threading.Lock()
+        if start_time:
+            time.sleep(start_time)
+        self.current_window_handle = self.open_window()
+
+    def check_session(self):
+        """Raises like a quit webdriver."""
+
+        if self.session_id is None:
+            raise FakeDriverException("invalid session id")
+
+    def open_window(self):
+        """Opens a blank window and gets its handle."""
+
+        window_handle = f"fake-window-{next(self._window_ids)}"
+        self.windows[window_handle] = {'url': 'about:blank', 'status_code': 200,
+                                       'page_source': '<html><head></head><body></body></html>',
+                                       'load_thread': None, 'load_time': 0.0,
+                                       'committed': True, 'window_variables': set()}
+
+        return window_handle
+
+    @property
+    def window(self):
+        self.check_session()
+        return self.windows[self.current_window_handle]
+
+    def load(self, window, url):
+        """Loads a URL of the test site in a window."""
+
+        start_time = time.perf_counter()
+        if url == 'about:blank':
+            status_code, page_source = 200, '<html><head></head><body></body></html>'
+        else:
+            status_code, page_source = self.test_site.fetch(url)
+        with self._lock:
+            window.update({'url': url, 'status_code': status_code, 'page_source': page_source,
+                           'load_time': time.perf_counter() - start_time})
+
+    def navigate(self, window, url):
+        """Loads a URL in a window like a navigation started by a script: the previous
+        document is kept until the navigation commits, then the new one is loading."""
+
+        time.sleep(NAVIGATION_COMMIT_TIME)
+        with self._lock:
+            window.update({'url': url, 'page_source': '<html><head></head><body></body></html>',
+                           'committed': True, 'window_variables': set()})
+        self.load(window=window, url=url)
+
+    def wait_loaded(self, window):
+        """Waits for the load started in a window by a script."""
+
+        load_thread = window['load_thread']
+        if load_thread is not None:
+            load_thread.join()
+            window['load_thread'] = None
+
+    def get(self, url):
+        window = self.window
+        self.wait_loaded(window)
+        self.load(window=window, url=url)
+
+    @property
+    def page_source(self):
+        # The current document, which is the previous one until a navigation commits
+        return self.window['page_source']
+
+    @property
+    def title(self):
+        page_source = self.page_source
+        start = page_source.find('<title>')
+        if start == -1:
+            return ''
+        return page_source[start + len('<title>'):page_source.find('</title>', start)]
+
+    @property
+    def current_url(self):
+        return self.window['url']
+
+    @property
+    def window_handles(self):
+        self.check_session()
+        return list(self.windows)
+
+    @property
+    def switch_to(self):
+        return FakeSwitchTo(driver=self)
+
+    def execute_script(self, script, *args):
+        window = self.window
+        if 'window.location.href' in script and args:
+            self.wait_loaded(window)
+            # The variables set on the window before the navigation, e.g. a marker
+            window['window_variables'] = set(WINDOW_VARIABLE_PATTERN.findall(script))
+            window['committed'] = False
+            window['load_thread'] = threading.Thread(
+                target=self.navigate, kwargs={'window': window, 'url': args[0]}, daemon=True)
+            window['load_thread'].start()
+            return None
+        if 'document.readyState' in script:
+            load_thread = window['load_thread']
+            is_loading = window['committed'] and load_thread is not None and load_thread.is_alive()
+            ready_state = 'loading' if is_loading else 'complete'
+            # A script checking a variable of the window besides the ready state
+            window_variables = set(WINDOW_VARIABLE_PATTERN.findall(script))
+            if window_variables:
+                return ready_state == 'complete' and not window_variables & window['window_variables']
+            return ready_state
+        if 'responseStatus' in script:
+            self.wait_loaded(window)
+            return window['status_code']
+        if 'performance.timing' in script:
+            self.wait_loaded(window)
+            return round(window['load_time'] * 1000)
+        return None
+
+    def close(self):
+        window = self.window
+        self.wait_loaded(window)
+        del self.windows[self.current_window_handle]
+
+    def delete_all_cookies(self):
+        self.check_session()
+
+    def set_page_load_timeout(self, time_to_wait):
+        self.check_session()
+
+    def set_script_timeout(self, time_to_wait):
+        self.check_session()
+
+    def quit(self):
+        self.check_session()
+        for window in self.windows.values():
+            self.wait_loaded(window)
+        self.windows = {}
+        self.session_id = None
+
+
+def get_fake_driver_dict(test_site, start_time=0.0, driver_pool=None):
+    """Gets the driver parameters dictionary of fake drivers browsing a test site.
+
+    The 'driver_factory' of the dictionary replaces the start of Chrome by
+    `driver.start_driver`, so the collect functions run unchanged on the fake drivers.
+
+    Args:
+        test_site (TestSite): site served to the drivers.
+        start_time (float): simulated seconds to start a driver.
+        driver_pool (DriverPool): pool of warm drivers, none if None.
+
+    Returns:
+        dict, Driver parameters dictionary.
+    """
+
+    def start_fake_driver(driver_dict):
+        return FakeDriver(test_site=test_site, start_time=start_time)
+
+    return {
+        'driver_path': None,
+        'options': None,
+        'headless': True,
+        'delete_cookies': True,
+        'page_load_timeout': 120,
+        'script_timeout': 60,
+        'hang_timeout': 1800,
+        'max_rss_mb': None,
+        'driver_pool': driver_pool,
+        'driver_factory': start_fake_driver,
+    }
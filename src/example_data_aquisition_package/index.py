@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+
+import hashlib
+import heapq
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+
+sys.path.append('..')
+
+from collector.packages.dedupe import iter_run
+from collector.packages.normalize import get_product_key
+from collector.packages.save import SEGMENT_INDEX_ENTRY, open_atomic, write_json_array
+from collector.packages.serializer import dumps, loads
+
+
+# Entry of the offset index: offset and length of each record of the JSON array
+OFFSET_ENTRY = SEGMENT_INDEX_ENTRY
+
+# Entry of the key index: hash of the key and record number, sorted for the bisection
+KEY_ENTRY = struct.Struct('<8sQ')
+
+# Entry of the key index while it is written, big-endian so that the packed entries sort
+# as bytes in the order of their hash then of their record number
+SORTABLE_KEY_ENTRY = struct.Struct('>8sQ')
+
+
+def get_key_hash(key):
+    """Gets the 8-byte hash of a key of the key index."""
+
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+
+
+def get_record_keys(record):
+    """Gets the keys of a product or review record: its product key, EAN and GTIN.
+
+    The keys of a list of products (one save of several products) are the keys of
+    its products, the items which aren't products being skipped.
+
+    Args:
+        record (dict): product or review dictionary (or record), or list of products.
+
+    Returns:
+        list[str], Keys of the record, e.g. 'code_source:123', 'ean:3600523', 'gtin:0360052'.
+    """
+
+    if isinstance(record, list):
+        return list(dict.fromkeys(key for sub_record in record if hasattr(sub_record, 'get')
+                                  for key in get_record_keys(sub_record)))
+
+    keys = []
+    product_key = get_product_key(record)
+    if product_key is not None:
+        keys.append(product_key)
+    for field, prefix in [('code_ean', 'ean'), ('code_gtin', 'gtin')]:
+        if record.get(field) is not None:
+            keys.append(f"{prefix}:{record[field]}")
+
+    return keys
+
+
+def get_index_paths(file_path):
+    """Gets the paths of the offset index and of the key index of a JSON file."""
+
+    return file_path + '.idx', file_path + '.keys'
+
+
+class KeyIndexWriter:
+    """Writer of a key index, with its entries spilled to sorted runs on disk.
+
+    The entries are packed in a buffer (16 bytes per key) until `max_memory_entries`,
+    then sorted and written to a run. The runs are merged when the key index is
+    written, so that the memory stays bounded whatever the number of records.
+
+    Args:
+        max_memory_entries (int): number of entries kept in memory before spilling a run.
+        tmp_folder_path (str): parent folder of the runs, the temporary folder if None.
+    """
+
+    def __init__(self, max_memory_entries=1_000_000, tmp_folder_path=None):
+        self.max_memory_entries = max_memory_entries
+        self.tmp_folder_path = tmp_folder_path
+        self.runs_folder_path = None
+        self.memory_entries = bytearray()
+        self.run_paths = []
+
+    def add(self, key_hash, record_number):
+        """Adds the entry of a key of a record."""
+
+        self.memory_entries += SORTABLE_KEY_ENTRY.pack(key_hash, record_number)
+        if len(self.memory_entries) >= self.max_memory_entries * SORTABLE_KEY_ENTRY.size:
+            self.spill()
+
+    def sort_memory_entries(self):
+        """Sorts the entries in memory and empties the buffer.
+
+        Returns:
+            list[bytes], Sorted packed entries.
+        """
+
+        memory_entries, self.memory_entries = bytes(self.memory_entries), bytearray()
+
+        return sorted(memory_entries[start:start + SORTABLE_KEY_ENTRY.size]
+                      for start in range(0, len(memory_entries), SORTABLE_KEY_ENTRY.size))
+
+    def spill(self):
+        """Writes the entries in memory to a sorted run."""
+
+        if self.runs_folder_path is None:
+            self.runs_folder_path = tempfile.mkdtemp(prefix='keys_', dir=self.tmp_folder_path)
+        run_path = os.path.join(self.runs_folder_path, f"{len(self.run_paths):06d}.run")
+        with open(run_path, 'wb') as run_file:
+            run_file.writelines(self.sort_memory_entries())
+        self.run_paths.append(run_path)
+
+    def write(self, file_path):
+        """Writes the key index, from the merge of the runs and of the entries in memory."""
+
+        sorted_entries = heapq.merge(
+            self.sort_memory_entries(),
+            *[iter_run(run_path, entry_size=SORTABLE_KEY_ENTRY.size) for run_path in self.run_paths])
+        with open_atomic(file_path) as key_index_file:
+            for entry in sorted_entries:
+                key_index_file.write(KEY_ENTRY.pack(*SORTABLE_KEY_ENTRY.unpack(entry)))
+
+    def close(self):
+        """Removes the runs."""
+
+        self.memory_entries = bytearray()
+        self.run_paths = []
+        if self.runs_folder_path is not None:
+            shutil.rmtree(self.runs_folder_path, ignore_errors=True)
+            self.runs_folder_path = None
+
+
+def write_indexed_json(file_path, records, key_function=get_record_keys, max_memory_entries=1_000_000):
+    """Writes records as a JSON array, with a sidecar offset index and key index.
+
+    The offset index has the offset and the length of each record in the file, the key
+    index the sorted hashes of the keys of the records with their record numbers, so
+    that `IndexedJsonReader` decodes only the requested records.
+
+    The records and their offsets are written one at a time (see `save.write_json_array`),
+    the key index entries are packed and spilled to sorted runs (see `KeyIndexWriter`).
+
+    Args:
+        file_path (str): path of the JSON file.
+        records (iterable[dict]): records to write.
+        key_function (function): function giving the keys of a record, no key index if None.
+        max_memory_entries (int): number of key index entries kept in memory before spilling a run.
+
+    Returns:
+        tuple, Number of records, size and checksum of the JSON file.
+    """
+
+    offset_index_path, key_index_path = get_index_paths(file_path)
+    key_index_writer = KeyIndexWriter(max_memory_entries=max_memory_entries)
+
+    try:
+        with open_atomic(offset_index_path) as offset_index_file:
+            def index_record(record_number, record, offset, length):
+                offset_index_file.write(OFFSET_ENTRY.pack(offset, length))
+                if key_function is not None:
+                    for key in key_function(record):
+                        key_index_writer.add(key_hash=get_key_hash(key), record_number=record_number)
+
+            file_info = write_json_array(file_path=file_path, records=records,
+                                         record_callback=index_record)
+
+        key_index_writer.write(file_path=key_index_path)
+    finally:
+        key_index_writer.close()
+
+    return file_info
+
+
+class IndexedJsonReader:
+    """Reader of the records of an indexed JSON file, with memory maps.
+
+    Only the requested records are decoded, so that a read costs about the same
+    whatever the size of the file.
+
+    Args:
+        file_path (str): path of the JSON file written by `write_indexed_json`.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        offset_index_path, key_index_path = get_index_paths(file_path)
+        self._files = []
+        self.data_mmap = self.open_mmap(file_path)
+        self.offset_mmap = self.open_mmap(offset_index_path)
+        self.key_mmap = self.open_mmap(key_index_path) if os.path.exists(key_index_path) else None
+
+    def open_mmap(self, file_path):
+        """Opens the read-only memory map of a file, None if it is empty."""
+
+        file_to_open = open(file_path, 'rb')
+        self._files.append(file_to_open)
+        if os.fstat(file_to_open.fileno()).st_size == 0:
+            return None
+
+        return mmap.mmap(file_to_open.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return len(self.offset_mmap) // OFFSET_ENTRY.size if self.offset_mmap is not None else 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def read(self, record_number):
+        """Reads and decodes one record.
+
+        Args:
+            record_number (int): number of the record in the JSON array.
+
+        Returns:
+            dict, Record.
+        """
+
+        if not 0 <= record_number < len(self):
+            raise IndexError(f"Record {record_number} out of range ({len(self)} records).")
+
+        offset, length = OFFSET_ENTRY.unpack_from(self.offset_mmap, record_number * OFFSET_ENTRY.size)
+
+        return loads(self.data_mmap[offset:offset + length])
+
+    def get_record_numbers(self, key):
+        """Gets the numbers of the records of a key, by bisection of the key index.
+
+        Args:
+            key (str): key of the records (see `get_record_keys`).
+
+        Returns:
+            list[int], Numbers of the records, in their order in the file.
+        """
+
+        if self.key_mmap is None:
+            return []
+
+        key_hash = get_key_hash(key)
+        low, high = 0, len(self.key_mmap) // KEY_ENTRY.size
+        while low < high:
+            middle = (low + high) // 2
+            if KEY_ENTRY.unpack_from(self.key_mmap, middle * KEY_ENTRY.size)[0] < key_hash:
+                low = middle + 1
+            else:
+                high = middle
+
+        record_numbers = []
+        while low < len(self.key_mmap) // KEY_ENTRY.size:
+            entry_key_hash, record_number = KEY_ENTRY.unpack_from(self.key_mmap, low * KEY_ENTRY.size)
+            if entry_key_hash != key_hash:
+                break
+            record_numbers.append(record_number)
+            low += 1
+
+        return record_numbers
+
+    def find(self, key):
+        """Reads the records of a key.
+
+        Args:
+            key (str): key of the records, e.g. 'code_source:123' or 'ean:3600523'.
+
+        Returns:
+            list[dict], Records of the key, in their order in the file.
+        """
+
+        return [self.read(record_number) for record_number in self.get_record_numbers(key)]
+
+    def close(self):
+        for memory_map in [self.data_mmap, self.offset_mmap, self.key_mmap]:
+            if memory_map is not None:
+                memory_map.close()
+        for file_to_close in self._files:
+            file_to_close.close()
+        self._files = []
@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+sys.path.append('..')
+
+from collector.packages.serializer import loads
+from collector.packages.utils import convert_n_reviews_to_int
+
+
+LEDGER_FILE_ENVIRONMENT_VARIABLE = 'COLLECTOR_LEDGER_FILE'
+
+# Statuses of the URLs collected with data
+COLLECTED_STATUSES = ['yes', 'once']
+
+LEDGER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_type TEXT NOT NULL,
+    source TEXT,
+    start_time REAL NOT NULL,
+    end_time REAL,
+    n_urls INTEGER,
+    n_statuses TEXT,
+    n_reviews_saved INTEGER,
+    n_records_aggregated INTEGER,
+    parameters TEXT
+);
+CREATE TABLE IF NOT EXISTS urls (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    url TEXT NOT NULL,
+    status TEXT,
+    error_class TEXT,
+    duration REAL,
+    n_reviews INTEGER,
+    n_saved_reviews INTEGER,
+    end_time REAL
+);
+CREATE INDEX IF NOT EXISTS runs_source ON runs (source, run_type);
+CREATE INDEX IF NOT EXISTS urls_run_id ON urls (run_id);
+"""
+
+class Ledger:
+    """Ledger of the runs of the collector in a local SQLite file.
+
+    Each run (collect of the URLs, collect of the pages, aggregation) is recorded with
+    its start and end, its source, the number of URLs of each status and the number of
+    reviews saved (or of records aggregated, for an aggregation). The collect of each
+    URL is recorded with its duration.
+
+    Args:
+        file_path (str): path of the SQLite file.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.run_id = None
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(file_path, check_same_thread=False)
+        self.connection.executescript(LEDGER_SCHEMA)
+
+    def start_run(self, run_type, source, n_urls=None, parameters=None):
+        """Records the start of a run, which becomes the current run.
+
+        Returns:
+            int, Identifier of the run.
+        """
+
+        with self._lock, self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (run_type, source, start_time, n_urls, parameters) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (run_type, source, time.time(), n_urls,
+                 json.dumps(parameters, default=str) if parameters else None))
+            self.run_id = cursor.lastrowid
+
+        return self.run_id
+
+    def record_url(self, url, status, duration, error_class=None, n_reviews=None,
+                   n_saved_reviews=None):
+        """Records the collect of a URL in the current run."""
+
+        if self.run_id is None:
+            return
+
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT INTO urls (run_id, url, status, error_class, duration, n_reviews, "
+                "n_saved_reviews, end_time) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.run_id, url, status, error_class, round(duration, 3),
+                 convert_n_reviews_to_int(n_reviews) if n_reviews is not None else None,
+                 n_saved_reviews, time.time()))
+
+    def end_run(self, n_urls=None, n_statuses=None, n_reviews_saved=None,
+                n_records_aggregated=None):
+        """Records the end of the current run.
+
+        Without number of reviews saved, it is the sum of the reviews saved of its URLs.
+        The number of records aggregated is the size of the file written by an aggregation,
+        which isn't a number of reviews saved. A run without end has been interrupted.
+        """
+
+        if self.run_id is None:
+            return
+
+        with self._lock, self.connection:
+            self.connection.execute(
+                "UPDATE runs SET end_time = ?, n_urls = COALESCE(?, n_urls), n_statuses = ?, "
+                "n_reviews_saved = COALESCE(?, (SELECT SUM(n_saved_reviews) FROM urls "
+                "WHERE run_id = ?)), n_records_aggregated = ? WHERE run_id = ?",
+                (time.time(), n_urls, json.dumps(n_statuses) if n_statuses else None,
+                 n_reviews_saved, self.run_id, n_records_aggregated, self.run_id))
+        self.run_id = None
+
+    def get_runs(self, source=None, run_type=None, n_runs=20):
+        """Gets the most recent runs with their throughput.
+
+        Returns:
+            list[dict], Runs, from the most recent.
+        """
+
+        query = ("SELECT r.run_id, r.run_type, r.source, r.start_time, r.end_time, r.n_urls, "
+                 "r.n_statuses, r.n_reviews_saved, r.n_records_aggregated, COUNT(u.url), SUM(u.duration) "
+                 "FROM runs r LEFT JOIN urls u ON u.run_id = r.run_id "
+                 "WHERE (? IS NULL OR r.source = ?) AND (? IS NULL OR r.run_type = ?) "
+                 "GROUP BY r.run_id ORDER BY r.run_id DESC LIMIT ?")
+        with self._lock:
+            rows = self.connection.execute(
+                query, (source, source, run_type, run_type, n_runs)).fetchall()
+
+        runs_dicts = []
+        for (run_id, run_type, source, start_time, end_time, n_urls, n_statuses,
+             n_reviews_saved, n_records_aggregated, n_recorded_urls, total_duration) in rows:
+            hours = ((end_time or time.time()) - start_time) / 3600
+            runs_dicts.append({
+                'run_id': run_id,
+                'run_type': run_type,
+                'source': source,
+                'start_time': start_time,
+                'end_time': end_time,
+                'n_urls': n_urls,
+                'n_statuses': json.loads(n_statuses) if n_statuses else None,
+                'n_reviews_saved': n_reviews_saved,
+                'n_records_aggregated': n_records_aggregated,
+                'n_recorded_urls': n_recorded_urls,
+                'urls_per_hour': round(n_recorded_urls / hours, 1) if hours else None,
+                'reviews_per_hour': round((n_reviews_saved or 0) / hours, 1) if hours else None,
+            })
+
+        return runs_dicts
+
+    def get_url_records(self, source):
+        """Gets the recorded collects of the URLs of a source.
+
+        Returns:
+            list[tuple], Status, duration, number of reviews and number of saved reviews.
+        """
+
+        with self._lock:
+            return self.connection.execute(
+                "SELECT u.status, u.duration, u.n_reviews, u.n_saved_reviews FROM urls u "
+                "JOIN runs r ON r.run_id = u.run_id "
+                "WHERE r.source = ? AND r.run_type = 'collect_pages'", (source,)).fetchall()
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+
+# Ledger of the process, None when off
+LEDGER = None
+
+
+def open_ledger(file_path):
+    """Opens the ledger of the process.
+
+    Args:
+        file_path (str): path of the SQLite file.
+
+    Returns:
+        Ledger, Ledger of the process.
+    """
+
+    global LEDGER
+
+    if LEDGER is None or LEDGER.file_path != file_path:
+        LEDGER = Ledger(file_path=file_path)
+
+    return LEDGER
+
+
+def get_ledger():
+    """Gets the ledger of the process, opened from the environment if needed.
+
+    Returns:
+        Ledger, Ledger of the process, None without ledger file.
+    """
+
+    if LEDGER is None and os.environ.get(LEDGER_FILE_ENVIRONMENT_VARIABLE):
+        return open_ledger(file_path=os.environ[LEDGER_FILE_ENVIRONMENT_VARIABLE])
+
+    return LEDGER
+
+
+def start_run(run_type, source, n_urls=None, parameters=None):
+    """Records the start of a run in the ledger, if any (see `Ledger.start_run`)."""
+
+    ledger = get_ledger()
+    if ledger is not None:
+        return ledger.start_run(run_type=run_type, source=source, n_urls=n_urls,
+                                parameters=parameters)
+
+
+def record_url(url, status, duration, error_class=None, n_reviews=None, n_saved_reviews=None):
+    """Records the collect of a URL in the ledger, if any (see `Ledger.record_url`)."""
+
+    ledger = get_ledger()
+    if ledger is not None:
+        ledger.record_url(url=url, status=status, duration=duration, error_class=error_class,
+                          n_reviews=n_reviews, n_saved_reviews=n_saved_reviews)
+
+
+def end_run(n_urls=None, n_statuses=None, n_reviews_saved=None, n_records_aggregated=None):
+    """Records the end of the current run in the ledger, if any (see `Ledger.end_run`)."""
+
+    ledger = get_ledger()
+    if ledger is not None:
+        ledger.end_run(n_urls=n_urls, n_statuses=n_statuses, n_reviews_saved=n_reviews_saved,
+                       n_records_aggregated=n_records_aggregated)
+
+
+def fit_url_cost(url_records):
+    """Fits the duration of the collect of a URL as a fixed cost plus a cost per review.
+
+    Args:
+        url_records (list[tuple]): status, duration, number of reviews and number of
+                                   saved reviews of the recorded collects.
+
+    Returns:
+        dict, Cost model of the URLs.
+    """
+
+    collected = [(n_saved_reviews or 0, duration) for status, duration, _, n_saved_reviews
+                 in url_records if status in COLLECTED_STATUSES and duration is not None]
+    failed = [duration for status, duration, _, _ in url_records
+              if status not in COLLECTED_STATUSES and duration is not None]
+    if not collected:
+        return None
+
+    # Least squares of the duration on the number of saved reviews
+    n = len(collected)
+    mean_reviews = sum(r for r, _ in collected) / n
+    mean_duration = sum(d for _, d in collected) / n
+    variance = sum((r - mean_reviews) ** 2 for r, _ in collected)
+    cost_per_review = sum((r - mean_reviews) * (d - mean_duration) for r, d in collected) / variance \
+        if variance else 0.0
+    cost_per_review = max(0.0, cost_per_review)
+
+    return {
+        'n_collected_urls': n,
+        'fixed_cost': max(0.0, mean_duration - cost_per_review * mean_reviews),
+        'cost_per_review': cost_per_review,
+        'mean_n_reviews': mean_reviews,
+        'n_failed_attempts_per_url': len(failed) / n,
+        'failed_attempt_cost': sum(failed) / len(failed) if failed else 0.0,
+    }
+
+
+def forecast_run(urls_to_collect_object_name, source, n_max_reviews=None, n_workers=1,
+                 ledger=None):
+    """Forecasts the duration of the collect of a URLs to collect file.
+
+    The duration of each URL left to collect is forecast from its `n_reviews` with the
+    fixed cost and the cost per review of the previous runs of the source, plus the
+    cost of the failed attempts per URL.
+
+    Args:
+        urls_to_collect_object_name (str): URLs to collect object name.
+        source (str): name of the source.
+        n_max_reviews (int): max number of reviews to collect per URL.
+        n_workers (int): number of partitions collected in parallel.
+        ledger (Ledger): ledger of the previous runs, the ledger of the process if None.
+
+    Returns:
+        dict, Forecast of the run, None without previous runs of the source.
+    """
+
+    ledger = ledger or get_ledger()
+    if ledger is None:
+        raise ValueError(f"No ledger, set {LEDGER_FILE_ENVIRONMENT_VARIABLE} or --ledger_file.")
+
+    url_cost = fit_url_cost(ledger.get_url_records(source=source))
+    if url_cost is None:
+        print(f"[LOG] [LEDGER] No collected URLs of the source '{source}' in the ledger.")
+        return None
+
+    with open(urls_to_collect_object_name, 'rb') as file_to_open:
+        urls_to_collect_dicts = loads(file_to_open.read())
+
+    n_urls_left = 0
+    n_reviews_left = 0
+    n_urls_without_n_reviews = 0
+    for url_to_collect_dict in urls_to_collect_dicts:
+        if url_to_collect_dict['collected'] not in ('no', 'issue'):
+            continue
+        n_urls_left += 1
+        if url_to_collect_dict.get('n_reviews') is None:
+            n_urls_without_n_reviews += 1
+            n_reviews = url_cost['mean_n_reviews']
+        else:
+            n_reviews = convert_n_reviews_to_int(url_to_collect_dict['n_reviews'])
+        if n_max_reviews is not None:
+            n_reviews = min(n_reviews, n_max_reviews)
+        n_reviews_left += n_reviews
+
+    duration = (n_urls_left * url_cost['fixed_cost']
+                + n_reviews_left * url_cost['cost_per_review']
+                + n_urls_left * url_cost['n_failed_attempts_per_url'] * url_cost['failed_attempt_cost'])
+
+    return {
+        'source': source,
+        'n_urls_left': n_urls_left,
+        'n_reviews_left': round(n_reviews_left),
+        'n_urls_without_n_reviews': n_urls_without_n_reviews,
+        'url_cost': {k: round(v, 4) for k, v in url_cost.items()},
+        'duration_hours': round(duration / 3600, 2),
+        'n_workers': n_workers,
+        'wall_duration_hours': round(duration / 3600 / max(1, n_workers), 2),
+    }
@@ -0,0 +1,332 @@
+#!/usr/bin/env python
+
+import bisect
+import os
+import sys
+import threading
+import time
+
+sys.path.append('..')
+
+
+# Upper bounds of the histogram buckets
+SECONDS_BUCKETS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800]
+COUNT_BUCKETS = [0, 1, 10, 50, 100, 500, 1000, 5000, 10000]
+
+
+def format_labels(labels):
+    """Formats the labels of a sample in the Prometheus text format.
+
+    Args:
+        labels (tuple): pairs of label name and value.
+
+    Returns:
+        str, Formatted labels, e.g. '{status="yes"}'.
+    """
+
+    if not labels:
+        return ''
+
+    formatted_labels = ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+        for name, value in labels)
+
+    return '{' + formatted_labels + '}'
+
+
+class Counter:
+    """Counter of events, with optional labels.
+
+    Args:
+        name (str): name of the metric.
+        documentation (str): help of the metric.
+    """
+
+    metric_type = 'counter'
+
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        """Increments the counter of the labels."""
+
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels):
+        """Gets the value of the counter of the labels."""
+
+        return self.values.get(tuple(sorted(labels.items())), 0)
+
+    def total(self):
+        """Gets the sum of the counters of all the labels."""
+
+        with self._lock:
+            return sum(self.values.values())
+
+    def samples(self):
+        """Yields the name, labels and value of each sample."""
+
+        with self._lock:
+            values = dict(self.values)
+        for key, value in sorted(values.items()):
+            yield self.name, key, value
+
+
+class Gauge(Counter):
+    """Value which can go up and down, with optional labels."""
+
+    metric_type = 'gauge'
+
+    def set(self, value, **labels):
+        """Sets the value of the gauge of the labels."""
+
+        with self._lock:
+            self.values[tuple(sorted(labels.items()))] = value
+
+
+class Histogram:
+    """Distribution of observed values in cumulative buckets, with optional labels.
+
+    Args:
+        name (str): name of the metric.
+        documentation (str): help of the metric.
+        buckets (list): sorted upper bounds of the buckets.
+    """
+
+    metric_type = 'histogram'
+
+    def __init__(self, name, documentation, buckets=SECONDS_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = list(buckets)
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """Observes a value for the labels."""
+
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            if key not in self.values:
+                self.values[key] = {'bucket_counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            histogram_dict = self.values[key]
+            bucket_index = bisect.bisect_left(self.buckets, value)
+            if bucket_index < len(self.buckets):
+                histogram_dict['bucket_counts'][bucket_index] += 1
+            histogram_dict['sum'] += value
+            histogram_dict['count'] += 1
+
+    def total(self):
+        """Gets the sum of the observed values of all the labels."""
+
+        with self._lock:
+            return sum(histogram_dict['sum'] for histogram_dict in self.values.values())
+
+    def time(self, **labels):
+        """Context manager observing the duration of its block."""
+
+        return HistogramTimer(histogram=self, labels=labels)
+
+    def samples(self):
+        """Yields the name, labels and value of each sample."""
+
+        with self._lock:
+            values = {key: dict(value, bucket_counts=list(value['bucket_counts']))
+                      for key, value in self.values.items()}
+        for key, histogram_dict in sorted(values.items()):
+            cumulative_count = 0
+            for bucket, bucket_count in zip(self.buckets, histogram_dict['bucket_counts']):
+                cumulative_count += bucket_count
+                yield f"{self.name}_bucket", key + (('le', bucket),), cumulative_count
+            yield f"{self.name}_bucket", key + (('le', '+Inf'),), histogram_dict['count']
+            yield f"{self.name}_sum", key, histogram_dict['sum']
+            yield f"{self.name}_count", key, histogram_dict['count']
+
+
+class HistogramTimer:
+    """Context manager observing the duration of its block in a histogram."""
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.histogram.observe(time.perf_counter() - self.start_time, **self.labels)
+
+
+class MetricsRegistry:
+    """Registry of the metrics of a collection run."""
+
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, metric):
+        """Registers a metric, or returns the metric already registered with its name."""
+
+        return self.metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, documentation):
+        return self.register(Counter(name, documentation))
+
+    def gauge(self, name, documentation):
+        return self.register(Gauge(name, documentation))
+
+    def histogram(self, name, documentation, buckets=SECONDS_BUCKETS):
+        return self.register(Histogram(name, documentation, buckets))
+
+    def render(self):
+        """Renders the metrics in the Prometheus text format.
+
+        Returns:
+            str, Metrics in the Prometheus text format.
+        """
+
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.metric_type}")
+            for sample_name, labels, value in metric.samples():
+                lines.append(f"{sample_name}{format_labels(labels)} {value}")
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self, file_path):
+        """Writes the metrics in a Prometheus text file (textfile collector format).
+
+        The file is replaced atomically so that a scraper never reads a partial file.
+
+        Args:
+            file_path (str): path of the metrics file.
+        """
+
+        tmp_file_path = f"{file_path}.tmp"
+        with open(tmp_file_path, 'w', encoding='utf-8') as file_to_dump:
+            file_to_dump.write(self.render())
+        os.replace(tmp_file_path, file_path)
+
+
+# Metrics of the collect
+METRICS = MetricsRegistry()
+
+PAGES = METRICS.counter(
+    'collector_pages_total', "Collected pages by URL status.")
+PAGES_PER_MINUTE = METRICS.gauge(
+    'collector_pages_per_minute', "Collected pages per minute since the start of the run.")
+DRIVER_START_SECONDS = METRICS.histogram(
+    'collector_driver_start_seconds', "Latency of the driver start.")
+DRIVER_QUIT_SECONDS = METRICS.histogram(
+    'collector_driver_quit_seconds', "Latency of the driver quit.")
+PAGE_LOAD_SECONDS = METRICS.histogram(
+    'collector_page_load_seconds', "Load time of the last page of each URL (navigation timing).")
+PAGE_COLLECT_SECONDS = METRICS.histogram(
+    'collector_page_collect_seconds', "Duration of the save function of each URL.")
+REVIEWS_SAVED = METRICS.histogram(
+    'collector_reviews_saved', "Reviews saved per URL.", buckets=COUNT_BUCKETS)
+STATUS_TRANSITIONS = METRICS.counter(
+    'collector_status_transitions_total', "Transitions of the URL statuses.")
+FAILURES = METRICS.counter(
+    'collector_failures_total', "Failed URL attempts by error class.")
+RETRIES = METRICS.counter(
+    'collector_retries_total', "Retried URL attempts.")
+BYTES_WRITTEN = METRICS.counter(
+    'collector_bytes_written_total', "Bytes written by saved data type.")
+WRITER_QUEUE_SIZE = METRICS.gauge(
+    'collector_writer_queue_size', "Saves waiting to be written by the background writer.")
+WRITER_BLOCKED_SECONDS = METRICS.histogram(
+    'collector_writer_blocked_seconds', "Time the collect waited for a full writer queue.")
+CORRUPT_FILES = METRICS.counter(
+    'collector_corrupt_files_total', "Corrupt or partial files (or segment records) found by the aggregators.")
+
+
+def observe_page_load_time(driver):
+    """Observes the load time of the page of the driver from the navigation timing.
+
+    Args:
+        driver (WebDriver): selenium webdriver.
+    """
+
+    try:
+        load_time = driver.execute_script(
+            "var t = window.performance.timing;"
+            "return t.loadEventEnd > 0 ? t.loadEventEnd - t.navigationStart : null;")
+    except Exception:
+        return
+
+    if isinstance(load_time, (int, float)) and load_time >= 0:
+        PAGE_LOAD_SECONDS.observe(load_time / 1000)
+
+
+def make_metrics_request_handler(registry):
+    """Makes the handler of the HTTP requests of the metrics endpoint."""
+
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsRequestHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsRequestHandler
+
+
+def start_metrics_exporter(file_path=None, port=None, interval=10, registry=METRICS):
+    """Exports the metrics during the run to a Prometheus text file and/or a local HTTP endpoint.
+
+    Args:
+        file_path (str): path of the metrics file, rewritten every `interval` seconds.
+        port (int): local port of the HTTP endpoint serving the metrics.
+        interval (float): seconds between two writes of the metrics file.
+        registry (MetricsRegistry): registry of the metrics to export.
+
+    Returns:
+        function, Function stopping the exporter (the metrics file is written a last time).
+    """
+
+    stop_event = threading.Event()
+    threads = []
+    server = None
+
+    if file_path:
+        def write_metrics_file():
+            while not stop_event.wait(interval):
+                registry.write(file_path)
+
+        threads.append(threading.Thread(target=write_metrics_file, daemon=True))
+        print(f"[LOG] [METRICS] Metrics written in {file_path} every {interval} seconds.")
+
+    if port:
+        from http.server import ThreadingHTTPServer
+
+        server = ThreadingHTTPServer(('127.0.0.1', port), make_metrics_request_handler(registry))
+        threads.append(threading.Thread(target=server.serve_forever, daemon=True))
+        print(f"[LOG] [METRICS] Metrics served on http://127.0.0.1:{port}/metrics.")
+
+    for thread in threads:
+        thread.start()
+
+    def stop_metrics_exporter():
+        stop_event.set()
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        if file_path:
+            registry.write(file_path)
+
+    return stop_metrics_exporter
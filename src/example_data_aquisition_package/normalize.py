@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+
+import hashlib
+import sys
+
+sys.path.append('..')
+
+
+# Format of the normalized reviews documents
+NORMALIZED_FORMAT = 'normalized_reviews'
+
+# Fields of the review dictionaries which are the same for all the reviews of a product
+PRODUCT_FIELDS = [
+    'product_name',
+    'product_sub_name',
+    'product_brand',
+    'product_brand_line',
+    'product_attribute_dict',
+    'url',
+    'category',
+    'sub_category',
+    'sub_sub_category',
+    'sub_sub_sub_category',
+    'code_asin',
+    'code_ean',
+    'code_gtin',
+    'code_sku',
+    'code_source',
+    'source',
+    'country',
+    'language',
+]
+
+
+def get_product_key(review_dict):
+    """Gets the key of the product of a review: its source code, else a hash of its URL.
+
+    Args:
+        review_dict (dict): review dictionary.
+
+    Returns:
+        str, Key of the product, None without source code and URL.
+    """
+
+    if review_dict.get('code_source') is not None:
+        return f"code_source:{review_dict['code_source']}"
+    if review_dict.get('url') is not None:
+        return f"url:{hashlib.blake2b(review_dict['url'].encode('utf-8'), digest_size=8).hexdigest()}"
+
+    return None
+
+
+def is_normalized(data):
+    """Checks if saved data is a normalized reviews document."""
+
+    return isinstance(data, dict) and data.get('format') == NORMALIZED_FORMAT
+
+
+def normalize_reviews(reviews_dicts):
+    """Normalizes reviews: the product fields are stored once per product.
+
+    Each review keeps its own fields and the key of its product. The product fields of
+    a review which differ from the ones of its product are kept in the review, so that
+    `denormalize_reviews` gives back the same reviews.
+
+    Args:
+        reviews_dicts (list[dict]): review dictionaries (or records).
+
+    Returns:
+        dict, Normalized reviews document with the products, by key, and the reviews.
+    """
+
+    products_dicts = {}
+    normalized_reviews_dicts = []
+    for review_dict in reviews_dicts:
+        product_key = get_product_key(review_dict)
+        if product_key is None:
+            normalized_reviews_dicts.append(dict(review_dict.items()))
+            continue
+
+        product_dict = products_dicts.get(product_key)
+        if product_dict is None:
+            product_dict = {field: review_dict[field] for field in PRODUCT_FIELDS
+                            if review_dict.get(field) is not None}
+            products_dicts[product_key] = product_dict
+
+        normalized_review_dict = {'product_key': product_key}
+        for field, value in review_dict.items():
+            if field not in product_dict or product_dict[field] != value:
+                if value is not None or field in product_dict:
+                    normalized_review_dict[field] = value
+        normalized_reviews_dicts.append(normalized_review_dict)
+
+    return {
+        'format': NORMALIZED_FORMAT,
+        'products': products_dicts,
+        'reviews': normalized_reviews_dicts,
+    }
+
+
+def iter_denormalized_reviews(normalized_dict):
+    """Iterates the reviews of a normalized reviews document with their product fields.
+
+    Args:
+        normalized_dict (dict): normalized reviews document (see `normalize_reviews`).
+
+    Yields:
+        dict, Review dictionary.
+    """
+
+    products_dicts = normalized_dict['products']
+    for normalized_review_dict in normalized_dict['reviews']:
+        product_key = normalized_review_dict.get('product_key')
+        if product_key is None:
+            yield normalized_review_dict
+            continue
+        review_dict = dict(products_dicts.get(product_key, {}))
+        review_dict.update(normalized_review_dict)
+        del review_dict['product_key']
+        yield review_dict
+
+
+def denormalize_reviews(normalized_dict):
+    """Joins the reviews of a normalized reviews document with their products.
+
+    Args:
+        normalized_dict (dict): normalized reviews document (see `normalize_reviews`).
+
+    Returns:
+        list[dict], Review dictionaries.
+    """
+
+    return list(iter_denormalized_reviews(normalized_dict))
+
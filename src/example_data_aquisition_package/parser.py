@@ -3,7 +3,6 @@
 import argparse
 import os
 import sys
-from distutils.util import strtobool
 
 sys.path.append('..')
 
@@ -20,21 +19,23 @@ def str_to_bool(string_input):
         bool, Boolean value of the argument.
     """
 
-    try:
-        return bool(strtobool(string_input))
-    except ValueError:
+    string_input = str(string_input).lower().strip()
+
+    if string_input in ('y', 'yes', 't', 'true', 'on', '1'):
+        return True
+    elif string_input in ('n', 'no', 'f', 'false', 'off', '0'):
+        return False
+    else:
         raise argparse.ArgumentTypeError("[LOG] [COMMAND LINE] Invalid value for boolean flag.")
 
 
-def create_products_listing_pages_files_arg_parser():
-    """Provides a parser to parse arguments for the create_products_listing_pages_files.py script.
+def add_create_products_listing_pages_files_arguments(parser):
+    """Adds the arguments of the create_products_listing_pages_files.py script to a parser.
 
-    Returns:
-        namespace, Parser with the parsed arguments.
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
     """
 
-    parser = argparse.ArgumentParser(description="Creates products-listing pages files.")
-
     parser.add_argument(
         "--headless",
         help="Enable headless mode (True/False).",
@@ -51,20 +52,32 @@ def create_products_listing_pages_files_arg_parser():
         default=True,
     )
 
-    args = parser.parse_args()
-    print(f"[LOG] Arguments parsed: {args}")
-
-    return args
 
+def create_products_listing_pages_files_arg_parser(argv=None):
+    """Provides a parser to parse arguments for the create_products_listing_pages_files.py script.
 
-def collect_urls_arg_parser():
-    """Provides a parser to parse arguments for the collect_urls.py script.
+    Args:
+        argv (list): arguments to parse, the command line arguments if None.
 
     Returns:
         namespace, Parser with the parsed arguments.
     """
 
-    parser = argparse.ArgumentParser(description="Collect product-listing pages URLs data.")
+    parser = argparse.ArgumentParser(description="Creates products-listing pages files.")
+    add_create_products_listing_pages_files_arguments(parser)
+
+    args = parser.parse_args(argv)
+    print(f"[LOG] Arguments parsed: {args}")
+
+    return args
+
+
+def add_collect_urls_arguments(parser):
+    """Adds the arguments of the collect_urls.py script to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
+    """
 
     parser.add_argument(
         "--headless",
@@ -113,7 +126,44 @@ def collect_urls_arg_parser():
         default=False,
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "--n_tabs", 
+        help="Number of tabs of one browser collecting the pages concurrently.", 
+        type=int, 
+        default=1
+    )
+
+    parser.add_argument(
+        "--metrics_file", 
+        help="Prometheus text file where the metrics are written during the run.", 
+        type=str, 
+        default=None
+    )
+
+    parser.add_argument(
+        "--metrics_port", 
+        help="Local port of the HTTP endpoint serving the metrics during the run.", 
+        type=int, 
+        default=None
+    )
+
+    add_saving_arguments(parser)
+
+
+def collect_urls_arg_parser(argv=None):
+    """Provides a parser to parse arguments for the collect_urls.py script.
+
+    Args:
+        argv (list): arguments to parse, the command line arguments if None.
+
+    Returns:
+        namespace, Parser with the parsed arguments.
+    """
+
+    parser = argparse.ArgumentParser(description="Collect product-listing pages URLs data.")
+    add_collect_urls_arguments(parser)
+
+    args = parser.parse_args(argv)
     print(f"[LOG] Arguments parsed: {args}")
 
     return args
@@ -140,14 +190,12 @@ def get_urls_object_name(args_urls_file_name, urls_folder_path):
     return urls_file_name
 
 
-def generate_urls_to_collect_arg_parser():
-    """Provides a parser to parse arguments for the generate_urls_to_collect.py script.
-        
-    Returns:
-        namespace, Parser with the parsed arguments.
+def add_generate_urls_to_collect_arguments(parser):
+    """Adds the arguments of the generate_urls_to_collect.py script to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
     """
-    
-    parser = argparse.ArgumentParser(description="Generate urls to collect file(s)")
 
     parser.add_argument(
         "--n_parts", 
@@ -163,20 +211,32 @@ def generate_urls_to_collect_arg_parser():
         default=False
     )
 
-    args=parser.parse_args()
-    print(f"[LOG] Arguments parsed: {args}")
-
-    return args
 
+def generate_urls_to_collect_arg_parser(argv=None):
+    """Provides a parser to parse arguments for the generate_urls_to_collect.py script.
 
-def collect_page_arg_parser():
-    """Provides a parser to parse arguments for the collect_page.py script.
+    Args:
+        argv (list): arguments to parse, the command line arguments if None.
 
     Returns:
         namespace, Parser with the parsed arguments.
     """
 
-    parser = argparse.ArgumentParser(description="Collect page product data.")
+    parser = argparse.ArgumentParser(description="Generate urls to collect file(s)")
+    add_generate_urls_to_collect_arguments(parser)
+
+    args=parser.parse_args(argv)
+    print(f"[LOG] Arguments parsed: {args}")
+
+    return args
+
+
+def add_collect_page_arguments(parser):
+    """Adds the arguments of the collect_page.py script to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
+    """
 
     parser.add_argument(
         "--headless",
@@ -200,7 +260,7 @@ def collect_page_arg_parser():
         type=str,
         default=False,
     )
-    
+
     parser.add_argument(
         "--n_max_reviews", 
         help="Max number of reviews to collect.", 
@@ -214,21 +274,33 @@ def collect_page_arg_parser():
         type=int, 
         default=2000
     )
-    
-    args=parser.parse_args()
-    print(f"[LOG] Arguments parsed: {args}")
 
-    return args
 
+def collect_page_arg_parser(argv=None):
+    """Provides a parser to parse arguments for the collect_page.py script.
 
-def collect_pages_arg_parser():
-    """Provides parser to parse arguments for the collect_pages function.
+    Args:
+        argv (list): arguments to parse, the command line arguments if None.
 
     Returns:
-        namespace, parser with the parsed arguments.
+        namespace, Parser with the parsed arguments.
     """
 
-    parser = argparse.ArgumentParser(description="Collect product pages data.")
+    parser = argparse.ArgumentParser(description="Collect page product data.")
+    add_collect_page_arguments(parser)
+
+    args=parser.parse_args(argv)
+    print(f"[LOG] Arguments parsed: {args}")
+
+    return args
+
+
+def add_collect_pages_arguments(parser):
+    """Adds the arguments of the collect_pages.py script to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
+    """
 
     parser.add_argument(
         "--headless",
@@ -245,57 +317,783 @@ def collect_pages_arg_parser():
         choices=[True, False],
         default=False
     )
-    
+
     parser.add_argument(
         "--urls_to_collect_file_name", 
         help="URLs to collect file name.", 
         type=str, 
         default=False
     )
-    
+
     parser.add_argument(
         "--urls_to_collect_status", 
         help="Status of URLs to collect.", 
         type=str, 
         default="no"
     )
-    
+
     parser.add_argument(
         "--n_max_reviews", 
         help="Number of maximum reviews to collect.", 
         type=int, 
         default=10000
     )
-    
+
     parser.add_argument(
         "--min_date_year", 
         help="Oldest review year to collect.", 
         type=int, 
         default=2000
     )
-    
-    args=parser.parse_args()
+
+    parser.add_argument(
+        "--retry_issues", 
+        help="Retry the 'issue' URLs at the end of the pass (True/False).", 
+        type=str_to_bool,
+        choices=[True, False],
+        default=True
+    )
+
+    parser.add_argument(
+        "--page_load_timeout", 
+        help="Seconds after which a page load raises a timeout.", 
+        type=int, 
+        default=120
+    )
+
+    parser.add_argument(
+        "--script_timeout", 
+        help="Seconds after which an asynchronous script raises a timeout.", 
+        type=int, 
+        default=60
+    )
+
+    parser.add_argument(
+        "--hang_timeout", 
+        help="Seconds without driver command nor checkpoint after which the watchdog kills the browser.", 
+        type=int, 
+        default=1800
+    )
+
+    parser.add_argument(
+        "--max_rss_mb", 
+        help="Browser memory in MB above which the watchdog kills the browser.", 
+        type=int, 
+        default=3072
+    )
+
+    parser.add_argument(
+        "--n_tabs", 
+        help="Number of tabs of one browser collecting the pages concurrently.", 
+        type=int, 
+        default=1
+    )
+
+    parser.add_argument(
+        "--metrics_file", 
+        help="Prometheus text file where the metrics are written during the run.", 
+        type=str, 
+        default=None
+    )
+
+    parser.add_argument(
+        "--metrics_port", 
+        help="Local port of the HTTP endpoint serving the metrics during the run.", 
+        type=int, 
+        default=None
+    )
+
+    parser.add_argument(
+        "--trace_file", 
+        help="Chrome trace-event file where the spans of the collect stages are written.", 
+        type=str, 
+        default=None
+    )
+
+    parser.add_argument(
+        "--profile_folder", 
+        help="Folder where the folded stacks of the slowest URLs are written.", 
+        type=str, 
+        default=None
+    )
+
+    parser.add_argument(
+        "--n_profiled_urls", 
+        help="Number of slowest URLs whose stacks are written.", 
+        type=int, 
+        default=10
+    )
+
+    parser.add_argument(
+        "--quality_profile", 
+        help="Profile the saved products and reviews (fill rates, distinct values, lengths "
+             "and samples of their fields) and warn about the fields of broken extractors.", 
+        type=str_to_bool, 
+        default=False
+    )
+
+    parser.add_argument(
+        "--quality_report_file", 
+        help="JSON file where the quality report is written at the end of the collect.", 
+        type=str, 
+        default=None
+    )
+
+    parser.add_argument(
+        "--quality_report_interval", 
+        help="Seconds between two reports of the quality warnings during the collect.", 
+        type=float, 
+        default=300
+    )
+
+    add_saving_arguments(parser)
+
+
+def collect_pages_arg_parser(argv=None):
+    """Provides parser to parse arguments for the collect_pages function.
+
+    Args:
+        argv (list): arguments to parse, the command line arguments if None.
+
+    Returns:
+        namespace, parser with the parsed arguments.
+    """
+
+    parser = argparse.ArgumentParser(description="Collect product pages data.")
+    add_collect_pages_arguments(parser)
+
+    args=parser.parse_args(argv)
     print(f"[LOG] Arguments parsed: {args}")
 
     return args
 
 
-def evaluate_collect_progression_arg_parser():
+def add_evaluate_collect_progression_arguments(parser):
+    """Adds the arguments of the evaluate_collect_progression.py script to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
+    """
+
+    parser.add_argument(
+        "--urls_to_collect_file_name", 
+        help="URLs to collect file name, else the progress of all the partitions is displayed.", 
+        type=str, 
+        default=False)
+
+    parser.add_argument(
+        "--urls_to_collect_folder", 
+        help="'urls_to_collect' folder of the partitions (default: folder of the source).", 
+        type=str, 
+        default=None)
+
+    parser.add_argument(
+        "--urls_to_collect_anchor_folder", 
+        help="'urls_to_collect_anchor' folder of the partitions (default: folder of the source).", 
+        type=str, 
+        default=None)
+
+    parser.add_argument(
+        "--refresh", 
+        help="Seconds between two refreshes of the progress of the partitions, 0 to display once.", 
+        type=float, 
+        default=0)
+
+    parser.add_argument(
+        "--json", 
+        help="Print the progress of the partitions as JSON.", 
+        type=str_to_bool, 
+        default=False)
+
+    parser.add_argument(
+        "--throughput_window", 
+        help="Seconds of the window of the throughput and the ETA.", 
+        type=float, 
+        default=3600)
+
+
+def evaluate_collect_progression_arg_parser(argv=None):
     """Provides parser to parse arguments for the collect_pages function.
 
+    Args:
+        argv (list): arguments to parse, the command line arguments if None.
+
     Returns:
         namespace, parser with the parsed arguments.
     """
 
     parser = argparse.ArgumentParser(description="Evaluates collect progression.")
+    add_evaluate_collect_progression_arguments(parser)
+
+    args=parser.parse_args(argv)
+    print(f"[LOG] Arguments parsed: {args}")
     
+    return args
+
+
+def add_aggregate_arguments(parser):
+    """Adds the arguments of the aggregate command to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
+    """
+
+    parser.add_argument(
+        "--data_type", 
+        help="Type of the collected files to aggregate.", 
+        type=str, 
+        choices=['new_urls', 'products', 'reviews', 'all'],
+        default='all')
+
+    parser.add_argument(
+        "--compact_records", 
+        help="Hold the products and reviews as compact records, saved without their None fields.", 
+        type=str_to_bool, 
+        default=False)
+
+    parser.add_argument(
+        "--normalized_output", 
+        help="Save the aggregated reviews with the key of their product, the product fields "
+             "being saved once per product.", 
+        type=str_to_bool, 
+        default=False)
+
+    parser.add_argument(
+        "--offset_index", 
+        help="Write an offset index and a key index next to the aggregated products and "
+             "reviews files, for the random access to their records.", 
+        type=str_to_bool, 
+        default=False)
+
+    parser.add_argument(
+        "--delta_feed", 
+        help="Write the new and changed products and the new reviews since the previous "
+             "aggregation in the 'delta' folder of the aggregated files.", 
+        type=str_to_bool, 
+        default=False)
+
+    parser.add_argument(
+        "--deduplicate", 
+        help="Drop the reviews collected several times, from the hash of their product, "
+             "writer, date, title and text.", 
+        type=str_to_bool, 
+        default=False)
+
+    parser.add_argument(
+        "--dedupe_max_memory_hashes", 
+        help="Number of review hashes kept in memory before spilling them to sorted runs on disk.", 
+        type=int, 
+        default=5_000_000)
+
+
+def add_clean_arguments(parser):
+    """Adds the arguments of the clean command to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
+    """
+
+    parser.add_argument(
+        "--data_type", 
+        help="Type of the aggregated files to clean.", 
+        type=str, 
+        choices=['products', 'reviews', 'all'],
+        default='all')
+
+    parser.add_argument(
+        "--keep_raw", 
+        help="Keep the raw values of the cleaned fields in '<field>_raw' fields.", 
+        type=str_to_bool, 
+        default=False)
+
+
+def add_quality_arguments(parser):
+    """Adds the arguments of the quality command to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
+    """
+
+    parser.add_argument(
+        "--folders", 
+        help="Folders whose products and reviews files are profiled (default: 'products', "
+             "'reviews', 'aggregated_products' and 'aggregated_reviews' of the source).", 
+        type=str, 
+        nargs='+',
+        default=None)
+
+    parser.add_argument(
+        "--sample_size", 
+        help="Number of sampled values per field.", 
+        type=int, 
+        default=5)
+
+    parser.add_argument(
+        "--report_file", 
+        help="JSON file where the quality report is written.", 
+        type=str, 
+        default=None)
+
+
+def add_synthetic_arguments(parser):
+    """Adds the arguments of the synthetic command to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
+    """
+
+    parser.add_argument(
+        "--folder", 
+        help="Folder of the synthetic corpus, with one folder per data type.", 
+        type=str, 
+        required=True)
+
+    parser.add_argument(
+        "--n_urls", 
+        help="Number of new URLs.", 
+        type=int, 
+        default=10_000)
+
+    parser.add_argument(
+        "--n_reviews", 
+        help="Approximate number of reviews.", 
+        type=int, 
+        default=100_000)
+
+    parser.add_argument(
+        "--records_per_file", 
+        help="Number of new URLs and reviews per file.", 
+        type=int, 
+        default=1000)
+
+    parser.add_argument(
+        "--products_per_file", 
+        help="Number of products per file, saved as lists if more than 1 (collects save 1).", 
+        type=int, 
+        default=1)
+
+    parser.add_argument(
+        "--seed", 
+        help="Seed of the random generator.", 
+        type=int, 
+        default=0)
+
+
+def add_benchmark_arguments(parser):
+    """Adds the arguments of the benchmark command to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
+    """
+
+    parser.add_argument(
+        "--n_urls", 
+        help="Number of new URLs of the synthetic corpus.", 
+        type=int, 
+        default=10_000)
+
+    parser.add_argument(
+        "--n_reviews", 
+        help="Approximate number of reviews of the synthetic corpus.", 
+        type=int, 
+        default=100_000)
+
+    parser.add_argument(
+        "--folder", 
+        help="Folder of the synthetic corpus, reused if it exists (default: a temporary folder).", 
+        type=str, 
+        default=None)
+
+    parser.add_argument(
+        "--cases", 
+        help="Cases of the benchmark (default: all).", 
+        type=str, 
+        nargs='+',
+        default=None)
+
+    parser.add_argument(
+        "--n_runs", 
+        help="Number of runs per case, the median wall time is kept.", 
+        type=int, 
+        default=5)
+
+    parser.add_argument(
+        "--baseline_file", 
+        help="JSON file of the baseline results the run is compared with.", 
+        type=str, 
+        default=None)
+
+    parser.add_argument(
+        "--save_baseline", 
+        help="Save the results as the new baseline.", 
+        type=str_to_bool, 
+        default=False)
+
+    parser.add_argument(
+        "--tolerance", 
+        help="Relative increase of the wall time or of the peak RSS above which a case regresses.", 
+        type=float, 
+        default=0.2)
+
+
+def add_test_site_arguments(parser):
+    """Adds the arguments of the local test site to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
+    """
+
+    parser.add_argument(
+        "--n_products", 
+        help="Number of products of the test site.", 
+        type=int, 
+        default=100)
+
+    parser.add_argument(
+        "--mean_n_reviews", 
+        help="Mean number of reviews per product.", 
+        type=float, 
+        default=20)
+
+    parser.add_argument(
+        "--latency", 
+        help="Mean seconds to serve a page.", 
+        type=float, 
+        default=0.05)
+
+    parser.add_argument(
+        "--error_rate", 
+        help="Share of the requests answered with a server error.", 
+        type=float, 
+        default=0.0)
+
+    parser.add_argument(
+        "--captcha_rate", 
+        help="Share of the requests answered with a captcha page.", 
+        type=float, 
+        default=0.0)
+
+    parser.add_argument(
+        "--seed", 
+        help="Seed of the products, reviews and injections of the test site.", 
+        type=int, 
+        default=0)
+
+
+def add_testsite_arguments(parser):
+    """Adds the arguments of the testsite command to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
+    """
+
+    add_test_site_arguments(parser)
+
+    parser.add_argument(
+        "--host", 
+        help="Host of the test site.", 
+        type=str, 
+        default='127.0.0.1')
+
+    parser.add_argument(
+        "--port", 
+        help="Port of the test site.", 
+        type=int, 
+        default=8000)
+
+
+def add_benchmark_collect_arguments(parser):
+    """Adds the arguments of the benchmark-collect command to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
+    """
+
+    add_test_site_arguments(parser)
+
+    parser.add_argument(
+        "--driver_start_time", 
+        help="Simulated seconds to start a fake driver.", 
+        type=float, 
+        default=0.5)
+
+    parser.add_argument(
+        "--n_max_reviews", 
+        help="Max number of reviews to collect per product.", 
+        type=int, 
+        default=None)
+
+    parser.add_argument(
+        "--configurations", 
+        help="Configurations of the benchmark (default: all).", 
+        type=str, 
+        nargs='+',
+        default=None)
+
+    parser.add_argument(
+        "--results_file", 
+        help="JSON file of the results.", 
+        type=str, 
+        default=None)
+
+
+def add_runs_arguments(parser):
+    """Adds the arguments of the runs command to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
+    """
+
+    parser.add_argument(
+        "--source", 
+        help="Source of the runs, all the sources if not given.", 
+        type=str, 
+        default=None)
+
+    parser.add_argument(
+        "--run_type", 
+        help="Type of the runs, e.g. 'collect_pages', all the types if not given.", 
+        type=str, 
+        default=None)
+
+    parser.add_argument(
+        "--n_runs", 
+        help="Number of most recent runs to display.", 
+        type=int, 
+        default=20)
+
+
+def add_forecast_arguments(parser):
+    """Adds the arguments of the forecast command to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
+    """
+
     parser.add_argument(
         "--urls_to_collect_file_name", 
-        help="URLs to collect file name.", 
+        help="URLs to collect file name to forecast.", 
+        type=str, 
+        required=True)
+
+    parser.add_argument(
+        "--source", 
+        help="Source of the previous runs (default: source of the source module).", 
+        type=str, 
+        default=None)
+
+    parser.add_argument(
+        "--n_max_reviews", 
+        help="Max number of reviews to collect per URL.", 
+        type=int, 
+        default=None)
+
+    parser.add_argument(
+        "--n_workers", 
+        help="Number of partitions collected in parallel.", 
+        type=int, 
+        default=1)
+
+
+def add_catalog_arguments(parser):
+    """Adds the arguments of the catalog command to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
+    """
+
+    parser.add_argument(
+        "--folders", 
+        help="Folders whose catalog is rebuilt (default: all the folders of the source).", 
         type=str, 
+        nargs='+',
+        default=None)
+
+
+def add_store_arguments(parser):
+    """Adds the arguments of the store command to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
+    """
+
+    parser.add_argument(
+        "--store_file", 
+        help="SQLite file of the review store.", 
+        type=str, 
+        default='reviews_store.sqlite')
+
+    parser.add_argument(
+        "--folders", 
+        help="Folders whose products and reviews files are loaded (default: 'products', "
+             "'reviews', 'aggregated_products' and 'aggregated_reviews' of the source).", 
+        type=str, 
+        nargs='+',
+        default=None)
+
+
+def add_query_arguments(parser):
+    """Adds the arguments of the query command to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
+    """
+
+    parser.add_argument(
+        "--store_file", 
+        help="SQLite file of the review store.", 
+        type=str, 
+        default='reviews_store.sqlite')
+
+    for argument, argument_help in [("--ean", "EAN of the product."),
+                                    ("--gtin", "GTIN of the product."),
+                                    ("--code_source", "Source code of the product."),
+                                    ("--brand", "Brand of the product."),
+                                    ("--since", "Min review date, e.g. '2022' or '2022-06-01'."),
+                                    ("--until", "Max review date (excluded)."),
+                                    ("--text", "Full-text query on the title and the text of the "
+                                               "reviews (FTS5 syntax, e.g. 'greasy OR sticky').")]:
+        parser.add_argument(
+            argument, 
+            help=argument_help, 
+            type=str, 
+            default=None)
+
+    parser.add_argument(
+        "--min_rating", 
+        help="Min review rating.", 
+        type=float, 
+        default=None)
+
+    parser.add_argument(
+        "--max_rating", 
+        help="Max review rating.", 
+        type=float, 
+        default=None)
+
+    parser.add_argument(
+        "--limit", 
+        help="Max number of reviews.", 
+        type=int, 
+        default=20)
+
+    parser.add_argument(
+        "--json", 
+        help="Print the reviews as JSON lines.", 
+        type=str_to_bool, 
         default=False)
-    
-    args=parser.parse_args()
-    print(f"[LOG] Arguments parsed: {args}")
-    
-    return args
+
+
+def add_saving_arguments(parser):
+    """Adds the arguments of the writing (background writer, compression, segments and
+    durability) of the saved data to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
+    """
+
+    parser.add_argument(
+        "--background_writer", 
+        help="Write the saved data from a writer thread, the collect only hands off the data.", 
+        type=str_to_bool, 
+        default=False)
+
+    parser.add_argument(
+        "--writer_queue_size", 
+        help="Number of saves waiting for the background writer before the collect blocks.", 
+        type=int, 
+        default=1000)
+
+    parser.add_argument(
+        "--compress", 
+        help="Compress the saved files with gzip ('.json.gz') in the background writer.", 
+        type=str_to_bool, 
+        default=False)
+
+    parser.add_argument(
+        "--normalized_output", 
+        help="Save the reviews with the key of their product, the product fields being "
+             "saved only once per product in each save.", 
+        type=str_to_bool, 
+        default=False)
+
+    parser.add_argument(
+        "--segments", 
+        help="Save the data in segment files instead of one file per save.", 
+        type=str_to_bool, 
+        default=False)
+
+    parser.add_argument(
+        "--segment_max_mb", 
+        help="Size in MB of a segment before starting a new one.", 
+        type=int, 
+        default=64)
+
+    parser.add_argument(
+        "--durability", 
+        help="When the saved files are synced to the disk: after every write ('always'), "
+             "every --durability_n_records writes ('batch') or at the end of the run ('close').", 
+        type=str, 
+        choices=['always', 'batch', 'close'],
+        default='batch')
+
+    parser.add_argument(
+        "--durability_n_records", 
+        help="Number of writes between two syncs of the 'batch' durability.", 
+        type=int, 
+        default=100)
+
+
+def add_compact_arguments(parser):
+    """Adds the arguments of the compact command to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
+    """
+
+    parser.add_argument(
+        "--folders", 
+        help="Folders whose JSON files are packed in segments (default: 'products', "
+             "'reviews' and 'new_urls' folders of the source).", 
+        type=str, 
+        nargs='+',
+        default=None)
+
+    parser.add_argument(
+        "--segment_max_mb", 
+        help="Size in MB of a segment before starting a new one.", 
+        type=int, 
+        default=64)
+
+    parser.add_argument(
+        "--keep_files", 
+        help="Keep the compacted JSON files.", 
+        type=str_to_bool, 
+        default=False)
+
+
+def add_daemon_arguments(parser):
+    """Adds the arguments of the daemon command to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): parser to add the arguments to.
+    """
+
+    parser.add_argument(
+        "--socket_path", 
+        help="Unix socket of the daemon (default: collector.sock in $XDG_RUNTIME_DIR, "
+             "else in ~/.collector).", 
+        type=str, 
+        default=None)
+
+    parser.add_argument(
+        "--port", 
+        help="Local TCP port to listen on instead of the Unix socket.", 
+        type=int, 
+        default=None)
+
+    parser.add_argument(
+        "--driver_pool_size", 
+        help="Number of idle warm drivers kept between the jobs, no pool if 0.", 
+        type=int, 
+        default=1)
@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+
+import gzip
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.append('..')
+
+from collector.packages.catalog import list_files
+
+STATUSES = ['yes', 'once', 'no', 'issue', 'dead']
+
+# Statuses of the URLs whose collect is over
+DONE_STATUSES = ['yes', 'once', 'dead']
+
+STATUS_PATTERN = re.compile(rb'"collected":\s*"(\w+)"')
+COLLECTED_TIME_PATTERN = re.compile(rb'"collected_time":\s*([0-9.]+)')
+
+# Counts of each URLs to collect file, with the modification time and size they were read at
+PROGRESS_CACHE = {}
+
+
+def count_statuses(urls_to_collect_object_name):
+    """Counts the statuses of a URLs to collect file, without decoding its JSON.
+
+    The statuses and the collected times are matched in the raw bytes of the file
+    (decompressed if its name ends with '.gz'), which is much faster than loading the
+    URLs to collect dictionaries.
+
+    Args:
+        urls_to_collect_object_name (str): URLs to collect object name.
+
+    Returns:
+        dict, Number of URLs of each status, and sorted collected times of the URLs.
+    """
+
+    open_file = gzip.open if urls_to_collect_object_name.endswith('.gz') else open
+    with open_file(urls_to_collect_object_name, 'rb') as file_to_open:
+        content = file_to_open.read()
+
+    n_statuses = dict.fromkeys(STATUSES, 0)
+    for status in STATUS_PATTERN.findall(content):
+        status = status.decode('utf-8')
+        n_statuses[status] = n_statuses.get(status, 0) + 1
+
+    return {
+        'n_statuses': n_statuses,
+        'collected_times': sorted(float(t) for t in COLLECTED_TIME_PATTERN.findall(content)),
+    }
+
+
+def get_file_counts(urls_to_collect_object_name):
+    """Gets the counts of a URLs to collect file, only re-read when it has changed.
+
+    Args:
+        urls_to_collect_object_name (str): URLs to collect object name.
+
+    Returns:
+        dict, Counts of the file (see `count_statuses`).
+    """
+
+    file_stat = os.stat(urls_to_collect_object_name)
+    file_key = (file_stat.st_mtime_ns, file_stat.st_size)
+
+    cached = PROGRESS_CACHE.get(urls_to_collect_object_name)
+    if cached is None or cached[0] != file_key:
+        # The file may be rewritten by a collect while being read
+        try:
+            cached = (file_key, count_statuses(urls_to_collect_object_name))
+        except OSError:
+            if cached is None:
+                raise
+            return cached[1]
+        PROGRESS_CACHE[urls_to_collect_object_name] = cached
+
+    return cached[1]
+
+
+def list_partition_files(folder_path):
+    """Lists the URLs to collect files (JSON files, compressed or not) of a folder.
+
+    The segments (see `save.compact_folder`) hold several saves of their partitions, whose
+    statuses would be counted several times, so they are skipped with a warning.
+
+    Args:
+        folder_path (str): path of the folder.
+
+    Returns:
+        list[str], Paths of the files, sorted by name.
+    """
+
+    file_paths = []
+    for file_path in list_files(folder_path=folder_path):
+        if file_path.endswith('.segment.jsonl'):
+            print(f"[LOG] [PROGRESS] The segment {file_path} is skipped, the progress of the "
+                  f"compacted partitions isn't counted.")
+            continue
+        file_paths.append(file_path)
+
+    return file_paths
+
+
+def get_uncompressed_file_name(object_name):
+    """Gets the name of a file without its '.gz' extension."""
+
+    file_name = os.path.basename(object_name)
+
+    return file_name[:-len('.gz')] if file_name.endswith('.gz') else file_name
+
+
+def get_anchor_file_name(urls_to_collect_object_name):
+    """Gets the name of the anchor file of a URLs to collect partition, uncompressed."""
+
+    return get_uncompressed_file_name(urls_to_collect_object_name).replace(
+        '_urls_to_collect_', '_urls_to_collect_anchor_')
+
+
+def get_anchor_object_name(urls_to_collect_object_name, urls_to_collect_anchor_folder_path):
+    """Gets the anchor file of a URLs to collect partition, compressed or not.
+
+    Args:
+        urls_to_collect_object_name (str): URLs to collect object name.
+        urls_to_collect_anchor_folder_path (str): path to the 'urls_to_collect_anchor' folder.
+
+    Returns:
+        str, Anchor object name, None if it doesn't exist.
+    """
+
+    anchor_object_name = os.path.join(urls_to_collect_anchor_folder_path,
+                                      get_anchor_file_name(urls_to_collect_object_name))
+    for object_name in [anchor_object_name, anchor_object_name + '.gz']:
+        if os.path.exists(object_name):
+            return object_name
+
+    return None
+
+
+def get_partition_progress(urls_to_collect_object_name, throughput_window=3600, now=None):
+    """Gets the progress of one URLs to collect partition.
+
+    The throughput is the number of URLs whose collect has ended during the last
+    `throughput_window` seconds, from their collected times.
+
+    Args:
+        urls_to_collect_object_name (str): URLs to collect object name.
+        throughput_window (float): seconds of the window of the throughput.
+        now (float): current time, time.time() if None.
+
+    Returns:
+        dict, Progress of the partition.
+    """
+
+    now = now or time.time()
+    file_counts = get_file_counts(urls_to_collect_object_name)
+    n_statuses = file_counts['n_statuses']
+    collected_times = file_counts['collected_times']
+
+    n_urls = sum(n_statuses.values())
+    n_done = sum(n_statuses.get(status, 0) for status in DONE_STATUSES)
+    n_remaining = n_urls - n_done
+
+    # URLs collected per hour during the window, and the estimated time to finish
+    n_recent = len([t for t in collected_times if t >= now - throughput_window])
+    urls_per_hour = 3600 * n_recent / throughput_window
+    eta = 3600 * n_remaining / urls_per_hour if urls_per_hour and n_remaining else None
+
+    return {
+        'partition': os.path.basename(urls_to_collect_object_name),
+        'n_urls': n_urls,
+        'n_statuses': n_statuses,
+        'p_done': round(100 * n_done / n_urls, 1) if n_urls else 100.0,
+        'urls_per_hour': round(urls_per_hour, 1),
+        'eta_seconds': round(eta) if eta is not None else None,
+        'last_collected_time': collected_times[-1] if collected_times else None,
+    }
+
+
+def get_progress(urls_to_collect_folder_path, urls_to_collect_anchor_folder_path=None,
+                 throughput_window=3600):
+    """Gets the progress of all the URLs to collect partitions of a folder.
+
+    The partitions whose anchor exists but whose URLs to collect file is missing
+    are reported as not started, with the counts of their anchor.
+
+    Args:
+        urls_to_collect_folder_path (str): path to the 'urls_to_collect' folder.
+        urls_to_collect_anchor_folder_path (str): path to the 'urls_to_collect_anchor' folder.
+        throughput_window (float): seconds of the window of the throughput.
+
+    Returns:
+        dict, Progress of each partition and of all the partitions.
+    """
+
+    now = time.time()
+    partitions_progress = []
+
+    urls_to_collect_object_names = list_partition_files(urls_to_collect_folder_path)
+    for urls_to_collect_object_name in urls_to_collect_object_names:
+        partition_progress = get_partition_progress(
+            urls_to_collect_object_name=urls_to_collect_object_name,
+            throughput_window=throughput_window,
+            now=now)
+        if urls_to_collect_anchor_folder_path:
+            anchor_object_name = get_anchor_object_name(
+                urls_to_collect_object_name=urls_to_collect_object_name,
+                urls_to_collect_anchor_folder_path=urls_to_collect_anchor_folder_path)
+            partition_progress['n_anchor_urls'] = \
+                get_partition_progress(anchor_object_name)['n_urls'] if anchor_object_name else None
+        partitions_progress.append(partition_progress)
+
+    if urls_to_collect_anchor_folder_path:
+        partition_names = {get_anchor_file_name(n) for n in urls_to_collect_object_names}
+        for anchor_object_name in list_partition_files(urls_to_collect_anchor_folder_path):
+            if get_uncompressed_file_name(anchor_object_name) not in partition_names:
+                partition_progress = get_partition_progress(anchor_object_name, now=now)
+                partition_progress['n_anchor_urls'] = partition_progress['n_urls']
+                partition_progress['not_started'] = True
+                partitions_progress.append(partition_progress)
+
+    # Total of the partitions, the partitions are collected in parallel
+    n_statuses = dict.fromkeys(STATUSES, 0)
+    for partition_progress in partitions_progress:
+        for status, n_status in partition_progress['n_statuses'].items():
+            n_statuses[status] = n_statuses.get(status, 0) + n_status
+    n_urls = sum(n_statuses.values())
+    n_done = sum(n_statuses.get(status, 0) for status in DONE_STATUSES)
+    urls_per_hour = sum(p['urls_per_hour'] for p in partitions_progress)
+    etas = [p['eta_seconds'] for p in partitions_progress if p['eta_seconds'] is not None]
+
+    return {
+        'time': now,
+        'partitions': partitions_progress,
+        'total': {
+            'n_partitions': len(partitions_progress),
+            'n_urls': n_urls,
+            'n_statuses': n_statuses,
+            'p_done': round(100 * n_done / n_urls, 1) if n_urls else 100.0,
+            'urls_per_hour': round(urls_per_hour, 1),
+            'eta_seconds': max(etas) if etas and n_done < n_urls else None,
+        },
+    }
+
+
+def format_duration(seconds):
+    """Formats a duration in seconds as '1d 02h 03m', '-' if None."""
+
+    if seconds is None:
+        return '-'
+
+    minutes, _ = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+
+    return f"{days}d {hours:02d}h {minutes:02d}m" if days else f"{hours:02d}h {minutes:02d}m"
+
+
+def format_progress(progress_dict):
+    """Formats the progress of the partitions as a table.
+
+    Args:
+        progress_dict (dict): progress of the partitions (see `get_progress`).
+
+    Returns:
+        str, Table of the progress.
+    """
+
+    partition_width = max([len(p['partition']) for p in progress_dict['partitions']] + [9])
+    header = (f"{'PARTITION'.ljust(partition_width)} {'URLS':>7} "
+              + ' '.join(f"{status.upper():>7}" for status in STATUSES)
+              + f" {'DONE':>6} {'URLS/H':>8} {'ETA':>12}")
+
+    lines = [f"[LOG] Progress at {time.strftime('%H:%M:%S', time.localtime(progress_dict['time']))}",
+             header, '-' * len(header)]
+    for row in progress_dict['partitions'] + [dict(progress_dict['total'], partition='TOTAL')]:
+        if row['partition'] == 'TOTAL':
+            lines.append('-' * len(header))
+        lines.append(f"{row['partition'].ljust(partition_width)} {row['n_urls']:>7} "
+                     + ' '.join(f"{row['n_statuses'].get(status, 0):>7}" for status in STATUSES)
+                     + f" {row['p_done']:>5}% {row['urls_per_hour']:>8} "
+                     + f"{format_duration(row['eta_seconds']):>12}"
+                     + (" (not started)" if row.get('not_started') else ''))
+
+    return '\n'.join(lines)
+
+
+def display_progress(urls_to_collect_folder_path, urls_to_collect_anchor_folder_path=None,
+                     refresh_interval=0, as_json=False, throughput_window=3600):
+    """Displays the progress of all the URLs to collect partitions.
+
+    Args:
+        urls_to_collect_folder_path (str): path to the 'urls_to_collect' folder.
+        urls_to_collect_anchor_folder_path (str): path to the 'urls_to_collect_anchor' folder.
+        refresh_interval (float): seconds between two refreshes of the view, 0 to display once.
+        as_json (bool): to print the progress as one JSON line per refresh.
+        throughput_window (float): seconds of the window of the throughput.
+    """
+
+    while True:
+        progress_dict = get_progress(
+            urls_to_collect_folder_path=urls_to_collect_folder_path,
+            urls_to_collect_anchor_folder_path=urls_to_collect_anchor_folder_path,
+            throughput_window=throughput_window)
+
+        if as_json:
+            print(json.dumps(progress_dict, ensure_ascii=False), flush=True)
+        else:
+            # Clear the terminal before refreshing the view
+            if refresh_interval and sys.stdout.isatty():
+                print('\033[2J\033[H', end='')
+            print(format_progress(progress_dict), flush=True)
+
+        if not refresh_interval:
+            break
+        try:
+            time.sleep(refresh_interval)
+        except KeyboardInterrupt:
+            break
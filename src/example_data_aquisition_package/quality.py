@@ -0,0 +1,340 @@
+#!/usr/bin/env python
+
+import hashlib
+import math
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.append('..')
+
+from collector.packages import save
+from collector.packages.aggregate import iter_file_data, report_corrupt_files
+from collector.packages.catalog import list_files, parse_file_name
+from collector.packages.normalize import iter_denormalized_reviews, is_normalized
+from collector.packages.serializer import dumps
+
+
+# Lower bounds of the buckets of the value-length histograms ('0', '1-3', '4-15', ...)
+LENGTH_BUCKETS = [0, 1, 4, 16, 64, 256, 1024, 4096]
+
+# Max number of characters of the sampled values
+MAX_SAMPLE_LENGTH = 200
+
+# Min number of records before the fields are checked
+MIN_RECORDS_FOR_WARNINGS = 100
+
+# Number of last records without value after which a field usually filled is flagged
+N_RECORDS_WITHOUT_VALUE = 100
+
+# Min fill rate of the fields flagged when they are no longer filled
+MIN_FILL_RATE_FOR_WARNINGS = 0.5
+
+# Fields with the same value in all the records of a source and data type
+CONSTANT_FIELDS = {'source', 'country', 'language', 'collect_date'}
+
+
+class HyperLogLog:
+    """HyperLogLog estimator of the number of distinct values, in 2 ** `precision` bytes.
+
+    Args:
+        precision (int): number of bits of the register index, the relative error
+                         being about 1.04 / sqrt(2 ** precision) (1.6% for 12).
+    """
+
+    __slots__ = ('precision', 'registers')
+
+    def __init__(self, precision=12):
+        self.precision = precision
+        self.registers = bytearray(2 ** precision)
+
+    def add(self, value):
+        value_hash = int.from_bytes(
+            hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest(), 'big')
+        register_index = value_hash >> (64 - self.precision)
+        remaining_bits = value_hash & ((1 << (64 - self.precision)) - 1)
+        rank = 64 - self.precision - remaining_bits.bit_length() + 1
+        if rank > self.registers[register_index]:
+            self.registers[register_index] = rank
+
+    def count(self):
+        """Estimates the number of distinct values added.
+
+        Returns:
+            int, Estimated number of distinct values.
+        """
+
+        n_registers = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / n_registers)
+        estimate = alpha * n_registers ** 2 / sum(2.0 ** -rank for rank in self.registers)
+        n_empty_registers = self.registers.count(0)
+        # Linear counting for the small cardinalities
+        if estimate <= 2.5 * n_registers and n_empty_registers:
+            estimate = n_registers * math.log(n_registers / n_empty_registers)
+
+        return round(estimate)
+
+
+class Reservoir:
+    """Uniform random sample of a stream of values (reservoir sampling).
+
+    Args:
+        size (int): number of values kept.
+    """
+
+    __slots__ = ('size', 'n_seen', 'values')
+
+    def __init__(self, size=5):
+        self.size = size
+        self.n_seen = 0
+        self.values = []
+
+    def add(self, value):
+        self.n_seen += 1
+        if len(self.values) < self.size:
+            self.values.append(value)
+            return
+        value_index = random.randrange(self.n_seen)
+        if value_index < self.size:
+            self.values[value_index] = value
+
+
+def get_value_length(value):
+    """Gets the length of a value: characters of a string, items of a list or dict."""
+
+    return len(value) if isinstance(value, (str, list, dict)) else len(str(value))
+
+
+def get_length_bucket(length):
+    """Gets the index of the bucket of `LENGTH_BUCKETS` of a value length."""
+
+    bucket_index = 0
+    while bucket_index + 1 < len(LENGTH_BUCKETS) and length >= LENGTH_BUCKETS[bucket_index + 1]:
+        bucket_index += 1
+
+    return bucket_index
+
+
+def get_length_bucket_names():
+    """Gets the names of the buckets of the value-length histograms."""
+
+    return [str(lower_bound) if upper_bound - lower_bound == 1 else f"{lower_bound}-{upper_bound - 1}"
+            for lower_bound, upper_bound in zip(LENGTH_BUCKETS, LENGTH_BUCKETS[1:])] \
+        + [f"{LENGTH_BUCKETS[-1]}+"]
+
+
+class FieldProfile:
+    """Profile of one field: filled values, distinct values, lengths and samples."""
+
+    __slots__ = ('n_filled', 'last_filled_record', 'distinct_values', 'length_counts', 'samples')
+
+    def __init__(self, sample_size=5, precision=12):
+        self.n_filled = 0
+        self.last_filled_record = 0
+        self.distinct_values = HyperLogLog(precision=precision)
+        self.length_counts = [0] * len(LENGTH_BUCKETS)
+        self.samples = Reservoir(size=sample_size)
+
+    def add(self, value, record_number):
+        if value is None or value == '' or value == [] or value == {}:
+            return
+        self.n_filled += 1
+        self.last_filled_record = record_number
+        self.distinct_values.add(value)
+        self.length_counts[get_length_bucket(get_value_length(value))] += 1
+        self.samples.add(value[:MAX_SAMPLE_LENGTH] if isinstance(value, str) else value)
+
+
+class QualityProfiler:
+    """Streaming profiler of the quality of the collected products and reviews.
+
+    The records are profiled per source and data type, in constant memory whatever
+    their number: fill rate, estimated number of distinct values (HyperLogLog),
+    value-length histogram and random samples (reservoir sampling) of each field.
+    The fields usually filled but not in the last records, and the fields with a
+    single value over many records, are flagged, as they usually come from a broken
+    extractor.
+
+    Args:
+        sample_size (int): number of sampled values per field.
+        precision (int): precision of the HyperLogLog estimators.
+        report_interval (float): seconds between two reports printed while the records
+                                 are added, no report if None.
+    """
+
+    def __init__(self, sample_size=5, precision=12, report_interval=None):
+        self.sample_size = sample_size
+        self.precision = precision
+        self.report_interval = report_interval
+        self.profiles = {}
+        self.last_report_time = time.time()
+        self._lock = threading.Lock()
+
+    def add(self, record, data_type, source):
+        """Profiles a product or review record."""
+
+        profile_dict = self.profiles.setdefault((source, data_type), {'n_records': 0, 'fields': {}})
+        profile_dict['n_records'] += 1
+        for field, value in record.items():
+            field_profile = profile_dict['fields'].get(field)
+            if field_profile is None:
+                field_profile = profile_dict['fields'][field] = FieldProfile(
+                    sample_size=self.sample_size, precision=self.precision)
+            field_profile.add(value=value, record_number=profile_dict['n_records'])
+
+    def add_data(self, data, data_type, source):
+        """Profiles saved data: a record, a list of records or a normalized reviews document.
+
+        Args:
+            data (object): saved data.
+            data_type (str): data type of the records, e.g. 'products' or 'reviews'.
+            source (str): name of the source.
+        """
+
+        if is_normalized(data):
+            records = iter_denormalized_reviews(data)
+        else:
+            records = data if isinstance(data, list) else [data]
+
+        with self._lock:
+            for record in records:
+                if isinstance(record, list):
+                    for sub_record in record:
+                        self.add(record=sub_record, data_type=data_type, source=source)
+                elif isinstance(record, dict):
+                    self.add(record=record, data_type=data_type, source=source)
+            if self.report_interval is not None \
+                    and time.time() - self.last_report_time >= self.report_interval:
+                self.last_report_time = time.time()
+                print_quality_report(self.get_report(), only_warnings=True)
+
+    def get_report(self):
+        """Gets the quality report of the profiled records.
+
+        Returns:
+            dict, Report of each source and data type: number of records, profile of
+            each field (fill rate, number of distinct values, length histogram, samples)
+            and warnings.
+        """
+
+        bucket_names = get_length_bucket_names()
+        report_dict = {}
+        for (source, data_type), profile_dict in sorted(self.profiles.items()):
+            n_records = profile_dict['n_records']
+            fields_dict = {}
+            warnings = []
+            for field, field_profile in sorted(profile_dict['fields'].items()):
+                n_distinct_values = min(field_profile.distinct_values.count(), field_profile.n_filled)
+                fields_dict[field] = {
+                    'fill_rate': round(field_profile.n_filled / n_records, 4),
+                    'n_distinct_values': n_distinct_values,
+                    'length_histogram': {bucket_name: n_values for bucket_name, n_values
+                                         in zip(bucket_names, field_profile.length_counts) if n_values},
+                    'samples': list(field_profile.samples.values),
+                }
+                if n_records < MIN_RECORDS_FOR_WARNINGS or field_profile.n_filled == 0:
+                    continue
+                n_records_without_value = n_records - field_profile.last_filled_record
+                if n_records_without_value >= N_RECORDS_WITHOUT_VALUE \
+                        and field_profile.n_filled / n_records >= MIN_FILL_RATE_FOR_WARNINGS:
+                    warnings.append(f"'{field}' isn't filled in the last {n_records_without_value} "
+                                    f"records (filled in {100 * fields_dict[field]['fill_rate']:.0f}% "
+                                    f"of the records).")
+                elif n_distinct_values == 1 and field_profile.n_filled == n_records \
+                        and field not in CONSTANT_FIELDS:
+                    warnings.append(f"'{field}' has a single value: {field_profile.samples.values[0]!r}.")
+            never_filled_fields = [field for field, field_dict in fields_dict.items()
+                                   if field_dict['fill_rate'] == 0]
+            if never_filled_fields and n_records >= MIN_RECORDS_FOR_WARNINGS:
+                warnings.append(f"never filled: {', '.join(never_filled_fields)}.")
+            report_dict.setdefault(source, {})[data_type] = {
+                'n_records': n_records,
+                'fields': fields_dict,
+                'warnings': warnings,
+            }
+
+        return report_dict
+
+
+def print_quality_report(report_dict, only_warnings=False):
+    """Prints a quality report.
+
+    Args:
+        report_dict (dict): report of `QualityProfiler.get_report`.
+        only_warnings (bool): to print only the number of records and the warnings.
+    """
+
+    for source, data_types_dict in report_dict.items():
+        for data_type, profile_dict in data_types_dict.items():
+            print(f"[LOG] [QUALITY] {source} {data_type}: {profile_dict['n_records']} records.")
+            if not only_warnings:
+                for field, field_dict in profile_dict['fields'].items():
+                    print(f"[LOG] [QUALITY] {field}: filled {100 * field_dict['fill_rate']:.1f}%, "
+                          f"~{field_dict['n_distinct_values']} distinct, "
+                          f"lengths {field_dict['length_histogram']}, "
+                          f"e.g. {field_dict['samples'][:2]}")
+            for warning in profile_dict['warnings']:
+                print(f"[LOG] [QUALITY] [WARNING] {source} {data_type}: {warning}")
+
+
+def save_quality_report(report_dict, file_path):
+    """Saves a quality report as JSON."""
+
+    save.atomic_write(file_path=file_path, content=dumps(report_dict))
+    print(f"[LOG] [QUALITY] Report saved in {file_path}.")
+
+
+def profile_folders(folder_paths, profiler):
+    """Profiles the products and reviews files of folders, as saved or aggregated.
+
+    The data type and the source of each file are parsed from its name.
+
+    Args:
+        folder_paths (list[str]): paths of the folders.
+        profiler (QualityProfiler): profiler of the records.
+
+    Returns:
+        dict, Quality report of the profiled records.
+    """
+
+    for folder_path in folder_paths:
+        corrupt_files = []
+        for file_path in list_files(folder_path=folder_path):
+            _, saved_data_type, source = parse_file_name(os.path.basename(file_path))
+            if saved_data_type is None or not saved_data_type.endswith(('products', 'reviews')):
+                continue
+            data_type = 'products' if saved_data_type.endswith('products') else 'reviews'
+            for data in iter_file_data(file_path=file_path, corrupt_files=corrupt_files):
+                profiler.add_data(data=data, data_type=data_type, source=source)
+        report_corrupt_files(corrupt_files=corrupt_files, folder_path=folder_path)
+
+    return profiler.get_report()
+
+
+def start_quality_profiler(report_file_path=None, report_interval=300, sample_size=5):
+    """Starts the profiling of the saved products and reviews (see `save.save_data`).
+
+    Args:
+        report_file_path (str): JSON file of the final report, only printed if None.
+        report_interval (float): seconds between two reports of the warnings.
+        sample_size (int): number of sampled values per field.
+
+    Returns:
+        function, Function stopping the profiler and reporting the profiled records.
+    """
+
+    save.QUALITY_PROFILER = QualityProfiler(sample_size=sample_size, report_interval=report_interval)
+    print(f"[LOG] [QUALITY] Saved products and reviews profiled, warnings every {report_interval} s.")
+
+    def stop_quality_profiler():
+        if save.QUALITY_PROFILER is None:
+            return
+        report_dict = save.QUALITY_PROFILER.get_report()
+        save.QUALITY_PROFILER = None
+        print_quality_report(report_dict)
+        if report_file_path:
+            save_quality_report(report_dict=report_dict, file_path=report_file_path)
+
+    return stop_quality_profiler
@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+
+import sys
+
+sys.path.append('..')
+
+from collector.packages.init_dicts import init_product_dict, init_review_dict, init_url_dict
+
+
+# Fields whose values repeat across the records, interned so that they are stored once
+INTERNED_FIELDS = frozenset([
+    'product_name',
+    'product_sub_name',
+    'product_brand',
+    'product_brand_line',
+    'product_type',
+    'url',
+    'category',
+    'sub_category',
+    'sub_sub_category',
+    'sub_sub_sub_category',
+    'code_asin',
+    'code_ean',
+    'code_gtin',
+    'code_sku',
+    'code_source',
+    'products_listing_page_origin',
+    'products_listing_page_url',
+    'products_listing_page_product_brand',
+    'products_listing_page_search_term',
+    'products_listing_page_category',
+    'products_listing_page_sub_category',
+    'products_listing_page_sub_sub_category',
+    'review_rating',
+    'syndication',
+    'verified_purchase',
+    'source',
+    'country',
+    'language',
+    'collect_date',
+])
+
+
+class Record:
+    """Compact record with the fields of an `init_dicts` dictionary.
+
+    The fields are slots instead of the keys of a dictionary, and the repeated strings
+    are interned, so that a record takes a fraction of the memory of the dictionary.
+    The record is used as the dictionary (`record['review_text'] = ...`), the fields
+    which aren't in the schema being kept in a dictionary of extra fields. It is
+    serialized without its None fields (see `to_dict`).
+    """
+
+    __slots__ = ('_extra',)
+
+    fields = ()
+    field_set = frozenset()
+    interned_fields = frozenset()
+
+    def __init__(self, **values):
+        for field in self.fields:
+            setattr(self, field, None)
+        self._extra = None
+        for field, value in values.items():
+            self[field] = value
+
+    def __getitem__(self, field):
+        if field in self.field_set:
+            return getattr(self, field)
+        if self._extra is not None and field in self._extra:
+            return self._extra[field]
+        raise KeyError(field)
+
+    def __setitem__(self, field, value):
+        if field in self.interned_fields and type(value) is str:
+            value = sys.intern(value)
+        if field in self.field_set:
+            setattr(self, field, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[field] = value
+
+    def __contains__(self, field):
+        return field in self.field_set or (self._extra is not None and field in self._extra)
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            other = other.to_dict(omit_none=False)
+        return self.to_dict(omit_none=False) == other
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def get(self, field, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return list(self.fields) + (list(self._extra) if self._extra is not None else [])
+
+    def items(self):
+        return [(field, self[field]) for field in self.keys()]
+
+    def update(self, values):
+        for field, value in values.items():
+            self[field] = value
+
+    def to_dict(self, omit_none=True):
+        """Converts the record to a dictionary.
+
+        Args:
+            omit_none (bool): to omit the None fields, which are restored as None when the
+                              records are decoded (see `serializer.check_records`).
+
+        Returns:
+            dict, Fields of the record.
+        """
+
+        record_dict = {}
+        for field in self.fields:
+            value = getattr(self, field)
+            if value is not None or not omit_none:
+                record_dict[field] = value
+        if self._extra is not None:
+            record_dict.update(self._extra)
+
+        return record_dict
+
+    @classmethod
+    def from_dict(cls, record_dict):
+        """Creates a record from a dictionary."""
+
+        return cls(**record_dict)
+
+
+def make_record_class(name, init_dict):
+    """Makes the record class of the fields of an `init_dicts` dictionary.
+
+    Args:
+        name (str): name of the class.
+        init_dict (dict): dictionary initialized by an `init_dicts` function.
+
+    Returns:
+        type, Record class.
+    """
+
+    fields = tuple(init_dict)
+
+    return type(name, (Record,), {
+        '__slots__': fields,
+        'fields': fields,
+        'field_set': frozenset(fields),
+        'interned_fields': INTERNED_FIELDS & frozenset(fields),
+    })
+
+
+SCHEMA_SOURCE_DICT = {'source': None, 'country': None, 'language': None}
+
+UrlRecord = make_record_class('UrlRecord', init_url_dict(SCHEMA_SOURCE_DICT))
+ProductRecord = make_record_class('ProductRecord', init_product_dict(SCHEMA_SOURCE_DICT))
+ReviewRecord = make_record_class('ReviewRecord', init_review_dict(SCHEMA_SOURCE_DICT))
+
+# Record class of each data type
+RECORD_CLASSES = {
+    'url_new': UrlRecord,
+    'new_urls': UrlRecord,
+    'products': ProductRecord,
+    'reviews': ReviewRecord,
+}
+
+
+def init_url_record(source_dict):
+    """Initializes the record with the new URL data, as `init_dicts.init_url_dict`.
+
+    Returns:
+        UrlRecord, Record with the new URL data.
+    """
+
+    return UrlRecord(**{k: v for k, v in init_url_dict(source_dict).items() if v is not None})
+
+
+def init_product_record(source_dict):
+    """Initializes the record with the product data, as `init_dicts.init_product_dict`.
+
+    Returns:
+        ProductRecord, Record with the product data.
+    """
+
+    return ProductRecord(**{k: v for k, v in init_product_dict(source_dict).items() if v is not None})
+
+
+def init_review_record(source_dict):
+    """Initializes the record with the review data, as `init_dicts.init_review_dict`.
+
+    Returns:
+        ReviewRecord, Record with the review data.
+    """
+
+    return ReviewRecord(**{k: v for k, v in init_review_dict(source_dict).items() if v is not None})
+
+
+def to_records(data, data_type):
+    """Converts saved dictionaries to the records of their data type.
+
+    Args:
+        data (dict | list[dict]): dictionary or dictionaries.
+        data_type (str): data type of the dictionaries.
+
+    Returns:
+        Record | list[Record], Record or records, the data as is without record class.
+    """
+
+    record_class = RECORD_CLASSES.get(data_type)
+    if record_class is None:
+        return data
+
+    if isinstance(data, list):
+        return [record_class.from_dict(d) if isinstance(d, dict) else d for d in data]
+
+    return record_class.from_dict(data) if isinstance(data, dict) else data
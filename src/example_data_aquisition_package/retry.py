@@ -0,0 +1,314 @@
+#!/usr/bin/env python
+
+import random
+import re
+import sys
+import time
+
+sys.path.append('..')
+
+from collector.packages.metrics import FAILURES
+
+
+# Error classes of a URL to collect
+TRANSIENT_NETWORK = 'transient_network'
+DRIVER_CRASH = 'driver_crash'
+BLOCKED = 'blocked'
+EXTRACTION_FAILURE = 'extraction_failure'
+PERMANENT_NOT_FOUND = 'permanent_not_found'
+DRIVER_HUNG = 'driver_hung'
+DRIVER_BLOATED = 'driver_bloated'
+
+# Retry policy of each error class
+# ** max_attempts: number of failed attempts after which the URL is saved as 'dead'
+# ** base_delay: delay in seconds before the first retry, doubled at each attempt
+# ** max_delay: upper bound in seconds of the delay before a retry
+RETRY_POLICIES = {
+    TRANSIENT_NETWORK: {'max_attempts': 5, 'base_delay': 10, 'max_delay': 600},
+    DRIVER_CRASH: {'max_attempts': 3, 'base_delay': 5, 'max_delay': 120},
+    BLOCKED: {'max_attempts': 3, 'base_delay': 120, 'max_delay': 3600},
+    EXTRACTION_FAILURE: {'max_attempts': 2, 'base_delay': 5, 'max_delay': 60},
+    PERMANENT_NOT_FOUND: {'max_attempts': 1, 'base_delay': 0, 'max_delay': 0},
+    DRIVER_HUNG: {'max_attempts': 3, 'base_delay': 30, 'max_delay': 600},
+    DRIVER_BLOATED: {'max_attempts': 3, 'base_delay': 5, 'max_delay': 60},
+}
+
+# Error classes for which the browser has to be replaced
+BROWSER_ERROR_CLASSES = [DRIVER_CRASH, DRIVER_HUNG, DRIVER_BLOATED]
+
+# Keywords looked for in the exception messages and in the page titles
+BLOCKED_KEYWORDS = ['captcha', 'access denied', 'are you a robot', 'unusual traffic',
+                    'blocked', 'forbidden', '403']
+NOT_FOUND_KEYWORDS = ['404', 'not found', 'page introuvable', 'no longer available',
+                      "n'existe plus", 'err_name_not_resolved']
+DRIVER_CRASH_KEYWORDS = ['invalid session id', 'session deleted', 'chrome not reachable',
+                         'disconnected', 'tab crashed', 'target window already closed',
+                         'no such window', 'connection refused']
+TRANSIENT_NETWORK_KEYWORDS = ['timeout', 'timed out', 'err_connection', 'err_internet_disconnected',
+                              'err_network_changed', 'err_proxy', 'net::']
+
+# Titles of the error pages, matched on a whole part of the page title (e.g. '404 Not Found'
+# in '404 Not Found | Site'), the keywords found elsewhere in a title possibly being part of
+# the name of a product
+BLOCKED_TITLE_PATTERNS = [r'(?:error |erreur )?403(?: forbidden)?', r'forbidden', r'access denied',
+                          r'(?:attention required!?|just a moment\.*)', r'captcha',
+                          r'are you a robot\??', r'unusual traffic']
+NOT_FOUND_TITLE_PATTERNS = [r'(?:error |erreur )?(?:404|410)(?: error| erreur)?',
+                            r'(?:(?:error |erreur )?404 )?(?:page |product |produit )?'
+                            r'(?:not found|introuvable|non trouvée?)',
+                            r'(?:this )?(?:page|product) (?:is )?no longer available',
+                            r"(?:cette page|ce produit) n'existe plus"]
+# Separators of the parts of a page title
+TITLE_SEPARATOR_PATTERN = r'\s+[|\-–—:]\s+'
+
+# HTTP status codes of the pages
+BLOCKED_STATUS_CODES = [401, 403, 429]
+NOT_FOUND_STATUS_CODES = [404, 410]
+
+# Script returning the HTTP status code of the current document, undefined if the browser
+# doesn't expose it (Navigation Timing Level 2, Chrome 109+)
+STATUS_CODE_SCRIPT = "return performance.getEntriesByType('navigation')[0]?.responseStatus;"
+
+# Exception class names raised by selenium
+TRANSIENT_NETWORK_EXCEPTIONS = ['TimeoutException', 'ConnectionError', 'ConnectionResetError',
+                                'ReadTimeoutError', 'socket.timeout', 'TimeoutError']
+DRIVER_CRASH_EXCEPTIONS = ['InvalidSessionIdException', 'NoSuchWindowException',
+                           'SessionNotCreatedException', 'MaxRetryError',
+                           'NewConnectionError', 'ProtocolError']
+EXTRACTION_FAILURE_EXCEPTIONS = ['NoSuchElementException', 'StaleElementReferenceException',
+                                 'ElementNotInteractableException',
+                                 'ElementClickInterceptedException', 'JavascriptException',
+                                 'KeyError', 'IndexError', 'AttributeError', 'TypeError',
+                                 'ValueError']
+
+
+class BlockedError(Exception):
+    """Raised by a save function when the source blocks the driver (captcha, access denied)."""
+
+
+class PageNotFoundError(Exception):
+    """Raised by a save function when the product page doesn't exist anymore."""
+
+
+def contains_keyword(text, keywords, whole_words=False):
+    """Checks if a text contains one of the keywords.
+
+    Args:
+        text (str): text to check.
+        keywords (list): list of lower case keywords.
+        whole_words (bool): whether the keywords are only matched as whole words, e.g.
+            '404' isn't matched in 'Air Max 4040'.
+
+    Returns:
+        bool, Whether the text contains one of the keywords.
+    """
+
+    text = str(text).lower()
+    if whole_words:
+        return any(re.search(r'\b' + re.escape(keyword) + r'\b', text) for keyword in keywords)
+
+    return any(keyword in text for keyword in keywords)
+
+
+def is_error_title(title, title_patterns):
+    """Checks if a page title is the title of an error page, i.e. if one of its parts
+    (separated by ' | ', ' - ' or ' : ') matches a whole error title pattern.
+
+    Args:
+        title (str): title of the page.
+        title_patterns (list): list of lower case error title patterns.
+
+    Returns:
+        bool, Whether the title is the title of an error page.
+    """
+
+    title_parts = re.split(TITLE_SEPARATOR_PATTERN, str(title).strip().lower())
+
+    return any(re.fullmatch(title_pattern, title_part.strip())
+               for title_part in title_parts for title_pattern in title_patterns)
+
+
+def get_status_code(driver):
+    """Gets the HTTP status code of the page loaded by the driver.
+
+    Args:
+        driver (WebDriver): selenium webdriver.
+
+    Returns:
+        int, HTTP status code of the page, None if the browser doesn't expose it.
+    """
+
+    try:
+        status_code = driver.execute_script(STATUS_CODE_SCRIPT)
+    except Exception:
+        return None
+
+    # The status code is 0 for the pages of another origin than their document
+    return status_code if isinstance(status_code, int) and status_code > 0 else None
+
+
+def classify_exception(exception):
+    """Classifies the exception raised during the collect of a URL.
+
+    Args:
+        exception (Exception): exception raised during the collect.
+
+    Returns:
+        str, Error class of the exception.
+    """
+
+    exception_name = type(exception).__name__
+    exception_message = str(exception)
+
+    if isinstance(exception, BlockedError):
+        return BLOCKED
+    if isinstance(exception, PageNotFoundError):
+        return PERMANENT_NOT_FOUND
+    if exception_name in DRIVER_CRASH_EXCEPTIONS or \
+       contains_keyword(exception_message, DRIVER_CRASH_KEYWORDS):
+        return DRIVER_CRASH
+    if exception_name in TRANSIENT_NETWORK_EXCEPTIONS or \
+       contains_keyword(exception_message, TRANSIENT_NETWORK_KEYWORDS):
+        return TRANSIENT_NETWORK
+    if exception_name in EXTRACTION_FAILURE_EXCEPTIONS:
+        return EXTRACTION_FAILURE
+    if exception_name == 'WebDriverException':
+        return DRIVER_CRASH
+
+    return EXTRACTION_FAILURE
+
+
+def classify_page(driver):
+    """Classifies the page loaded by the driver when no data has been extracted.
+
+    The page is classified from its HTTP status code when the browser exposes it, else
+    from its title: a page is only classified as not found (and not retried) if its title
+    is the title of an error page. A keyword of the error pages found elsewhere in the title
+    is uncertain, so the page is classified as a transient error and retried.
+
+    Args:
+        driver (WebDriver): selenium webdriver.
+
+    Returns:
+        str, Error class of the page.
+    """
+
+    try:
+        title = driver.title
+    except Exception as e:
+        return classify_exception(e)
+
+    status_code = get_status_code(driver=driver)
+    if status_code in BLOCKED_STATUS_CODES:
+        return BLOCKED
+    if status_code in NOT_FOUND_STATUS_CODES:
+        return PERMANENT_NOT_FOUND
+    if status_code is not None and status_code >= 500:
+        return TRANSIENT_NETWORK
+
+    if is_error_title(title, BLOCKED_TITLE_PATTERNS):
+        return BLOCKED
+    if is_error_title(title, NOT_FOUND_TITLE_PATTERNS):
+        return PERMANENT_NOT_FOUND
+    if contains_keyword(title, BLOCKED_KEYWORDS + NOT_FOUND_KEYWORDS, whole_words=True):
+        return TRANSIENT_NETWORK
+
+    return EXTRACTION_FAILURE
+
+
+def compute_retry_delay(retry_policy, n_attempts):
+    """Computes the delay before the next attempt with an exponential backoff and jitter.
+
+    Args:
+        retry_policy (dict): retry policy of the error class.
+        n_attempts (int): number of failed attempts.
+
+    Returns:
+        float, Delay in seconds before the next attempt.
+    """
+
+    delay = min(retry_policy['max_delay'],
+                retry_policy['base_delay'] * 2 ** max(0, n_attempts - 1))
+
+    # Equal jitter: half of the delay is kept, the other half is random
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def record_failure(url_to_collect_dict, error_class, retry_policies=RETRY_POLICIES):
+    """Records a failed attempt in the URL to collect dictionary and sets its status.
+
+    The URL is saved as 'issue' while it can be retried and as 'dead' when
+    the retry policy of the error class has no attempts left.
+
+    Args:
+        url_to_collect_dict (dict): URL to collect dictionary.
+        error_class (str): error class of the failed attempt.
+        retry_policies (dict): retry policy of each error class.
+    """
+
+    retry_policy = retry_policies[error_class]
+    FAILURES.inc(error_class=error_class)
+
+    retry_dict = url_to_collect_dict.get('retry') or {'n_attempts': 0}
+    retry_dict['n_attempts'] += 1
+    retry_dict['error_class'] = error_class
+    retry_dict['last_attempt_time'] = time.time()
+
+    if retry_dict['n_attempts'] >= retry_policy['max_attempts']:
+        retry_dict['next_attempt_time'] = None
+        url_to_collect_dict['collected'] = 'dead'
+        print(f"[LOG] [RETRY] Error class '{error_class}' with no attempts left.\n"
+               "[LOG] [RETRY] The current URL is saved as 'dead'.")
+    else:
+        retry_dict['next_attempt_time'] = \
+            time.time() + compute_retry_delay(retry_policy, retry_dict['n_attempts'])
+        url_to_collect_dict['collected'] = 'issue'
+        print(f"[LOG] [RETRY] Error class '{error_class}', attempt {retry_dict['n_attempts']}"
+              f"/{retry_policy['max_attempts']}.\n"
+               "[LOG] [RETRY] The current URL is saved as 'issue'.")
+
+    url_to_collect_dict['retry'] = retry_dict
+
+
+def clear_retry(url_to_collect_dict):
+    """Removes the retry information from the URL to collect dictionary.
+
+    Args:
+        url_to_collect_dict (dict): URL to collect dictionary.
+    """
+
+    url_to_collect_dict.pop('retry', None)
+
+
+def get_retry_queue(urls_to_collect_dicts):
+    """Gets the URLs to collect to retry, ordered by their next attempt time.
+
+    Args:
+        urls_to_collect_dicts (list[dict]): list of URLs to collect dictionaries.
+
+    Returns:
+        list[dict], List of URLs to collect dictionaries to retry.
+    """
+
+    retry_queue = [
+        url_to_collect_dict
+        for url_to_collect_dict in urls_to_collect_dicts
+        if url_to_collect_dict['collected'] == 'issue' and
+           url_to_collect_dict.get('retry') and
+           url_to_collect_dict['retry']['next_attempt_time'] is not None
+    ]
+
+    return sorted(retry_queue, key=lambda d: d['retry']['next_attempt_time'])
+
+
+def wait_next_attempt(url_to_collect_dict):
+    """Sleeps until the next attempt time of the URL to collect.
+
+    Args:
+        url_to_collect_dict (dict): URL to collect dictionary.
+    """
+
+    delay = url_to_collect_dict['retry']['next_attempt_time'] - time.time()
+    if delay > 0:
+        print(f"[LOG] [RETRY] Waiting {int(delay)} seconds before the next attempt.")
+        time.sleep(delay)
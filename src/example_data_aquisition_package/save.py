@@ -1,13 +1,26 @@
 #!/usr/bin/env python
 
-import json
+import gzip
+import hashlib
+import itertools
+import queue
 import time
 import os
+import struct
 import sys
 import random
+import threading
+from contextlib import contextmanager
 
 sys.path.append('..')
 
+from collector.packages.catalog import (count_records, list_files, parse_file_name,
+                                        register_file, unregister_files)
+from collector.packages.metrics import BYTES_WRITTEN, WRITER_BLOCKED_SECONDS, WRITER_QUEUE_SIZE
+from collector.packages.normalize import normalize_reviews
+from collector.packages.serializer import dumps, loads
+from collector.packages.tracing import span
+
 
 def display_collected_reviews_data(reviews_dicts):
     """Takes the dictionary of any type of data collected (URL, product or review)
@@ -42,7 +55,7 @@ def display_collected_reviews_data(reviews_dicts):
     useful_attributes_to_display = random.sample(useful_attributes, 3)
 
     # Display attributes for 3 reviews
-    n_reviews_to_display = max(3, len(reviews_dicts))
+    n_reviews_to_display = min(3, len(reviews_dicts))
 
     # Print the attributes
     if reviews_dicts:
@@ -74,6 +87,182 @@ def save_products_listing_pages_brands(data, path):
         brands.write(str_to_dump)
 
 
+# Durability
+# --------------------------------------------------------
+# The files are written in a temporary file renamed over the file, so that a crash
+# never leaves a truncated file. The durability policy sets when the written files
+# are flushed to the disk with fsync:
+# ** 'always': after every write (and after every record of the segments).
+# ** 'batch': once `n_records` files (or segments records) have been written.
+# ** 'close': when the files are synced at the end of the run (`sync_saved_files`).
+DURABILITY_POLICIES = ['always', 'batch', 'close']
+
+DURABILITY_SETTINGS = {'policy': 'batch', 'n_records': 100}
+
+# Files written and folders of the renamed files, not synced yet
+PENDING_SYNC = {'file_paths': set(), 'folder_paths': set(), 'n_records': 0}
+PENDING_SYNC_LOCK = threading.Lock()
+
+
+def set_durability(policy='batch', n_records=100):
+    """Sets the durability policy of the saved files.
+
+    Args:
+        policy (str): 'always', 'batch' or 'close'.
+        n_records (int): number of written records between two syncs of the 'batch' policy.
+    """
+
+    if policy not in DURABILITY_POLICIES:
+        raise ValueError(f"Unknown durability policy '{policy}', "
+                         f"the policies are {DURABILITY_POLICIES}.")
+
+    DURABILITY_SETTINGS.update(policy=policy, n_records=n_records)
+
+
+def fsync_path(path):
+    """Flushes a file or a folder to the disk."""
+
+    file_descriptor = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(file_descriptor)
+    finally:
+        os.close(file_descriptor)
+
+
+def sync_saved_files():
+    """Flushes the written files not synced yet, and their folders, to the disk."""
+
+    with PENDING_SYNC_LOCK:
+        file_paths = PENDING_SYNC['file_paths']
+        folder_paths = PENDING_SYNC['folder_paths']
+        PENDING_SYNC.update(file_paths=set(), folder_paths=set(), n_records=0)
+
+    for path in list(file_paths) + list(folder_paths):
+        try:
+            fsync_path(path)
+        except OSError as e:
+            # The file may have been removed since
+            print(f"[LOG] [DURABILITY] {path} can't be synced.\n[LOG] [EXCEPTION]\n{e}")
+
+
+def add_pending_sync(file_path=None, folder_path=None, n_records=1):
+    """Records a write to sync, and syncs the pending writes according to the policy."""
+
+    with PENDING_SYNC_LOCK:
+        if file_path is not None:
+            PENDING_SYNC['file_paths'].add(file_path)
+        if folder_path is not None:
+            PENDING_SYNC['folder_paths'].add(folder_path)
+        PENDING_SYNC['n_records'] += n_records
+        sync_now = DURABILITY_SETTINGS['policy'] == 'always' or \
+            (DURABILITY_SETTINGS['policy'] == 'batch'
+             and PENDING_SYNC['n_records'] >= DURABILITY_SETTINGS['n_records'])
+
+    if sync_now:
+        sync_saved_files()
+
+
+@contextmanager
+def open_atomic(file_path):
+    """Opens a file to write atomically: a temporary file of the same folder, renamed over
+    the file when the block exits without error (removed otherwise).
+
+    The temporary file is synced before the rename with the 'always' policy, and whenever
+    it replaces an existing file, so that a crash can't leave an empty file in place of
+    the previous content.
+
+    Args:
+        file_path (str): path of the file.
+
+    Returns:
+        file, Binary file to write the content in.
+    """
+
+    folder_path, file_name = os.path.split(os.path.abspath(file_path))
+    tmp_file_path = os.path.join(folder_path, f".{file_name}.{os.getpid()}.tmp")
+
+    try:
+        with open(tmp_file_path, 'wb') as file_to_dump:
+            yield file_to_dump
+            file_to_dump.flush()
+            # The content must be on the disk before the rename when it is synced right away
+            # or when the rename replaces existing data
+            if DURABILITY_SETTINGS['policy'] == 'always' or os.path.exists(file_path):
+                os.fsync(file_to_dump.fileno())
+        os.replace(tmp_file_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_file_path):
+            os.remove(tmp_file_path)
+        raise
+
+    if DURABILITY_SETTINGS['policy'] == 'always':
+        fsync_path(folder_path)
+    else:
+        add_pending_sync(file_path=file_path, folder_path=folder_path)
+
+
+def atomic_write(file_path, content):
+    """Writes a file atomically: in a temporary file of the same folder renamed over the file.
+
+    Args:
+        file_path (str): path of the file.
+        content (bytes): content of the file.
+    """
+
+    with open_atomic(file_path) as file_to_dump:
+        file_to_dump.write(content)
+
+
+def write_json_array(file_path, records, record_callback=None, fields=None, records_field=None):
+    """Writes records as a JSON array atomically, one record at a time, so that the records
+    can come from a generator and are never all in memory.
+
+    Args:
+        file_path (str): path of the JSON file.
+        records (iterable[dict]): records to write.
+        record_callback (function): function called with the number, the record, the offset
+            and the length of each record written, none if None.
+        fields (dict): other fields of the file, which is then a JSON object with the array
+            of records as its `records_field` field, a bare JSON array if None.
+        records_field (str): field of the array of records in the JSON object.
+
+    Returns:
+        tuple, Number of records, size and checksum (see `catalog.get_checksum`) of the file.
+    """
+
+    checksum = hashlib.blake2b(digest_size=16)
+    n_records = 0
+    offset = 0
+
+    with open_atomic(file_path) as file_to_dump:
+        def write(content):
+            file_to_dump.write(content)
+            checksum.update(content)
+            return len(content)
+
+        if fields is not None:
+            offset += write(b'{\n')
+            for field, value in fields.items():
+                offset += write(dumps(field, pretty=False) + b': ' + dumps(value, pretty=False) + b',\n')
+            offset += write(dumps(records_field, pretty=False) + b': ')
+        offset += write(b'[\n')
+        for record_number, record in enumerate(records):
+            if record_number:
+                offset += write(b',\n')
+            record_content = dumps(record)
+            if record_callback is not None:
+                record_callback(record_number, record, offset, len(record_content))
+            offset += write(record_content)
+            n_records += 1
+        offset += write(b'\n]\n' if fields is None else b'\n]\n}\n')
+
+    return n_records, offset, checksum.hexdigest()
+
+
+# Profiler of the saved products and reviews (see `quality.start_quality_profiler`)
+QUALITY_PROFILER = None
+
+
 def save_data(data, saved_data_type, source, path):
     """Saves the collected `data`.
 
@@ -82,9 +271,504 @@ def save_data(data, saved_data_type, source, path):
         saved_data_type (str): 'url_new', 'products' or 'reviews'.
         source (str): name of the source.
         path (str): path where the data will be saved.
+
+    The file is written atomically and registered in the catalog of the folder, and
+    synced to the disk according to the durability policy. When the segments are enabled
+    (see `enable_segments`), the data is appended to the segment of the folder instead.
+    The saved products and reviews are profiled when the quality profiler is started.
+    When the background writer is enabled (see `enable_background_writer`), the data is
+    only handed off to the writer thread, so it mustn't be modified after the save.
+    """
+
+    file_path = os.path.join(path, time.strftime('%Y_%m_%d_%H_%M_%S') + '_' + \
+                                   saved_data_type + '_' + source + '.json')
+
+    if QUALITY_PROFILER is not None and saved_data_type in ('products', 'reviews'):
+        QUALITY_PROFILER.add_data(data=data, data_type=saved_data_type, source=source)
+
+    if BACKGROUND_WRITER is not None:
+        BACKGROUND_WRITER.put(data=data,
+                              saved_data_type=saved_data_type,
+                              source=source,
+                              file_path=file_path)
+        return
+
+    write_data(data=data, saved_data_type=saved_data_type, source=source, file_path=file_path)
+
+
+def write_data(data, saved_data_type, source, file_path, compress=False):
+    """Writes the saved `data` in its file, or in the segment of its folder.
+
+    Args:
+        data (object): data to save.
+        saved_data_type (str): 'url_new', 'products' or 'reviews'.
+        source (str): name of the source.
+        file_path (str): path of the file.
+        compress (bool): to compress the file with gzip ('.json.gz').
     """
 
-    with open(os.path.join(path, time.strftime('%Y_%m_%d_%H_%M_%S') + '_' + \
-                                 saved_data_type + '_' + source + '.json'), 
-              'w+', encoding='utf-8') as file_to_dump:
-        json.dump(data, file_to_dump, indent=4, ensure_ascii=False)
+    if saved_data_type in NORMALIZED_DATA_TYPES and isinstance(data, list):
+        data = normalize_reviews(data)
+
+    if SEGMENTS_SETTINGS is not None:
+        with span('save_data', data_type=saved_data_type, segment=True):
+            get_segment_writer(folder_path=os.path.dirname(file_path),
+                               saved_data_type=saved_data_type,
+                               source=source).append(data)
+        return
+
+    with span('save_data', data_type=saved_data_type):
+        content = dumps(data)
+        if compress:
+            content = gzip.compress(content, compresslevel=5, mtime=0)
+            file_path += '.gz'
+        atomic_write(file_path=file_path, content=content)
+        BYTES_WRITTEN.inc(len(content), data_type=saved_data_type)
+
+        register_file(file_path=file_path,
+                      n_records=count_records(data),
+                      content=content,
+                      data_type=saved_data_type,
+                      source=source)
+
+
+def load_json_file(file_path, data_type=None):
+    """Loads a JSON file, compressed with gzip if its name ends with '.gz'.
+
+    Args:
+        file_path (str): path of the file.
+        data_type (str): data type of the records, checked against its schema if given
+                         (see `serializer.check_records`).
+
+    Returns:
+        object, Data of the file.
+    """
+
+    if file_path.endswith('.gz'):
+        with gzip.open(file_path, 'rb') as file_to_open:
+            return loads(file_to_open.read(), data_type=data_type)
+
+    with open(file_path, 'rb') as file_to_open:
+        return loads(file_to_open.read(), data_type=data_type)
+
+
+def save_urls_to_collect(urls_to_collect_dicts, urls_to_collect_dicts_object_name):
+    """Saves the URLs to collect with their status in place, atomically.
+
+    Args:
+        urls_to_collect_dicts (list[dict]): list of URLs to collect dictionaries.
+        urls_to_collect_dicts_object_name (str): URLs to collect object name.
+    """
+
+    with span('save_status', n_urls=len(urls_to_collect_dicts)):
+        content = dumps(urls_to_collect_dicts)
+        atomic_write(file_path=urls_to_collect_dicts_object_name, content=content)
+        BYTES_WRITTEN.inc(len(content), data_type='urls_to_collect')
+
+        register_file(file_path=urls_to_collect_dicts_object_name,
+                      n_records=len(urls_to_collect_dicts),
+                      content=content)
+
+
+# Segments
+# --------------------------------------------------------
+# A segment packs the data of many saves in one file with one JSON record per line,
+# '<timestamp>_<data type>_<source>.<pid>-<n>.segment.jsonl'. Its offset index,
+# '.segment.idx', holds the offset and length of each record (unsigned 64 and 32 bits).
+SEGMENT_INDEX_ENTRY = struct.Struct('<QI')
+
+# Settings of the segments, None when the data is saved in one file per save
+SEGMENTS_SETTINGS = None
+
+# Sequence number of the segments of the process, for the unicity of their names
+SEGMENT_NUMBERS = itertools.count()
+
+# Segment writer of each folder, data type and source
+SEGMENT_WRITERS = {}
+SEGMENT_WRITERS_LOCK = threading.Lock()
+
+
+class SegmentWriter:
+    """Writer appending the saved data to rolling segment files.
+
+    A segment is closed and a new one is started when it exceeds `max_segment_bytes`
+    or is older than `max_segment_age` seconds. Each segment is registered in the
+    catalog of its folder when it is started and when it is closed.
+
+    Args:
+        folder_path (str): path of the folder of the segments.
+        saved_data_type (str): 'url_new', 'products' or 'reviews'.
+        source (str): name of the source.
+        max_segment_bytes (int): size of a segment before starting a new one.
+        max_segment_age (float): seconds before starting a new segment.
+    """
+
+    def __init__(self, folder_path, saved_data_type, source,
+                 max_segment_bytes=64 * 1024 * 1024, max_segment_age=3600):
+        self.folder_path = folder_path
+        self.saved_data_type = saved_data_type
+        self.source = source
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        self.n_segments = 0
+        self.segment_file = None
+        self._lock = threading.Lock()
+
+    def open_segment(self):
+        """Starts a new segment."""
+
+        self.segment_path = os.path.join(
+            self.folder_path,
+            f"{time.strftime('%Y_%m_%d_%H_%M_%S')}_{self.saved_data_type}_{self.source}"
+            f".{os.getpid()}-{next(SEGMENT_NUMBERS)}.segment.jsonl")
+        self.n_segments += 1
+        self.segment_file = open(self.segment_path, 'ab')
+        self.index_path = self.segment_path[:-len('.jsonl')] + '.idx'
+        self.index_file = open(self.index_path, 'ab')
+        add_pending_sync(folder_path=os.path.abspath(self.folder_path), n_records=0)
+        self.segment_start_time = time.time()
+        self.segment_n_records = 0
+        self.segment_checksum = hashlib.blake2b(digest_size=16)
+        self.register_segment()
+
+    def register_segment(self):
+        register_file(file_path=self.segment_path,
+                      n_records=self.segment_n_records,
+                      data_type=self.saved_data_type,
+                      source=self.source,
+                      n_bytes=self.segment_file.tell(),
+                      checksum=self.segment_checksum.hexdigest())
+
+    def append(self, data):
+        """Appends the data of a save as one record of the segment.
+
+        Args:
+            data (object): data to save.
+
+        Returns:
+            tuple, Path of the segment and index of the record in the segment.
+        """
+
+        record = dumps(data, pretty=False) + b'\n'
+
+        with self._lock:
+            if self.segment_file is not None and \
+               (self.segment_file.tell() + len(record) > self.max_segment_bytes
+                    or time.time() - self.segment_start_time > self.max_segment_age):
+                self.close()
+            if self.segment_file is None:
+                self.open_segment()
+
+            offset = self.segment_file.tell()
+            self.segment_file.write(record)
+            self.segment_file.flush()
+            self.index_file.write(SEGMENT_INDEX_ENTRY.pack(offset, len(record)))
+            self.index_file.flush()
+            self.segment_checksum.update(record)
+            self.segment_n_records += 1
+            BYTES_WRITTEN.inc(len(record), data_type=self.saved_data_type)
+
+            if DURABILITY_SETTINGS['policy'] == 'always':
+                os.fsync(self.segment_file.fileno())
+            else:
+                add_pending_sync(file_path=self.segment_path)
+
+            return self.segment_path, self.segment_n_records - 1
+
+    def close(self):
+        """Closes the current segment and registers it in the catalog."""
+
+        if self.segment_file is None:
+            return
+
+        self.register_segment()
+        self.segment_file.close()
+        self.index_file.close()
+        self.segment_file = None
+        add_pending_sync(file_path=self.index_path, n_records=0)
+
+
+def enable_segments(max_segment_bytes=64 * 1024 * 1024, max_segment_age=3600):
+    """Saves the data of `save_data` in segments instead of one file per save.
+
+    Args:
+        max_segment_bytes (int): size of a segment before starting a new one.
+        max_segment_age (float): seconds before starting a new segment.
+    """
+
+    global SEGMENTS_SETTINGS
+
+    SEGMENTS_SETTINGS = {'max_segment_bytes': max_segment_bytes,
+                         'max_segment_age': max_segment_age}
+
+
+def get_segment_writer(folder_path, saved_data_type, source):
+    """Gets the segment writer of a folder, data type and source."""
+
+    key = (os.path.abspath(folder_path), saved_data_type, source)
+    with SEGMENT_WRITERS_LOCK:
+        if key not in SEGMENT_WRITERS:
+            SEGMENT_WRITERS[key] = SegmentWriter(folder_path=folder_path,
+                                                 saved_data_type=saved_data_type,
+                                                 source=source,
+                                                 **(SEGMENTS_SETTINGS or {}))
+
+        return SEGMENT_WRITERS[key]
+
+
+def close_segment_writers():
+    """Closes the segments of all the segment writers, and syncs the saved files."""
+
+    with SEGMENT_WRITERS_LOCK:
+        for segment_writer in SEGMENT_WRITERS.values():
+            segment_writer.close()
+        SEGMENT_WRITERS.clear()
+
+    sync_saved_files()
+
+
+def iter_segment_records(segment_path, corrupt_records=None, data_type=None):
+    """Iterates the records of a segment.
+
+    The truncated last record (segment being written or interrupted write) and the
+    records which can't be decoded are skipped.
+
+    Args:
+        segment_path (str): path of the segment.
+        corrupt_records (list): list to which the segment path and the offset of each
+                                skipped record are appended.
+        data_type (str): data type of the records, checked against its schema if given.
+
+    Yields:
+        object, Data of each save.
+    """
+
+    offset = 0
+    with open(segment_path, 'rb') as segment_file:
+        for line in segment_file:
+            try:
+                if not line.endswith(b'\n'):
+                    raise ValueError("Truncated record.")
+                record = loads(line, data_type=data_type)
+            except ValueError:
+                if corrupt_records is not None:
+                    corrupt_records.append((segment_path, offset))
+            else:
+                yield record
+            offset += len(line)
+
+
+def read_segment_record(segment_path, record_index):
+    """Reads one record of a segment from its offset index.
+
+    Args:
+        segment_path (str): path of the segment.
+        record_index (int): index of the record in the segment.
+
+    Returns:
+        object, Data of the save.
+    """
+
+    with open(segment_path[:-len('.jsonl')] + '.idx', 'rb') as index_file:
+        index_file.seek(record_index * SEGMENT_INDEX_ENTRY.size)
+        offset, length = SEGMENT_INDEX_ENTRY.unpack(index_file.read(SEGMENT_INDEX_ENTRY.size))
+
+    with open(segment_path, 'rb') as segment_file:
+        segment_file.seek(offset)
+        return loads(segment_file.read(length))
+
+
+def compact_folder(folder_path, max_segment_bytes=64 * 1024 * 1024, remove_files=True):
+    """Packs the JSON files (compressed or not) of a folder in segments.
+
+    The files are appended to the segments of their data type and source, from the
+    oldest, and removed once their segment is closed.
+
+    Args:
+        folder_path (str): path of the folder.
+        max_segment_bytes (int): size of a segment before starting a new one.
+        remove_files (bool): to remove the compacted JSON files.
+
+    Returns:
+        int, Number of compacted files.
+    """
+
+    segment_writers = {}
+    compacted_file_paths = []
+    for file_path in list_files(folder_path=folder_path):
+        if file_path.endswith('.segment.jsonl'):
+            continue
+        _, saved_data_type, source = parse_file_name(os.path.basename(file_path))
+        if saved_data_type is None or source is None:
+            continue
+
+        try:
+            data = load_json_file(file_path=file_path)
+        except (ValueError, OSError):
+            print(f"[LOG] [SEGMENTS] The file {file_path} is corrupt, it isn't compacted.")
+            continue
+
+        if (saved_data_type, source) not in segment_writers:
+            segment_writers[(saved_data_type, source)] = SegmentWriter(
+                folder_path=folder_path,
+                saved_data_type=saved_data_type,
+                source=source,
+                max_segment_bytes=max_segment_bytes,
+                max_segment_age=float('inf'))
+        segment_writers[(saved_data_type, source)].append(data)
+        compacted_file_paths.append(file_path)
+
+    for segment_writer in segment_writers.values():
+        segment_writer.close()
+
+    # The segments, their indexes and the folder must be on the disk before the files
+    # they replace are removed, whatever the durability policy
+    sync_saved_files()
+
+    if remove_files:
+        for file_path in compacted_file_paths:
+            os.remove(file_path)
+        unregister_files(folder_path=folder_path,
+                         file_names=[os.path.basename(p) for p in compacted_file_paths])
+
+    print(f"[LOG] [SEGMENTS] {len(compacted_file_paths)} files of {folder_path} compacted in "
+          f"{sum(w.n_segments for w in segment_writers.values())} segments.")
+
+    return len(compacted_file_paths)
+
+
+# Normalized output
+# --------------------------------------------------------
+# Data types saved as normalized reviews documents, the product fields being stored
+# once per product (see `normalize.normalize_reviews`)
+NORMALIZED_DATA_TYPES = set()
+
+
+def enable_normalized_output(data_types=('reviews',)):
+    """Saves the reviews of `save_data` normalized, with the key of their product.
+
+    The aggregators and the readers of the saved data denormalize them.
+
+    Args:
+        data_types (tuple[str]): data types of the saved reviews to normalize.
+    """
+
+    NORMALIZED_DATA_TYPES.update(data_types)
+
+
+# Background writer
+# --------------------------------------------------------
+# Background writer of the process, None when the data is written by `save_data`
+BACKGROUND_WRITER = None
+
+
+class BackgroundWriter:
+    """Writer thread serializing, compressing and writing the saved data.
+
+    `save_data` only hands off the data to a bounded queue drained by the writer
+    thread, so the thread driving the browser doesn't wait for the serialization and
+    the disk. When the disk falls behind and the queue is full, `save_data` waits for
+    a free slot (backpressure).
+
+    Args:
+        max_queue_size (int): number of saves waiting to be written before blocking.
+        compress (bool): to compress the files with gzip ('.json.gz').
+    """
+
+    def __init__(self, max_queue_size=1000, compress=False):
+        self.queue = queue.Queue(maxsize=max_queue_size)
+        self.compress = compress
+        self.n_written = 0
+        self.error = None
+        self._thread = threading.Thread(target=self.run, name='collector-writer', daemon=True)
+        self._thread.start()
+
+    def put(self, data, saved_data_type, source, file_path):
+        """Hands off a save to the writer thread, waiting while the queue is full."""
+
+        if self.error is not None:
+            raise RuntimeError("The background writer has failed.") from self.error
+
+        item = (data, saved_data_type, source, file_path)
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            print("[LOG] [WRITER] The writer queue is full, waiting for the disk.")
+            with WRITER_BLOCKED_SECONDS.time():
+                self.queue.put(item)
+        WRITER_QUEUE_SIZE.set(self.queue.qsize())
+
+    def run(self):
+        """Writes the saves of the queue until the writer is stopped."""
+
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                data, saved_data_type, source, file_path = item
+                write_data(data=data, saved_data_type=saved_data_type, source=source,
+                           file_path=file_path, compress=self.compress)
+                self.n_written += 1
+            except Exception as e:
+                print(f"[LOG] [WRITER] The data can't be written.\n[LOG] [EXCEPTION]\n{e}")
+                if self.error is None:
+                    self.error = e
+            finally:
+                self.queue.task_done()
+                WRITER_QUEUE_SIZE.set(self.queue.qsize())
+
+    def flush(self):
+        """Waits until all the saves of the queue are written."""
+
+        self.queue.join()
+
+    def stop(self):
+        """Writes the saves of the queue and stops the writer thread."""
+
+        self.queue.put(None)
+        self._thread.join()
+        print(f"[LOG] [WRITER] {self.n_written} saves written by the background writer.")
+
+        if self.error is not None:
+            raise RuntimeError("The background writer has failed.") from self.error
+
+
+def enable_background_writer(max_queue_size=1000, compress=False):
+    """Writes the data of `save_data` in a writer thread.
+
+    Args:
+        max_queue_size (int): number of saves waiting to be written before blocking.
+        compress (bool): to compress the files with gzip ('.json.gz').
+    """
+
+    global BACKGROUND_WRITER
+
+    if BACKGROUND_WRITER is None:
+        BACKGROUND_WRITER = BackgroundWriter(max_queue_size=max_queue_size, compress=compress)
+
+
+def flush_background_writer():
+    """Waits until the saves handed off to the background writer are written, so that the
+    status of a URL (or its checkpoint) is persisted only once its data is on disk.
+
+    Returns:
+        Exception, Error of the background writer, None if it hasn't failed or is disabled.
+    """
+
+    if BACKGROUND_WRITER is None:
+        return None
+
+    BACKGROUND_WRITER.flush()
+
+    return BACKGROUND_WRITER.error
+
+
+def stop_background_writer():
+    """Stops the writer thread once all the saves are written."""
+
+    global BACKGROUND_WRITER
+
+    background_writer, BACKGROUND_WRITER = BACKGROUND_WRITER, None
+    if background_writer is not None:
+        background_writer.stop()
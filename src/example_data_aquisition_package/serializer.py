@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+
+import importlib.util
+import json
+import sys
+
+sys.path.append('..')
+
+from collector.packages.init_dicts import init_product_dict, init_review_dict, init_url_dict
+from collector.packages.normalize import is_normalized
+
+
+# Backends of the serializer, from the fastest
+BACKENDS = ['orjson', 'msgspec', 'json']
+
+# Backend and format of the saved files, the fastest installed backend if None
+SERIALIZER_SETTINGS = {'backend': None, 'pretty': True}
+
+# Encode and decode functions of each loaded backend
+LOADED_BACKENDS = {}
+
+# Fields of the records of each data type, from the `init_dicts` functions
+SCHEMA_SOURCE_DICT = {'source': None, 'country': None, 'language': None}
+SCHEMAS = {
+    'url_new': tuple(init_url_dict(SCHEMA_SOURCE_DICT)),
+    'new_urls': tuple(init_url_dict(SCHEMA_SOURCE_DICT)),
+    'aggregated_urls': tuple(init_url_dict(SCHEMA_SOURCE_DICT)),
+    'products': tuple(init_product_dict(SCHEMA_SOURCE_DICT)),
+    'aggregated_products': tuple(init_product_dict(SCHEMA_SOURCE_DICT)),
+    'reviews': tuple(init_review_dict(SCHEMA_SOURCE_DICT)),
+    'aggregated_reviews': tuple(init_review_dict(SCHEMA_SOURCE_DICT)),
+}
+
+
+class SchemaError(ValueError):
+    """Raised when decoded records don't match the schema of their data type."""
+
+
+def is_installed(backend):
+    """Checks if the module of a backend is installed, without importing it."""
+
+    return backend == 'json' or importlib.util.find_spec(backend) is not None
+
+
+def get_available_backends():
+    """Gets the installed backends, from the fastest.
+
+    Returns:
+        list[str], Names of the installed backends.
+    """
+
+    return [backend for backend in BACKENDS if is_installed(backend)]
+
+
+def load_backend(backend):
+    """Loads the encode and decode functions of a backend.
+
+    The pretty output is indented with 4 spaces, as the files saved with `json.dump`.
+    orjson only indents with 2 spaces, so its pretty output is encoded by the standard
+    library. The files with the NaN and Infinity tokens written by `json.dump`, which
+    orjson and msgspec reject, are decoded by the standard library.
+
+    Args:
+        backend (str): 'orjson', 'msgspec' or 'json'.
+
+    Returns:
+        tuple, Encode function (object, pretty) -> bytes and decode function bytes -> object.
+    """
+
+    if backend in LOADED_BACKENDS:
+        return LOADED_BACKENDS[backend]
+
+    if backend == 'orjson':
+        import orjson
+
+        def encode(obj, pretty):
+            if pretty:
+                return encode_json(obj, pretty)
+            try:
+                return orjson.dumps(obj, default=encode_default)
+            except TypeError:
+                # Non-string keys or integers larger than 64 bits
+                return encode_json(obj, pretty)
+
+        def decode(content):
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                # NaN and Infinity tokens
+                return json.loads(content)
+    elif backend == 'msgspec':
+        import msgspec
+
+        encoder = msgspec.json.Encoder(enc_hook=encode_default)
+        decoder = msgspec.json.Decoder()
+
+        def encode(obj, pretty):
+            content = encoder.encode(obj)
+            return msgspec.json.format(content, indent=4) if pretty else content
+
+        def decode(content):
+            try:
+                return decoder.decode(content)
+            except msgspec.DecodeError:
+                # NaN and Infinity tokens, the other errors raised as the ones of json
+                return json.loads(content)
+    elif backend == 'json':
+        encode = encode_json
+        decode = json.loads
+    else:
+        raise ValueError(f"Unknown serializer backend '{backend}', expected one of {BACKENDS}.")
+
+    LOADED_BACKENDS[backend] = (encode, decode)
+
+    return encode, decode
+
+
+def encode_default(obj):
+    """Encodes the objects unknown to the backends, e.g. the compact records."""
+
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def encode_json(obj, pretty):
+    """Encodes an object with the standard library, as the original saved files."""
+
+    if pretty:
+        return json.dumps(obj, indent=4, ensure_ascii=False, default=encode_default).encode('utf-8')
+
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'),
+                      default=encode_default).encode('utf-8')
+
+
+def set_serializer(backend=None, pretty=True):
+    """Sets the backend and the format of the serializer.
+
+    Args:
+        backend (str): 'orjson', 'msgspec' or 'json', the fastest installed backend if None.
+        pretty (bool): to indent the saved files, else they are compact.
+    """
+
+    if backend is not None and not is_installed(backend):
+        raise ValueError(f"The serializer backend '{backend}' isn't installed, "
+                         f"installed backends: {get_available_backends()}.")
+
+    SERIALIZER_SETTINGS['backend'] = backend
+    SERIALIZER_SETTINGS['pretty'] = pretty
+    print(f"[LOG] [SERIALIZER] Backend: {get_backend()}, "
+          f"format: {'pretty' if pretty else 'compact'}.")
+
+
+def get_backend():
+    """Gets the backend of the serializer, the fastest installed backend if not set."""
+
+    if SERIALIZER_SETTINGS['backend'] is None:
+        SERIALIZER_SETTINGS['backend'] = get_available_backends()[0]
+
+    return SERIALIZER_SETTINGS['backend']
+
+
+def dumps(obj, pretty=None, backend=None):
+    """Encodes an object in JSON.
+
+    Args:
+        obj (object): object to encode.
+        pretty (bool): to indent the JSON, the format of the serializer if None.
+        backend (str): backend, the backend of the serializer if None.
+
+    Returns:
+        bytes, JSON encoded in UTF-8.
+    """
+
+    encode, _ = load_backend(backend or get_backend())
+
+    return encode(obj, SERIALIZER_SETTINGS['pretty'] if pretty is None else pretty)
+
+
+def loads(content, data_type=None, backend=None):
+    """Decodes JSON, checked against the schema of its data type.
+
+    Args:
+        content (bytes | str): JSON to decode.
+        data_type (str): data type of the records (see `check_records`), not checked if None.
+        backend (str): backend, the backend of the serializer if None.
+
+    Returns:
+        object, Decoded object.
+    """
+
+    _, decode = load_backend(backend or get_backend())
+    data = decode(content)
+    if data_type is not None:
+        check_records(data, data_type=data_type)
+
+    return data
+
+
+def check_records(data, data_type):
+    """Checks decoded records against the schema of their data type.
+
+    Each record must be an object, and its '_dict' fields objects (or null). The fields
+    of the schema missing from a record, e.g. in files saved before they were added to
+    the `init_dicts` functions, are set to None. The other fields are kept. The reviews
+    of a normalized reviews document are only checked once denormalized.
+
+    Args:
+        data (dict | list[dict]): decoded record or records.
+        data_type (str): data type of the records, not checked without schema.
+
+    Returns:
+        dict | list[dict], The records.
+    """
+
+    schema = SCHEMAS.get(data_type)
+    if schema is None or is_normalized(data):
+        return data
+
+    for record in (data if isinstance(data, list) else [data]):
+        if not isinstance(record, dict):
+            raise SchemaError(f"A {data_type} record is a {type(record).__name__}, not an object.")
+        for field in schema:
+            value = record.setdefault(field, None)
+            if field.endswith('_dict') and value is not None and not isinstance(value, dict):
+                raise SchemaError(f"The field '{field}' of a {data_type} record is a "
+                                  f"{type(value).__name__}, not an object.")
+
+    return data
@@ -0,0 +1,301 @@
+#!/usr/bin/env python
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+sys.path.append('..')
+
+from collector.packages.aggregate import iter_file_data, report_corrupt_files
+from collector.packages.catalog import list_files, parse_file_name
+from collector.packages.dedupe import get_review_hash
+from collector.packages.normalize import get_product_key
+from collector.packages.serializer import dumps, loads
+
+
+STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS loaded_files (
+    file_path TEXT PRIMARY KEY,
+    n_bytes INTEGER,
+    mtime REAL,
+    n_records INTEGER,
+    load_time REAL
+);
+CREATE TABLE IF NOT EXISTS products (
+    product_key TEXT PRIMARY KEY,
+    code_source TEXT,
+    product_name TEXT,
+    product_brand TEXT,
+    url TEXT,
+    source TEXT,
+    data BLOB
+);
+CREATE TABLE IF NOT EXISTS reviews (
+    review_id INTEGER PRIMARY KEY,
+    review_hash BLOB UNIQUE,
+    product_key TEXT,
+    code_ean TEXT,
+    code_gtin TEXT,
+    code_source TEXT,
+    product_brand TEXT,
+    review_date TEXT,
+    review_rating REAL,
+    review_title TEXT,
+    review_text TEXT,
+    source TEXT,
+    data BLOB
+);
+CREATE INDEX IF NOT EXISTS products_code_source ON products (code_source);
+CREATE INDEX IF NOT EXISTS products_product_brand ON products (product_brand);
+CREATE INDEX IF NOT EXISTS reviews_code_ean ON reviews (code_ean);
+CREATE INDEX IF NOT EXISTS reviews_code_gtin ON reviews (code_gtin);
+CREATE INDEX IF NOT EXISTS reviews_code_source ON reviews (code_source);
+CREATE INDEX IF NOT EXISTS reviews_product_brand ON reviews (product_brand);
+CREATE INDEX IF NOT EXISTS reviews_review_date ON reviews (review_date);
+CREATE INDEX IF NOT EXISTS reviews_review_rating ON reviews (review_rating);
+CREATE VIRTUAL TABLE IF NOT EXISTS reviews_fts USING fts5(
+    review_title, review_text, content='reviews', content_rowid='review_id');
+CREATE TRIGGER IF NOT EXISTS reviews_fts_insert AFTER INSERT ON reviews BEGIN
+    INSERT INTO reviews_fts (rowid, review_title, review_text)
+    VALUES (new.review_id, new.review_title, new.review_text);
+END;
+"""
+
+REVIEW_COLUMNS = ['review_hash', 'product_key', 'code_ean', 'code_gtin', 'code_source',
+                  'product_brand', 'review_date', 'review_rating', 'review_title',
+                  'review_text', 'source', 'data']
+
+
+def normalize_review_dates(review_dates):
+    """Normalizes review dates to 'YYYY-MM-DD' (see `cleaning.parse_dates`), so that they
+    are filtered and sorted in the order of the dates.
+
+    Args:
+        review_dates (list[str]): raw review dates.
+
+    Returns:
+        list[str], ISO review dates, None for the dates which can't be parsed. The raw
+        dates if pandas isn't installed.
+    """
+
+    from collector.packages.cleaning import import_pandas, parse_dates
+
+    if all(review_date is None for review_date in review_dates):
+        return list(review_dates)
+
+    try:
+        pd = import_pandas()
+    except ImportError:
+        print("[LOG] [STORE] pandas isn't installed, the review dates are stored raw.")
+        return list(review_dates)
+
+    # Only the distinct dates are parsed
+    raw_dates = pd.Series(review_dates, dtype='object').astype('string')
+    codes, unique_dates = pd.factorize(raw_dates)
+    parsed_unique_dates = parse_dates(pd.Series(unique_dates, dtype='string'))
+    parsed_dates = pd.Series(parsed_unique_dates.array.take(codes, allow_fill=True))
+
+    return parsed_dates.astype('object').where(parsed_dates.notna(), None).tolist()
+
+
+def convert_rating_to_float(review_rating):
+    """Converts a review rating ('4', '4,5', '4.5/5') to a float, None if it can't be."""
+
+    if review_rating is None:
+        return None
+
+    try:
+        return float(str(review_rating).split('/')[0].replace(',', '.').strip())
+    except ValueError:
+        return None
+
+
+class ReviewStore:
+    """Local store of the collected products and reviews in a SQLite file.
+
+    The reviews are indexed on their codes, brand, date and rating, and their title
+    and text are indexed for full-text search (FTS5). The review dates are indexed as
+    ISO dates when pandas is installed, the raw dates being kept in the data of the
+    reviews. The files are loaded incrementally: the files already loaded are only read
+    again when their size or modification time has changed, and the reviews already
+    stored (same hash, see `dedupe.get_review_hash`) are ignored.
+
+    Args:
+        file_path (str): path of the SQLite file.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(file_path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(STORE_SCHEMA)
+
+    def is_loaded(self, file_path):
+        """Checks if a file has been loaded since its last change."""
+
+        file_stat = os.stat(file_path)
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT n_bytes, mtime FROM loaded_files WHERE file_path = ?",
+                (os.path.abspath(file_path),)).fetchone()
+
+        return row is not None and row[0] == file_stat.st_size and row[1] >= file_stat.st_mtime
+
+    def load_file(self, file_path, data_type, corrupt_files=None):
+        """Loads the products or the reviews of a saved file.
+
+        Args:
+            file_path (str): path of the file.
+            data_type (str): 'products' or 'reviews'.
+            corrupt_files (list): list to which the corrupt files are appended.
+
+        Returns:
+            int, Number of records read.
+        """
+
+        file_stat = os.stat(file_path)
+        products_rows = []
+        reviews_rows = []
+        for data in iter_file_data(file_path=file_path, corrupt_files=corrupt_files,
+                                   data_type=data_type):
+            for record in (data if isinstance(data, list) else [data]):
+                if data_type == 'products':
+                    products_rows.append((
+                        get_product_key(record), record.get('code_source'),
+                        record.get('product_name'), record.get('product_brand'),
+                        record.get('url'), record.get('source'), dumps(record, pretty=False)))
+                else:
+                    reviews_rows.append((
+                        get_review_hash(record), get_product_key(record),
+                        record.get('code_ean'), record.get('code_gtin'),
+                        record.get('code_source'), record.get('product_brand'),
+                        record.get('review_date'), convert_rating_to_float(record.get('review_rating')),
+                        record.get('review_title'), record.get('review_text'),
+                        record.get('source'), dumps(record, pretty=False)))
+
+        # The review dates are indexed as ISO dates
+        review_dates = normalize_review_dates([row[6] for row in reviews_rows])
+        reviews_rows = [row[:6] + (review_date,) + row[7:]
+                        for row, review_date in zip(reviews_rows, review_dates)]
+
+        with self._lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO products (product_key, code_source, product_name, "
+                "product_brand, url, source, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [row for row in products_rows if row[0] is not None])
+            self.connection.executemany(
+                f"INSERT OR IGNORE INTO reviews ({', '.join(REVIEW_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(REVIEW_COLUMNS))})",
+                reviews_rows)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO loaded_files (file_path, n_bytes, mtime, n_records, "
+                "load_time) VALUES (?, ?, ?, ?, ?)",
+                (os.path.abspath(file_path), file_stat.st_size, file_stat.st_mtime,
+                 len(products_rows) + len(reviews_rows), time.time()))
+
+        return len(products_rows) + len(reviews_rows)
+
+    def load_folder(self, folder_path):
+        """Loads the new and changed products and reviews files of a folder.
+
+        The data type of each file is parsed from its name: the 'products' and
+        'aggregated_products' files are loaded as products, the 'reviews' and
+        'aggregated_reviews' files as reviews.
+
+        Args:
+            folder_path (str): path of the folder.
+
+        Returns:
+            int, Number of files loaded.
+        """
+
+        n_loaded_files = 0
+        n_records = 0
+        corrupt_files = []
+        for file_path in list_files(folder_path=folder_path):
+            _, saved_data_type, _ = parse_file_name(os.path.basename(file_path))
+            if saved_data_type is None or not saved_data_type.endswith(('products', 'reviews')):
+                continue
+            if self.is_loaded(file_path):
+                continue
+            n_records += self.load_file(
+                file_path=file_path,
+                data_type='products' if saved_data_type.endswith('products') else 'reviews',
+                corrupt_files=corrupt_files)
+            n_loaded_files += 1
+        report_corrupt_files(corrupt_files=corrupt_files, folder_path=folder_path)
+
+        print(f"[LOG] [STORE] {n_loaded_files} files loaded from {folder_path} "
+              f"({n_records} records read).")
+
+        return n_loaded_files
+
+    def query_reviews(self, code_ean=None, code_gtin=None, code_source=None, product_brand=None,
+                      since=None, until=None, min_rating=None, max_rating=None, text=None,
+                      limit=100):
+        """Queries the stored reviews.
+
+        Args:
+            code_ean (str): EAN of the product.
+            code_gtin (str): GTIN of the product.
+            code_source (str): source code of the product.
+            product_brand (str): brand of the product.
+            since (str): min review date, compared with the ISO review dates as text
+                         (e.g. '2022' or '2022-06-01').
+            until (str): max review date, excluded, compared with the ISO review dates.
+            min_rating (float): min review rating.
+            max_rating (float): max review rating.
+            text (str): full-text query on the title and the text (FTS5 syntax).
+            limit (int): max number of reviews, all the reviews if None.
+
+        Returns:
+            list[dict], Review dictionaries, from the most recent.
+        """
+
+        conditions = []
+        parameters = []
+        for column, value in [('code_ean', code_ean), ('code_gtin', code_gtin),
+                              ('code_source', code_source), ('product_brand', product_brand)]:
+            if value is not None:
+                conditions.append(f"r.{column} = ?")
+                parameters.append(value)
+        for condition, value in [("r.review_date >= ?", since), ("r.review_date < ?", until),
+                                 ("r.review_rating >= ?", min_rating),
+                                 ("r.review_rating <= ?", max_rating)]:
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+        if text is not None:
+            conditions.append("r.review_id IN (SELECT rowid FROM reviews_fts WHERE reviews_fts MATCH ?)")
+            parameters.append(text)
+
+        query = (f"SELECT r.data FROM reviews r "
+                 f"{'WHERE ' + ' AND '.join(conditions) if conditions else ''} "
+                 f"ORDER BY r.review_date DESC")
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+
+        with self._lock:
+            rows = self.connection.execute(query, parameters).fetchall()
+
+        return [loads(data) for data, in rows]
+
+    def count(self):
+        """Counts the stored products and reviews.
+
+        Returns:
+            dict, Number of products, reviews and loaded files.
+        """
+
+        with self._lock:
+            return {table: self.connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                    for table in ['products', 'reviews', 'loaded_files']}
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
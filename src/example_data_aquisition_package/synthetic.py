@@ -0,0 +1,326 @@
+#!/usr/bin/env python
+
+import os
+import random
+import shutil
+import sys
+import time
+
+sys.path.append('..')
+
+from collector.packages.catalog import register_file
+from collector.packages.init_dicts import init_product_dict, init_review_dict, init_url_dict
+from collector.packages.save import atomic_write
+from collector.packages.serializer import dumps
+
+
+# Source of the synthetic corpus
+SYNTHETIC_SOURCE_DICT = {'source': 'synthetic', 'country': 'France', 'language': 'fr'}
+
+# Folders of the synthetic corpus, with the keys of the `folder_paths` of the source modules
+SYNTHETIC_FOLDERS = ['new_urls', 'aggregated_urls', 'filtered_urls', 'urls_to_collect',
+                     'urls_to_collect_anchor', 'products', 'reviews', 'aggregated_products',
+                     'aggregated_reviews']
+
+# Keywords of the URLs filter of the synthetic source
+KEYWORDS_FOR_REMOVING = ['coffret', 'lot de', 'miniature']
+KEYWORDS_FOR_SELECTING = ['crème', 'sérum', 'shampooing', 'huile', 'gel']
+
+BRANDS = ['Avène', 'La Roche-Posay', 'Bioderma', 'Nuxe', 'Caudalie', 'Vichy', 'Uriage',
+          'Klorane', 'Garnier', "L'Oréal Paris", 'Nivea', 'Mixa', 'Weleda', 'Cattier', 'Sanoflore']
+PRODUCT_TYPES = ['crème', 'sérum', 'shampooing', 'huile', 'gel douche', 'lait corps', 'baume',
+                 'masque', 'eau micellaire', 'lotion']
+PRODUCT_QUALIFIERS = ['hydratante', 'apaisante', 'nourrissante', 'anti-âge', 'purifiante',
+                      'réparatrice', 'matifiante', 'douce', 'fortifiante', 'éclat']
+PRODUCT_SIZES = ['30 ml', '50 ml', '100 ml', '200 ml', '400 ml']
+# Products removed by the filter of the synthetic source
+PRODUCT_BUNDLES = ['coffret découverte', 'lot de 2', 'miniature']
+WORDS = ['très', 'bon', 'produit', 'peau', 'sèche', 'texture', 'légère', 'odeur', 'agréable',
+         'efficace', 'prix', 'élevé', 'je', 'recommande', 'flacon', 'pratique', 'cheveux',
+         'tiraillements', 'rachète', 'déçue', 'parfait', 'pénètre', 'vite', 'collant', 'sensible']
+
+# Share of the new URLs found on several products-listing pages, and of the bundles
+DUPLICATE_URL_RATE = 0.05
+BUNDLE_RATE = 0.1
+
+# Statuses of the URLs to collect, with their shares
+URL_STATUSES = [('yes', 0.6), ('no', 0.25), ('once', 0.08), ('issue', 0.05), ('dead', 0.02)]
+
+# Share of the reviews saved twice, e.g. after a retry of their product page
+DUPLICATE_REVIEW_RATE = 0.02
+
+
+def get_product_code(product_number):
+    """Gets the source code of a synthetic product."""
+
+    return str(1_000_000 + product_number)
+
+
+def get_product_name(product_number):
+    """Gets the name and the brand of a synthetic product, from its number only."""
+
+    product_random = random.Random(product_number)
+    product_brand = product_random.choice(BRANDS)
+    product_name = (f"{product_random.choice(PRODUCT_TYPES)} "
+                    f"{product_random.choice(PRODUCT_QUALIFIERS)} "
+                    f"{product_random.choice(PRODUCT_SIZES)}")
+    if product_random.random() < BUNDLE_RATE:
+        product_name = f"{product_random.choice(PRODUCT_BUNDLES)} {product_name}"
+
+    return product_name, product_brand
+
+
+def get_product_url(product_number):
+    """Gets the URL of a synthetic product."""
+
+    product_name, product_brand = get_product_name(product_number)
+    slug = '-'.join(f"{product_brand} {product_name}".lower().replace("'", ' ').split())
+
+    return f"https://www.synthetic-shop.example/p/{slug}-{get_product_code(product_number)}"
+
+
+def generate_url_dicts(n_urls, source_dict=SYNTHETIC_SOURCE_DICT, seed=0):
+    """Generates new URL dictionaries, as collected on the products-listing pages.
+
+    About 5% of the URLs are found again on another products-listing page, and 10%
+    of the products are bundles removed by the keywords filter.
+
+    Args:
+        n_urls (int): number of new URLs.
+        source_dict (dict): dictionary with information from the source.
+        seed (int): seed of the random generator.
+
+    Yields:
+        dict, New URL dictionary.
+    """
+
+    url_random = random.Random(seed)
+    n_products = 0
+    for url_number in range(n_urls):
+        if n_products and url_random.random() < DUPLICATE_URL_RATE:
+            product_number = url_random.randrange(n_products)
+        else:
+            product_number = n_products
+            n_products += 1
+        product_name, product_brand = get_product_name(product_number)
+        n_reviews = int(url_random.expovariate(1 / 40))
+
+        url_dict = init_url_dict(source_dict)
+        url_dict.update({
+            'id': url_number,
+            'product_name': product_name,
+            'product_brand': product_brand,
+            'product_type': product_name.split()[0],
+            'product_price': f"{url_random.randint(3, 60)},{url_random.choice(['00', '50', '90', '99'])} €",
+            'mean_rating': f"{url_random.uniform(2.5, 5):.1f}".replace('.', ','),
+            'n_reviews': f"({n_reviews})" if n_reviews else None,
+            'code_source': get_product_code(product_number),
+            'url': get_product_url(product_number),
+            'products_listing_page_origin': 'brand',
+            'products_listing_page_url': f"https://www.synthetic-shop.example/marques/"
+                                         f"{product_brand.lower().replace(' ', '-')}",
+            'products_listing_page_product_brand': product_brand,
+        })
+        yield url_dict
+
+
+def generate_products_and_reviews_dicts(n_products, n_reviews, source_dict=SYNTHETIC_SOURCE_DICT,
+                                        seed=0):
+    """Generates product dictionaries with their review dictionaries, as collected on
+    the product pages.
+
+    The numbers of reviews of the products are skewed (exponential distribution), with
+    about `n_reviews` reviews overall, and about 2% of the reviews are saved twice.
+
+    Args:
+        n_products (int): number of products.
+        n_reviews (int): approximate number of reviews.
+        source_dict (dict): dictionary with information from the source.
+        seed (int): seed of the random generator.
+
+    Yields:
+        tuple, Product dictionary and list of its review dictionaries.
+    """
+
+    reviews_random = random.Random(seed)
+    mean_n_reviews = n_reviews / max(1, n_products)
+    review_number = 0
+    for product_number in range(n_products):
+        product_name, product_brand = get_product_name(product_number)
+        product_url = get_product_url(product_number)
+        product_n_reviews = int(reviews_random.expovariate(1 / mean_n_reviews)) if mean_n_reviews else 0
+
+        reviews_dicts = []
+        for _ in range(product_n_reviews):
+            text_length = int(min(2000, reviews_random.lognormvariate(5, 0.8)))
+            text = ' '.join(reviews_random.choices(WORDS, k=max(1, text_length // 7)))
+            review_dict = init_review_dict(source_dict)
+            review_dict.update({
+                'id': review_number,
+                'product_name': product_name,
+                'product_brand': product_brand,
+                'url': product_url,
+                'code_source': get_product_code(product_number),
+                'writer_pseudo': f"utilisateur_{reviews_random.randrange(10 * n_reviews + 1)}",
+                'writer_information_dict': {'age': f"{reviews_random.randint(18, 75)} ans"},
+                'review_rating': str(reviews_random.choices([1, 2, 3, 4, 5], [5, 5, 10, 30, 50])[0]),
+                'review_date': f"{reviews_random.randint(2018, 2024)}-"
+                               f"{reviews_random.randint(1, 12):02d}-{reviews_random.randint(1, 28):02d}",
+                'review_title': text[:reviews_random.randint(10, 60)],
+                'review_text': text,
+                'utility_yes': str(int(reviews_random.expovariate(0.5))),
+                'utility_no': str(int(reviews_random.expovariate(2))),
+                'verified_purchase': reviews_random.choice(['true', 'false']),
+            })
+            reviews_dicts.append(review_dict)
+            if reviews_random.random() < DUPLICATE_REVIEW_RATE:
+                reviews_dicts.append(dict(review_dict))
+            review_number += 1
+
+        product_dict = init_product_dict(source_dict)
+        product_dict.update({
+            'product_name': product_name,
+            'product_brand': product_brand,
+            'code_source': get_product_code(product_number),
+            'product_price': f"{reviews_random.randint(3, 60)},{reviews_random.choice(['00', '50', '99'])} €",
+            'n_reviews': product_n_reviews,
+            'mean_rating': f"{reviews_random.uniform(2.5, 5):.1f}",
+            'product_details': ' '.join(reviews_random.choices(WORDS, k=30)),
+            'url': product_url,
+        })
+        yield product_dict, reviews_dicts
+
+
+class CorpusWriter:
+    """Writer of the files of a folder of the synthetic corpus, named from a
+    timestamp increased by one second per file, so that their names are unique.
+
+    Args:
+        folder_path (str): path of the folder.
+        saved_data_type (str): data type of the files.
+        source (str): name of the source.
+        start_time (float): timestamp of the first file.
+        records_per_file (int): number of records per file.
+        as_list (bool): to save the records of a file as a list, else each record is
+                        saved as is in a file of its own.
+    """
+
+    def __init__(self, folder_path, saved_data_type, source, start_time, records_per_file,
+                 as_list=True):
+        self.folder_path = folder_path
+        self.saved_data_type = saved_data_type
+        self.source = source
+        self.file_time = start_time
+        self.records_per_file = records_per_file if as_list else 1
+        self.as_list = as_list
+        self.records = []
+        self.n_files = 0
+        self.n_records = 0
+        os.makedirs(folder_path, exist_ok=True)
+
+    def add(self, records):
+        self.records.extend(records)
+        if len(self.records) >= self.records_per_file:
+            self.flush()
+
+    def flush(self):
+        if not self.records:
+            return
+        file_path = os.path.join(
+            self.folder_path,
+            f"{time.strftime('%Y_%m_%d_%H_%M_%S', time.localtime(self.file_time))}_"
+            f"{self.saved_data_type}_{self.source}.json")
+        content = dumps(self.records if self.as_list else self.records[0], pretty=False)
+        atomic_write(file_path=file_path, content=content)
+        register_file(file_path=file_path, n_records=len(self.records), content=content)
+        self.file_time += 1
+        self.n_files += 1
+        self.n_records += len(self.records)
+        self.records = []
+
+
+def write_synthetic_corpus(folder_path, n_urls=10_000, n_reviews=100_000, records_per_file=1000,
+                           products_per_file=1, seed=0):
+    """Writes a synthetic corpus: new URLs, URLs to collect, products and reviews files.
+
+    The records are generated from the `init_dicts` schemas and written file by file,
+    so that the corpus can have millions of records. Each product is saved as a
+    dictionary in a file of its own, as by the collects, unless `products_per_file` is
+    greater than 1: the products are then saved as lists, to keep the number of files
+    reasonable at scale.
+
+    Args:
+        folder_path (str): path of the corpus, with one folder per data type.
+        n_urls (int): number of new URLs.
+        n_reviews (int): approximate number of reviews.
+        records_per_file (int): number of new URLs and reviews per file.
+        products_per_file (int): number of products per file, saved as lists if more than 1.
+        seed (int): seed of the random generator.
+
+    Returns:
+        dict, Path of each folder of the corpus (see `SYNTHETIC_FOLDERS`).
+    """
+
+    folder_paths = {folder_name: os.path.join(folder_path, folder_name)
+                    for folder_name in SYNTHETIC_FOLDERS}
+    for corpus_folder_path in folder_paths.values():
+        os.makedirs(corpus_folder_path, exist_ok=True)
+    source = SYNTHETIC_SOURCE_DICT['source']
+    start_time = time.time() - 10 * n_urls
+    start = time.perf_counter()
+
+    # New URLs, and the URLs to collect of the distinct products with their collect status
+    new_urls_writer = CorpusWriter(folder_path=folder_paths['new_urls'], saved_data_type='new_urls',
+                                   source=source, start_time=start_time,
+                                   records_per_file=records_per_file)
+    urls_to_collect_file_path = os.path.join(
+        folder_paths['urls_to_collect'],
+        f"{time.strftime('%Y_%m_%d_%H_%M_%S', time.localtime(start_time))}_urls_to_collect_{source}.json")
+    status_random = random.Random(seed)
+    statuses, status_weights = zip(*URL_STATUSES)
+    n_products = 0
+    # The URLs to collect file is written record by record, as it can hold millions of URLs
+    with open(urls_to_collect_file_path + '.tmp', 'wb') as urls_to_collect_file:
+        urls_to_collect_file.write(b'[')
+        for url_dict in generate_url_dicts(n_urls=n_urls, seed=seed):
+            new_urls_writer.add([url_dict])
+            # The products are numbered in the order of their first URL
+            if int(url_dict['code_source']) != 1_000_000 + n_products:
+                continue
+            urls_to_collect_file.write((b'\n' if not n_products else b',\n') + dumps({
+                'url': url_dict['url'],
+                'collected': status_random.choices(statuses, status_weights)[0],
+                'n_reviews': int(url_dict['n_reviews'].strip('()')) if url_dict['n_reviews'] else 0,
+            }, pretty=False))
+            n_products += 1
+        urls_to_collect_file.write(b'\n]\n')
+    os.replace(urls_to_collect_file_path + '.tmp', urls_to_collect_file_path)
+    new_urls_writer.flush()
+
+    urls_to_collect_anchor_file_path = os.path.join(
+        folder_paths['urls_to_collect_anchor'],
+        os.path.basename(urls_to_collect_file_path).replace('urls_to_collect', 'urls_to_collect_anchor'))
+    shutil.copyfile(urls_to_collect_file_path, urls_to_collect_anchor_file_path)
+    for file_path in [urls_to_collect_file_path, urls_to_collect_anchor_file_path]:
+        register_file(file_path=file_path, n_records=n_products, n_bytes=os.path.getsize(file_path))
+
+    # Products and reviews, the reviews of a product being saved in the same file
+    products_writer = CorpusWriter(folder_path=folder_paths['products'], saved_data_type='products',
+                                   source=source, start_time=start_time,
+                                   records_per_file=products_per_file,
+                                   as_list=products_per_file > 1)
+    reviews_writer = CorpusWriter(folder_path=folder_paths['reviews'], saved_data_type='reviews',
+                                  source=source, start_time=start_time,
+                                  records_per_file=records_per_file)
+    for product_dict, reviews_dicts in generate_products_and_reviews_dicts(
+            n_products=n_products, n_reviews=n_reviews, seed=seed):
+        products_writer.add([product_dict])
+        reviews_writer.add(reviews_dicts)
+    products_writer.flush()
+    reviews_writer.flush()
+
+    print(f"[LOG] [SYNTHETIC] {new_urls_writer.n_records} new URLs, {n_products} URLs to collect, "
+          f"{products_writer.n_records} products and {reviews_writer.n_records} reviews written "
+          f"in {folder_path} in {time.perf_counter() - start:.1f} s.")
+
+    return folder_paths
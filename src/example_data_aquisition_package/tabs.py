@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+
+import sys
+import time
+
+sys.path.append('..')
+
+from collector.packages.tracing import span
+
+
+# Variable set on the window of a tab before its navigation. The document of the tab
+# stays 'complete' until the navigation commits, and the new document doesn't have it.
+NAVIGATION_MARKER = 'collectorNavigating'
+
+
+class TabDriver:
+    """Driver bound to one tab of a shared browser.
+
+    Every attribute access switches the browser to the tab first (only when another
+    tab is active), so the save functions can use it like a regular driver. The first
+    `get` of the URL preloaded in the tab doesn't reload the page, once it is loaded.
+
+    Args:
+        driver (WebDriver): selenium webdriver shared by the tabs.
+        window_handle (str): window handle of the tab.
+        tabs_state (dict): state shared by the tabs of the driver.
+    """
+
+    def __init__(self, driver, window_handle, tabs_state):
+        self.__dict__['_driver'] = driver
+        self.__dict__['_window_handle'] = window_handle
+        self.__dict__['_tabs_state'] = tabs_state
+        self.__dict__['preloaded_url'] = None
+
+    def switch_to_tab(self):
+        """Switches the browser to the tab if another tab is active."""
+
+        if self._tabs_state['current_window_handle'] != self._window_handle:
+            self._driver.switch_to.window(self._window_handle)
+            self._tabs_state['current_window_handle'] = self._window_handle
+
+    def get(self, url):
+        """Loads the URL in the tab, unless it has already been preloaded and is loaded
+        (the load timeout of the dispatch may have elapsed).
+
+        Args:
+            url (str): URL to load.
+        """
+
+        self.switch_to_tab()
+        if self.preloaded_url == url and self.is_loaded():
+            self.__dict__['preloaded_url'] = None
+            return
+        self.__dict__['preloaded_url'] = None
+        with span('driver_get', url=url):
+            self._driver.get(url)
+
+    def start_loading(self, url):
+        """Starts loading the URL in the tab without waiting for the page.
+
+        Args:
+            url (str): URL to load.
+        """
+
+        self.switch_to_tab()
+        self._driver.execute_script(
+            f"window.{NAVIGATION_MARKER} = true; window.location.href = arguments[0];", url)
+        self.__dict__['preloaded_url'] = url
+
+    def is_loaded(self):
+        """Checks if the page of the tab is loaded.
+
+        Returns:
+            bool, Whether the document of the tab is complete and isn't the document
+            before the navigation.
+        """
+
+        self.switch_to_tab()
+        return self._driver.execute_script(
+            f"return document.readyState === 'complete' && !window.{NAVIGATION_MARKER};") is True
+
+    def __getattr__(self, name):
+        self.switch_to_tab()
+        return getattr(self._driver, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._driver, name, value)
+
+
+def open_tabs(driver, n_tabs):
+    """Opens the tabs of a driver.
+
+    Args:
+        driver (WebDriver): selenium webdriver.
+        n_tabs (int): number of tabs.
+
+    Returns:
+        list[TabDriver], Drivers bound to the tabs.
+    """
+
+    tabs_state = {'current_window_handle': driver.current_window_handle}
+    window_handles = [driver.current_window_handle]
+    for _ in range(n_tabs - 1):
+        driver.switch_to.new_window('tab')
+        window_handles.append(driver.current_window_handle)
+    tabs_state['current_window_handle'] = driver.current_window_handle
+
+    return [TabDriver(driver=driver, window_handle=window_handle, tabs_state=tabs_state)
+            for window_handle in window_handles]
+
+
+def dispatch_in_tabs(driver, items, get_url, process_item, n_tabs,
+                     load_timeout=120, poll_interval=0.1):
+    """Interleaves page loads and extraction of the items across the tabs of one browser.
+
+    Each tab starts loading the URL of its item without waiting. The dispatcher
+    polls the tabs in turn and runs `process_item` in the first tab whose page is
+    loaded (or whose load has timed out), while the other tabs keep loading, then
+    gives the tab its next item.
+
+    Args:
+        driver (WebDriver): selenium webdriver.
+        items (list): items to process (products-listing pages or URLs to collect dicts).
+        get_url (function): function returning the URL of an item.
+        process_item (function): function called with the tab driver and the item.
+                                 Returning False stops the dispatch (browser to replace).
+        n_tabs (int): number of tabs.
+        load_timeout (float): seconds after which a loading page is processed anyway.
+        poll_interval (float): seconds to wait when no tab is loaded.
+
+    Returns:
+        list, Items which haven't been processed when the dispatch has been stopped.
+    """
+
+    pending_items = list(items)
+    tab_drivers = open_tabs(driver=driver, n_tabs=min(n_tabs, max(1, len(pending_items))))
+
+    # Item and load start time of each tab
+    in_flight = {}
+
+    def get_unprocessed_items():
+        return [in_flight_item for _, in_flight_item, _ in in_flight.values()] + pending_items
+
+    def start_next_item(tab_driver):
+        if pending_items:
+            item = pending_items.pop(0)
+            in_flight[id(tab_driver)] = (tab_driver, item, time.time())
+            tab_driver.start_loading(get_url(item))
+
+    try:
+        for tab_driver in tab_drivers:
+            start_next_item(tab_driver)
+    except Exception as e:
+        print(f"[LOG] [TABS] The browser can't load the pages.\n[LOG] [EXCEPTION]\n{e}")
+        return get_unprocessed_items()
+
+    while in_flight:
+        processed = False
+        for tab_id, (tab_driver, item, start_time) in list(in_flight.items()):
+            # A tab which can't be polled is processed so that its error is classified
+            try:
+                is_loaded = tab_driver.is_loaded()
+            except Exception:
+                is_loaded = True
+            if not is_loaded and time.time() - start_time < load_timeout:
+                continue
+
+            processed = True
+            del in_flight[tab_id]
+            if process_item(tab_driver, item) is False:
+                return get_unprocessed_items()
+
+            try:
+                start_next_item(tab_driver)
+            except Exception as e:
+                print(f"[LOG] [TABS] The browser can't load the pages.\n[LOG] [EXCEPTION]\n{e}")
+                return get_unprocessed_items()
+
+        if not processed:
+            time.sleep(poll_interval)
+
+    return []
@@ -0,0 +1,443 @@
+#!/usr/bin/env python
+
+import html
+import json
+import random
+import re
+import sys
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.append('..')
+
+from collector.packages.checkpoint import get_checkpoint_cursor, get_checkpoint_n_saved_reviews
+from collector.packages.init_dicts import init_product_dict, init_review_dict, init_url_dict
+from collector.packages.save import save_data
+from collector.packages.synthetic import BRANDS, WORDS, get_product_name
+
+
+# Source of the test site
+TEST_SITE_SOURCE_DICT = {'source': 'testsite', 'country': 'France', 'language': 'fr'}
+
+# Base URL of the test site when it is only browsed by the fake driver
+TEST_SITE_BASE_URL = 'http://testsite.invalid'
+
+LD_JSON_PATTERN = re.compile(r'<script type="application/ld\+json">(.*?)</script>', re.S)
+NEXT_PAGE_PATTERN = re.compile(r'<link rel="next" href="([^"]+)"')
+
+
+def get_brand_slug(product_brand):
+    """Gets the slug of a brand in the URLs of the test site."""
+
+    return '-'.join(product_brand.lower().replace("'", ' ').split())
+
+
+class TestSite:
+    """Local stand-in of a retailer website: products-listing pages per brand, product
+    pages and paginated reviews, generated on the fly from the product numbers.
+
+    The pages embed their data as JSON-LD, as many retailers do, so the same save
+    functions work in a real browser (the site served by `start`) and with the fake
+    driver (`fakedriver.FakeDriver`). The latency, the server errors and the captchas
+    of a real website can be injected in each request.
+
+    Args:
+        n_products (int): number of products.
+        mean_n_reviews (float): mean number of reviews per product.
+        products_per_page (int): number of products per products-listing page.
+        reviews_per_page (int): number of reviews per reviews page.
+        latency (float): mean seconds to serve a page (uniform between 0.5 and 1.5 times).
+        error_rate (float): share of the requests answered with a server error.
+        captcha_rate (float): share of the requests answered with a captcha page.
+        seed (int): seed of the random generator of the catalog and of the injections.
+    """
+
+    def __init__(self, n_products=100, mean_n_reviews=20, products_per_page=20, reviews_per_page=10,
+                 latency=0.0, error_rate=0.0, captcha_rate=0.0, seed=0):
+        self.n_products = n_products
+        self.mean_n_reviews = mean_n_reviews
+        self.products_per_page = products_per_page
+        self.reviews_per_page = reviews_per_page
+        self.latency = latency
+        self.error_rate = error_rate
+        self.captcha_rate = captcha_rate
+        self.seed = seed
+        self.base_url = TEST_SITE_BASE_URL
+        self.n_requests = 0
+        self.n_injected_errors = 0
+        self.n_injected_captchas = 0
+        self.latency_seconds = 0.0
+        self.server = None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self.brand_products = {}
+        for product_number in range(n_products):
+            _, product_brand = get_product_name(product_number)
+            self.brand_products.setdefault(get_brand_slug(product_brand), []).append(product_number)
+
+    def get_product(self, product_number):
+        """Gets the data of a product, the same at each call."""
+
+        product_random = random.Random(self.seed * 1_000_003 + product_number)
+        product_name, product_brand = get_product_name(product_number)
+
+        return {
+            'code': str(2_000_000 + product_number),
+            'name': product_name,
+            'brand': product_brand,
+            'price': f"{product_random.randint(3, 60)}.{product_random.choice(['00', '50', '99'])}",
+            'rating': round(product_random.uniform(2.5, 5), 1),
+            'n_reviews': int(product_random.expovariate(1 / self.mean_n_reviews))
+                         if self.mean_n_reviews else 0,
+            'description': ' '.join(product_random.choices(WORDS, k=30)),
+        }
+
+    def get_reviews(self, product_number, page_number):
+        """Gets a page of reviews of a product, from the most recent."""
+
+        n_reviews = self.get_product(product_number)['n_reviews']
+        reviews = []
+        for review_number in range((page_number - 1) * self.reviews_per_page,
+                                   min(n_reviews, page_number * self.reviews_per_page)):
+            review_random = random.Random(f"{self.seed}-{product_number}-{review_number}")
+            reviews.append({
+                '@type': 'Review',
+                'author': {'@type': 'Person', 'name': f"utilisateur_{review_random.randrange(10 ** 6)}"},
+                'datePublished': f"{2024 - review_number // 50}-"
+                                 f"{12 - review_number % 50 // 5:02d}-{28 - review_number % 5:02d}",
+                'name': ' '.join(review_random.choices(WORDS, k=review_random.randint(2, 6))),
+                'reviewBody': ' '.join(review_random.choices(WORDS, k=review_random.randint(5, 120))),
+                'reviewRating': {'@type': 'Rating',
+                                 'ratingValue': review_random.choices([1, 2, 3, 4, 5], [5, 5, 10, 30, 50])[0]},
+            })
+
+        return reviews
+
+    def get_products_listing_pages_dicts(self):
+        """Gets the products-listing pages dictionaries of the brands, for `collect_urls`."""
+
+        return [{'url': f"{self.base_url}/marques/{brand_slug}", 'origin': 'brand', 'product_brand': brand}
+                for brand in BRANDS
+                for brand_slug in [get_brand_slug(brand)] if brand_slug in self.brand_products]
+
+    def render_page(self, title, ld_json=None, body='', next_page_url=None):
+        """Renders the HTML of a page with its JSON-LD and its link to the next page."""
+
+        return (f"<!DOCTYPE html><html><head><title>{html.escape(title)}</title>"
+                + (f'<link rel="next" href="{html.escape(next_page_url)}">' if next_page_url else '')
+                + (f'<script type="application/ld+json">{json.dumps(ld_json, ensure_ascii=False)}</script>'
+                   if ld_json is not None else '')
+                + f"</head><body><h1>{html.escape(title)}</h1>{body}</body></html>")
+
+    def render(self, path):
+        """Renders a page of the site, without latency nor injection.
+
+        Args:
+            path (str): path and query of the URL, e.g. '/p/2000001/avis?page=2'.
+
+        Returns:
+            tuple, HTTP status code and HTML of the page.
+        """
+
+        url_parts = urlsplit(path)
+        page_number = int(parse_qs(url_parts.query).get('page', ['1'])[0])
+        path_parts = [part for part in url_parts.path.split('/') if part]
+
+        if len(path_parts) == 2 and path_parts[0] == 'marques' and path_parts[1] in self.brand_products:
+            product_numbers = self.brand_products[path_parts[1]]
+            start = (page_number - 1) * self.products_per_page
+            page_product_numbers = product_numbers[start:start + self.products_per_page]
+            items = []
+            for product_number in page_product_numbers:
+                product = self.get_product(product_number)
+                items.append({
+                    '@type': 'Product',
+                    'name': product['name'],
+                    'brand': {'@type': 'Brand', 'name': product['brand']},
+                    'sku': product['code'],
+                    'url': f"{self.base_url}/p/{product['code']}",
+                    'offers': {'@type': 'Offer', 'price': product['price'], 'priceCurrency': 'EUR'},
+                    'aggregateRating': {'@type': 'AggregateRating', 'ratingValue': product['rating'],
+                                        'reviewCount': product['n_reviews']},
+                })
+            next_page_url = (f"{self.base_url}/marques/{path_parts[1]}?page={page_number + 1}"
+                             if start + self.products_per_page < len(product_numbers) else None)
+            return 200, self.render_page(
+                title=f"{path_parts[1]} - page {page_number}",
+                ld_json={'@type': 'ItemList', 'itemListElement': items},
+                body=''.join(f"<a href=\"{html.escape(item['url'])}\">{html.escape(item['name'])}</a>"
+                             for item in items),
+                next_page_url=next_page_url)
+
+        if len(path_parts) in (2, 3) and path_parts[0] == 'p' and path_parts[1].isdigit() \
+                and 0 <= int(path_parts[1]) - 2_000_000 < self.n_products \
+                and (len(path_parts) == 2 or path_parts[2] == 'avis'):
+            product_number = int(path_parts[1]) - 2_000_000
+            product = self.get_product(product_number)
+            reviews = self.get_reviews(product_number, page_number)
+            next_page_url = (f"{self.base_url}/p/{product['code']}/avis?page={page_number + 1}"
+                             if page_number * self.reviews_per_page < product['n_reviews'] else None)
+            if len(path_parts) == 3:
+                return 200, self.render_page(title=f"Avis {product['name']} - page {page_number}",
+                                             ld_json={'@type': 'ItemList', 'review': reviews},
+                                             next_page_url=next_page_url)
+            return 200, self.render_page(
+                title=f"{product['brand']} {product['name']}",
+                ld_json={
+                    '@type': 'Product',
+                    'name': product['name'],
+                    'brand': {'@type': 'Brand', 'name': product['brand']},
+                    'sku': product['code'],
+                    'description': product['description'],
+                    'offers': {'@type': 'Offer', 'price': product['price'], 'priceCurrency': 'EUR'},
+                    'aggregateRating': {'@type': 'AggregateRating', 'ratingValue': product['rating'],
+                                        'reviewCount': product['n_reviews']},
+                    'review': reviews,
+                },
+                body=f"<p>{html.escape(product['description'])}</p>",
+                next_page_url=next_page_url)
+
+        return 404, self.render_page(title="404 Page introuvable")
+
+    def fetch(self, url):
+        """Serves a URL of the site, with the injected latency, errors and captchas.
+
+        Args:
+            url (str): URL (or path) of the page.
+
+        Returns:
+            tuple, HTTP status code and HTML of the page.
+        """
+
+        with self._lock:
+            self.n_requests += 1
+            latency = self.latency * self._random.uniform(0.5, 1.5) if self.latency else 0.0
+            self.latency_seconds += latency
+            injection_draw = self._random.random()
+        if latency:
+            time.sleep(latency)
+
+        if injection_draw < self.error_rate:
+            with self._lock:
+                self.n_injected_errors += 1
+            return 500, self.render_page(title="500 Internal Server Error")
+        if injection_draw < self.error_rate + self.captcha_rate:
+            with self._lock:
+                self.n_injected_captchas += 1
+            return 200, self.render_page(title="Captcha - are you a robot?")
+
+        url_parts = urlsplit(url)
+
+        return self.render(url_parts.path + (f"?{url_parts.query}" if url_parts.query else ''))
+
+    def start(self, host='127.0.0.1', port=0):
+        """Serves the site over HTTP from a background thread, for a real browser.
+
+        Args:
+            host (str): host of the server.
+            port (int): port of the server, a free port if 0.
+
+        Returns:
+            str, Base URL of the site.
+        """
+
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        test_site = self
+
+        class TestSiteRequestHandler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                status_code, page_html = test_site.fetch(self.path)
+                content = page_html.encode('utf-8')
+                self.send_response(status_code)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), TestSiteRequestHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://{host}:{self.server.server_address[1]}"
+        print(f"[LOG] [TEST SITE] Served at {self.base_url}.")
+
+        return self.base_url
+
+    def stop(self):
+        """Stops the HTTP server of the site."""
+
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+def get_ld_json(page_source, ld_json_type):
+    """Gets the first JSON-LD object of a type from the HTML of a page.
+
+    Args:
+        page_source (str): HTML of the page.
+        ld_json_type (str): '@type' of the object, e.g. 'Product'.
+
+    Returns:
+        dict, JSON-LD object, None if the page has none.
+    """
+
+    for ld_json_content in LD_JSON_PATTERN.findall(page_source):
+        try:
+            ld_json = json.loads(ld_json_content)
+        except ValueError:
+            continue
+        if isinstance(ld_json, dict) and ld_json.get('@type') == ld_json_type:
+            return ld_json
+
+    return None
+
+
+def get_next_page_url(page_source):
+    """Gets the URL of the next page from the HTML of a page, None on the last page."""
+
+    match = NEXT_PAGE_PATTERN.search(page_source)
+
+    return html.unescape(match.group(1)) if match else None
+
+
+def save_products_listing_page_data(driver, products_listing_page_dict, source_dict, new_urls_folder_path):
+    """Collects and saves the new URLs of a products-listing page of the test site and
+    of its next pages. Example of save function of a source module.
+
+    Args:
+        driver (WebDriver): selenium webdriver, or fake driver.
+        products_listing_page_dict (dict): products-listing page dictionary.
+        source_dict (dict): dictionary with information from the source.
+        new_urls_folder_path (str): path of the 'new_urls' folder.
+    """
+
+    new_urls_dicts = []
+    page_url = products_listing_page_dict['url']
+    while page_url is not None:
+        driver.get(page_url)
+        page_source = driver.page_source
+        item_list = get_ld_json(page_source, 'ItemList')
+        if item_list is None:
+            print(f"[LOG] [TEST SITE] No products on {page_url} ({driver.title}).")
+            break
+        for item in item_list['itemListElement']:
+            url_dict = init_url_dict(source_dict)
+            url_dict.update({
+                'id': len(new_urls_dicts),
+                'product_name': item['name'],
+                'product_brand': item['brand']['name'],
+                'product_price': item['offers']['price'],
+                'mean_rating': item['aggregateRating']['ratingValue'],
+                'n_reviews': item['aggregateRating']['reviewCount'],
+                'code_source': item['sku'],
+                'url': item['url'],
+                'products_listing_page_origin': products_listing_page_dict.get('origin'),
+                'products_listing_page_url': products_listing_page_dict['url'],
+                'products_listing_page_product_brand': products_listing_page_dict.get('product_brand'),
+            })
+            new_urls_dicts.append(url_dict)
+        page_url = get_next_page_url(page_source)
+
+    save_data(data=new_urls_dicts, saved_data_type='new_urls',
+              source=source_dict['source'], path=new_urls_folder_path)
+
+
+def save_product_page_data(driver, product_page_dict, source_dict, products_folder_path,
+                           reviews_folder_path, n_max_reviews=None, min_date_year=None,
+                           checkpoint=None):
+    """Collects and saves the product and its reviews from a product page of the test
+    site and of its reviews pages. Example of save function of a source module.
+
+    The reviews are saved page by page, with a checkpoint after each page, so that an
+    interrupted collect resumes from the next reviews page. The number of saved reviews
+    returned doesn't include the reviews saved before the checkpoint.
+
+    Args:
+        driver (WebDriver): selenium webdriver, or fake driver.
+        product_page_dict (dict): URL to collect dictionary.
+        source_dict (dict): dictionary with information from the source.
+        products_folder_path (str): path of the 'products' folder.
+        reviews_folder_path (str): path of the 'reviews' folder.
+        n_max_reviews (int): max number of reviews to collect, all if None.
+        min_date_year (int): oldest review year to collect, all if None.
+        checkpoint (function): checkpoint function of the pagination.
+
+    Returns:
+        tuple, Product dictionary (empty if the page has no product) and number of
+        saved reviews.
+    """
+
+    driver.get(product_page_dict['url'])
+    page_source = driver.page_source
+    product = get_ld_json(page_source, 'Product')
+    if product is None:
+        return {}, 0
+
+    product_dict = init_product_dict(source_dict)
+    product_dict.update({
+        'product_name': product['name'],
+        'product_brand': product['brand']['name'],
+        'code_source': product['sku'],
+        'product_price': product['offers']['price'],
+        'n_reviews': product['aggregateRating']['reviewCount'],
+        'mean_rating': product['aggregateRating']['ratingValue'],
+        'product_details': product.get('description'),
+        'url': product_page_dict['url'],
+    })
+    save_data(data=product_dict, saved_data_type='products',
+              source=source_dict['source'], path=products_folder_path)
+
+    # Resume from the reviews page of the last checkpoint
+    page_url = get_checkpoint_cursor(product_page_dict)
+    if n_max_reviews is not None:
+        n_max_reviews -= get_checkpoint_n_saved_reviews(product_page_dict)
+    reviews = product.get('review', [])
+    if page_url is not None:
+        driver.get(page_url)
+        page_source = driver.page_source
+        reviews = (get_ld_json(page_source, 'ItemList') or {}).get('review', [])
+
+    n_saved_reviews = 0
+    while True:
+        reviews_dicts = []
+        for review in reviews:
+            if min_date_year is not None and int(review['datePublished'][:4]) < min_date_year:
+                continue
+            review_dict = init_review_dict(source_dict)
+            review_dict.update({
+                'product_name': product_dict['product_name'],
+                'product_brand': product_dict['product_brand'],
+                'url': product_page_dict['url'],
+                'code_source': product_dict['code_source'],
+                'writer_pseudo': review['author']['name'],
+                'review_rating': str(review['reviewRating']['ratingValue']),
+                'review_date': review['datePublished'],
+                'review_title': review['name'],
+                'review_text': review['reviewBody'],
+            })
+            reviews_dicts.append(review_dict)
+        if n_max_reviews is not None:
+            reviews_dicts = reviews_dicts[:max(0, n_max_reviews - n_saved_reviews)]
+        if reviews_dicts:
+            save_data(data=reviews_dicts, saved_data_type='reviews',
+                      source=source_dict['source'], path=reviews_folder_path)
+            n_saved_reviews += len(reviews_dicts)
+
+        page_url = get_next_page_url(page_source)
+        if page_url is None or (n_max_reviews is not None and n_saved_reviews >= n_max_reviews):
+            break
+        if checkpoint is not None:
+            checkpoint(cursor=page_url, n_saved_reviews=n_saved_reviews)
+        driver.get(page_url)
+        page_source = driver.page_source
+        reviews = (get_ld_json(page_source, 'ItemList') or {}).get('review', [])
+
+    return product_dict, n_saved_reviews
@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+
+import heapq
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+sys.path.append('..')
+
+
+class Tracer:
+    """Tracer writing the spans in a Chrome trace-event file.
+
+    The file uses the JSON array format of the trace events, written as the spans end,
+    so that it can be opened in chrome://tracing or https://ui.perfetto.dev even when
+    the run has been interrupted.
+
+    Args:
+        file_path (str): path of the trace file.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.pid = os.getpid()
+        self.start_time = time.perf_counter()
+        self._lock = threading.Lock()
+        self._file = open(file_path, 'w', encoding='utf-8')
+        self._file.write('[\n')
+
+    def get_timestamp(self):
+        """Gets the microseconds elapsed since the start of the tracer."""
+
+        return (time.perf_counter() - self.start_time) * 1e6
+
+    def write_event(self, event_dict):
+        """Writes one trace event in the trace file, flushed so that a crashed run keeps it."""
+
+        with self._lock:
+            if self._file is not None:
+                self._file.write(json.dumps(event_dict, ensure_ascii=False,
+                                            separators=(',', ':'), default=str) + ',\n')
+                self._file.flush()
+
+    def close(self):
+        """Closes the JSON array of the trace file."""
+
+        with self._lock:
+            if self._file is not None:
+                self._file.write(json.dumps({'name': 'process_name', 'ph': 'M', 'pid': self.pid,
+                                             'args': {'name': 'collector'}}) + '\n]\n')
+                self._file.close()
+                self._file = None
+
+
+class Span:
+    """Context manager writing a complete trace event for its block."""
+
+    __slots__ = ('tracer', 'name', 'args', 'start_timestamp')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start_timestamp = self.tracer.get_timestamp()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.tracer.write_event({
+            'name': self.name,
+            'ph': 'X',
+            'ts': round(self.start_timestamp, 1),
+            'dur': round(self.tracer.get_timestamp() - self.start_timestamp, 1),
+            'pid': self.tracer.pid,
+            'tid': threading.get_ident(),
+            'args': self.args,
+        })
+
+
+class NullSpan:
+    """Context manager doing nothing, used when the tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        return None
+
+
+NULL_SPAN = NullSpan()
+
+# Tracer and profiler of the run, None when off
+TRACER = None
+PROFILER = None
+
+
+def span(name, **args):
+    """Opens a tracing span around a stage of the collect.
+
+    The save functions can open their own spans, e.g. around the pagination:
+    `with span('pagination', page=page_number): ...`. Without tracer, the span
+    does nothing.
+
+    Args:
+        name (str): name of the stage.
+        **args: arguments displayed with the span.
+
+    Returns:
+        Span, Context manager of the span.
+    """
+
+    if TRACER is None:
+        return NULL_SPAN
+
+    return Span(tracer=TRACER, name=name, args=args)
+
+
+def format_frame(frame):
+    """Formats a frame as 'function (file:line)' for the folded stacks."""
+
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})".replace(';', ',')
+
+
+class SamplingProfiler:
+    """Sampling profiler keeping the stacks of the slowest URLs.
+
+    A background thread samples the stack of the collecting thread while a URL is
+    profiled. The stacks of the `n_slowest` slowest URLs are kept and written in the
+    folded format of flamegraph.pl and speedscope, one file per URL.
+
+    Args:
+        folder_path (str): folder of the folded stacks files.
+        n_slowest (int): number of slowest URLs to keep.
+        sample_interval (float): seconds between two samples.
+    """
+
+    def __init__(self, folder_path, n_slowest=10, sample_interval=0.01):
+        self.folder_path = folder_path
+        self.n_slowest = n_slowest
+        self.sample_interval = sample_interval
+        self.slowest_urls = []
+        self._lock = threading.Lock()
+        self._profiled = None
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self.sample, daemon=True)
+        self._thread.start()
+
+    def sample(self):
+        """Samples the stack of the profiled thread until the profiler is stopped."""
+
+        while not self._stop_event.wait(self.sample_interval):
+            with self._lock:
+                profiled = self._profiled
+            if profiled is None:
+                continue
+            frame = sys._current_frames().get(profiled['thread_id'])
+            stack = []
+            while frame is not None:
+                stack.append(format_frame(frame))
+                frame = frame.f_back
+            if stack:
+                folded_stack = ';'.join(reversed(stack))
+                profiled['stacks'][folded_stack] = profiled['stacks'].get(folded_stack, 0) + 1
+
+    def profile(self, url):
+        """Context manager profiling the collect of a URL."""
+
+        return ProfiledUrl(profiler=self, url=url)
+
+    def start_url(self, url):
+        with self._lock:
+            self._profiled = {'url': url, 'thread_id': threading.get_ident(), 'stacks': {},
+                              'start_time': time.perf_counter()}
+
+    def end_url(self):
+        with self._lock:
+            profiled, self._profiled = self._profiled, None
+        if profiled is None:
+            return
+
+        duration = time.perf_counter() - profiled['start_time']
+        item = (duration, id(profiled), profiled)
+        if len(self.slowest_urls) < self.n_slowest:
+            heapq.heappush(self.slowest_urls, item)
+        elif duration > self.slowest_urls[0][0]:
+            heapq.heapreplace(self.slowest_urls, item)
+
+    def stop(self):
+        """Stops the sampling and writes the folded stacks of the slowest URLs.
+
+        Returns:
+            list[str], Paths of the folded stacks files, from the slowest URL.
+        """
+
+        self._stop_event.set()
+        self._thread.join()
+
+        os.makedirs(self.folder_path, exist_ok=True)
+        folded_stacks_paths = []
+        for rank, (duration, _, profiled) in enumerate(sorted(self.slowest_urls, reverse=True), 1):
+            url_name = re.sub(r'[^A-Za-z0-9]+', '_', profiled['url'])[-80:].strip('_')
+            folded_stacks_path = os.path.join(self.folder_path,
+                                              f"{rank:03d}_{round(1000 * duration)}ms_{url_name}.folded")
+            with open(folded_stacks_path, 'w', encoding='utf-8') as file_to_dump:
+                for folded_stack, n_samples in sorted(profiled['stacks'].items()):
+                    file_to_dump.write(f"{folded_stack} {n_samples}\n")
+            folded_stacks_paths.append(folded_stacks_path)
+
+        print(f"[LOG] [PROFILER] Stacks of the {len(folded_stacks_paths)} slowest URLs "
+              f"written in {self.folder_path}.")
+
+        return folded_stacks_paths
+
+
+class ProfiledUrl:
+    """Context manager profiling the collect of a URL."""
+
+    def __init__(self, profiler, url):
+        self.profiler = profiler
+        self.url = url
+
+    def __enter__(self):
+        self.profiler.start_url(self.url)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.profiler.end_url()
+
+
+def profile_url(url):
+    """Profiles the collect of a URL. Without profiler, does nothing.
+
+    Args:
+        url (str): URL collected.
+
+    Returns:
+        Context manager of the profiling.
+    """
+
+    if PROFILER is None:
+        return NULL_SPAN
+
+    return PROFILER.profile(url=url)
+
+
+def start_tracing(trace_file_path=None, profile_folder_path=None, n_profiled_urls=10):
+    """Starts the tracing of the stages and/or the profiling of the slowest URLs.
+
+    Args:
+        trace_file_path (str): path of the Chrome trace-event file.
+        profile_folder_path (str): folder of the folded stacks of the slowest URLs.
+        n_profiled_urls (int): number of slowest URLs whose stacks are kept.
+
+    Returns:
+        function, Function stopping the tracing and the profiling.
+    """
+
+    global TRACER, PROFILER
+
+    if trace_file_path:
+        TRACER = Tracer(file_path=trace_file_path)
+        print(f"[LOG] [TRACING] Spans written in {trace_file_path}.")
+    if profile_folder_path:
+        PROFILER = SamplingProfiler(folder_path=profile_folder_path, n_slowest=n_profiled_urls)
+        print(f"[LOG] [PROFILER] Stacks of the {n_profiled_urls} slowest URLs kept.")
+
+    def stop_tracing():
+        global TRACER, PROFILER
+
+        if TRACER is not None:
+            TRACER.close()
+            TRACER = None
+        if PROFILER is not None:
+            PROFILER.stop()
+            PROFILER = None
+
+    return stop_tracing
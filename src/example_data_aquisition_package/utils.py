@@ -1,11 +1,11 @@
 #!/usr/bin/env python
 
-import os
 import sys
-import glob
 
 sys.path.append('..')
 
+from collector.packages.catalog import get_most_recent_file
+
 
 def convert_n_reviews_to_int(n_reviews):
     """Converts the `n_reviews` to int.
@@ -70,6 +70,8 @@ def get_rating_from_colors(colors):
 def get_most_recent_json_file(folder_path):
     """Returns path to the most recent json file in a the specified folder.
 
+    The catalog of the folder is queried, the folder is globbed only without catalog.
+
     Args:
         folder_path (str): path of folder containing json files.
 
@@ -77,7 +79,8 @@ def get_most_recent_json_file(folder_path):
         str, most recently created json file path.
     """
     
-    most_recent_json_file = \
-        sorted(glob.glob(os.path.join(folder_path, '*.json')))[-1]
+    most_recent_json_file = get_most_recent_file(folder_path=folder_path)
+    if most_recent_json_file is None:
+        raise IndexError(f"There is no json file in {folder_path}.")
     
     return most_recent_json_file
@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+
+import sys
+import threading
+import time
+
+sys.path.append('..')
+
+# Reasons for which the watchdog kills the browser
+KILL_REASON_HUNG = 'driver_hung'
+KILL_REASON_BLOATED = 'driver_bloated'
+
+_missing_psutil_logged = False
+
+
+def import_psutil():
+    """Imports psutil when the first driver is watched, so that importing the
+    collect module stays cheap.
+
+    Returns:
+        module, psutil module, or None if it isn't installed.
+    """
+
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    return psutil
+
+
+def get_driver_pid(driver):
+    """Gets the PID of the chromedriver process of the driver.
+
+    Args:
+        driver (WebDriver): selenium webdriver.
+
+    Returns:
+        int, PID of the chromedriver process, or None if it is unknown.
+    """
+
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+
+def get_process_tree(pid):
+    """Gets the process and its children (chrome and its renderers).
+
+    Args:
+        pid (int): PID of the root process.
+
+    Returns:
+        list[psutil.Process], Processes of the tree.
+    """
+
+    psutil = import_psutil()
+    if psutil is None or pid is None:
+        return []
+
+    try:
+        process = psutil.Process(pid)
+        return [process] + process.children(recursive=True)
+    except psutil.Error:
+        return []
+
+
+def sample_process_tree(processes):
+    """Samples the RSS and CPU usage of a process tree.
+
+    Args:
+        processes (list[psutil.Process]): processes of the tree.
+
+    Returns:
+        tuple, RSS in MB and CPU percent of the process tree.
+    """
+
+    psutil = import_psutil()
+    rss = 0
+    cpu_percent = 0.0
+    for process in processes:
+        try:
+            rss += process.memory_info().rss
+            cpu_percent += process.cpu_percent(interval=None)
+        except psutil.Error:
+            continue
+
+    return rss / 1024 / 1024, cpu_percent
+
+
+def kill_process_tree(pid):
+    """Kills a process and its children.
+
+    Without psutil the children aren't known, so nothing is killed: killing only the
+    chromedriver process would leave its Chrome processes orphaned.
+
+    Args:
+        pid (int): PID of the root process.
+    """
+
+    if pid is None:
+        return
+
+    psutil = import_psutil()
+    for process in reversed(get_process_tree(pid)):
+        try:
+            process.kill()
+        except psutil.Error:
+            pass
+
+
+class DriverWatchdog:
+    """Watches a driver from a background thread and kills its browser when it is
+    stuck (no heartbeat for `hang_timeout` seconds) or bloated (process tree RSS
+    higher than `max_rss_mb`).
+
+    Each command of the driver which completes is a heartbeat, so a save function
+    making progress over hours isn't killed even without checkpoints: only a command
+    blocked for `hang_timeout` seconds is.
+
+    Killing the browser makes the blocked selenium call raise in the collecting
+    thread, which then reads `kill_reason` to set a retryable status.
+
+    Args:
+        driver (WebDriver): selenium webdriver.
+        hang_timeout (float): seconds without heartbeat after which the page is hung.
+        max_rss_mb (float): maximum RSS of the browser process tree in MB.
+        sample_interval (float): seconds between two samples of the process tree.
+    """
+
+    def __init__(self, driver, hang_timeout=1800, max_rss_mb=3072, sample_interval=5):
+        self.driver = driver
+        self.hang_timeout = hang_timeout
+        self.max_rss_mb = max_rss_mb
+        self.sample_interval = sample_interval
+        self.pid = get_driver_pid(driver)
+        self.kill_reason = None
+        self.start_time = time.time()
+        self.last_heartbeat_time = self.start_time
+        self.n_heartbeats = 0
+        self.n_samples = 0
+        self.peak_rss_mb = 0.0
+        self.sum_cpu_percent = 0.0
+        # Processes of the tree by PID, kept between the samples for their CPU percent
+        self.processes = {}
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """Starts watching the driver and its commands."""
+
+        self.watch_commands()
+        self.update_processes()
+        self._thread.start()
+        return self
+
+    def heartbeat(self):
+        """Signals that the collect makes progress (new page, new checkpoint, driver command)."""
+
+        self.last_heartbeat_time = time.time()
+        self.n_heartbeats += 1
+
+    def watch_commands(self):
+        """Wraps the `execute` method of the driver, through which selenium sends all
+        its commands, so that each completed command is a heartbeat."""
+
+        execute = getattr(self.driver, 'execute', None)
+        if execute is None:
+            return
+
+        def execute_with_heartbeat(*args, **kwargs):
+            result = execute(*args, **kwargs)
+            self.heartbeat()
+            return result
+
+        self.driver.execute = execute_with_heartbeat
+
+    def unwatch_commands(self):
+        """Restores the `execute` method of the driver (reused by a driver pool)."""
+
+        if 'execute' in getattr(self.driver, '__dict__', {}):
+            del self.driver.execute
+
+    def update_processes(self):
+        """Updates the processes of the tree, keeping the processes already sampled.
+
+        The first CPU percent of a process is always 0, so the new processes are
+        sampled once here.
+
+        Returns:
+            list[psutil.Process], Processes of the tree.
+        """
+
+        processes = {}
+        for process in get_process_tree(self.pid):
+            if process.pid in self.processes:
+                processes[process.pid] = self.processes[process.pid]
+                continue
+            processes[process.pid] = process
+            try:
+                process.cpu_percent(interval=None)
+            except Exception:
+                pass
+        self.processes = processes
+
+        return list(processes.values())
+
+    def _run(self):
+        while not self._stop_event.wait(self.sample_interval):
+            processes = self.update_processes()
+            if processes:
+                rss_mb, cpu_percent = sample_process_tree(processes)
+                self.n_samples += 1
+                self.peak_rss_mb = max(self.peak_rss_mb, rss_mb)
+                self.sum_cpu_percent += cpu_percent
+
+                if self.max_rss_mb and rss_mb > self.max_rss_mb:
+                    self._kill(KILL_REASON_BLOATED,
+                               f"RSS of {int(rss_mb)} MB over the {self.max_rss_mb} MB limit")
+                    return
+
+            if self.hang_timeout and \
+               time.time() - self.last_heartbeat_time > self.hang_timeout:
+                self._kill(KILL_REASON_HUNG,
+                           f"no progress for more than {self.hang_timeout} seconds")
+                return
+
+    def _kill(self, kill_reason, message):
+        self.kill_reason = kill_reason
+        print(f"[LOG] [WATCHDOG] Kill the browser: {message}.")
+        kill_process_tree(self.pid)
+
+    def stop(self):
+        """Stops watching the driver and logs its lifetime statistics.
+
+        Returns:
+            dict, Lifetime statistics of the driver.
+        """
+
+        self._stop_event.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.unwatch_commands()
+
+        stats_dict = {
+            'lifetime': round(time.time() - self.start_time, 3),
+            'n_heartbeats': self.n_heartbeats,
+            'peak_rss_mb': round(self.peak_rss_mb, 1),
+            'mean_cpu_percent': round(self.sum_cpu_percent / self.n_samples, 1)
+                                if self.n_samples else None,
+            'kill_reason': self.kill_reason,
+        }
+        print(f"[LOG] [WATCHDOG] Driver lifetime: {stats_dict['lifetime']} s, "
+              f"peak RSS: {stats_dict['peak_rss_mb']} MB, "
+              f"mean CPU: {stats_dict['mean_cpu_percent']} %, "
+              f"kill reason: {stats_dict['kill_reason']}.")
+
+        return stats_dict
+
+
+def start_watchdog(driver, driver_dict):
+    """Starts the watchdog of a driver with the limits of the driver dictionary.
+
+    Without psutil, the browser can't be killed with its Chrome processes, so it
+    isn't watched: the watchdog only counts the heartbeats.
+
+    Args:
+        driver (WebDriver): selenium webdriver.
+        driver_dict (dict): dictionary with information of the driver.
+
+    Returns:
+        DriverWatchdog, Started watchdog.
+    """
+
+    global _missing_psutil_logged
+    if import_psutil() is None:
+        if not _missing_psutil_logged:
+            _missing_psutil_logged = True
+            print("[LOG] [WATCHDOG] 'psutil' isn't installed, the browser isn't watched.")
+        return DriverWatchdog(driver=driver, hang_timeout=None, max_rss_mb=None,
+                              sample_interval=driver_dict.get('watchdog_sample_interval', 5)).start()
+
+    return DriverWatchdog(driver=driver,
+                          hang_timeout=driver_dict.get('hang_timeout', 1800),
+                          max_rss_mb=driver_dict.get('max_rss_mb', 3072),
+                          sample_interval=driver_dict.get('watchdog_sample_interval', 5)).start()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+
+import json
+import os
+
+from collector.packages.catalog import CATALOG_FILE_NAME, get_most_recent_file, list_files
+from collector.packages.save import save_data
+
+
+def test_catalog_lists_files_saved_before_it(tmp_path):
+    folder_path = str(tmp_path)
+    for second in range(3):
+        with open(os.path.join(folder_path, f"2024_01_31_12_00_0{second}_reviews_source.json"), 'w') as file:
+            json.dump([{'review_text': f"review {second}"}], file)
+
+    save_data(data=[{'review_text': 'new review'}], saved_data_type='reviews',
+              source='source', path=folder_path)
+
+    assert os.path.exists(os.path.join(folder_path, CATALOG_FILE_NAME))
+    assert len(list_files(folder_path=folder_path, data_type='reviews')) == 4
+
+
+def test_catalog_lists_files_not_saved_by_the_collector(tmp_path):
+    folder_path = str(tmp_path)
+    save_data(data=[{'review_text': 'saved review'}], saved_data_type='reviews',
+              source='source', path=folder_path)
+    copied_file_path = os.path.join(folder_path, '2099_01_31_12_00_00_reviews_source.json')
+    with open(copied_file_path, 'w') as file:
+        json.dump([{'review_text': 'copied review'}], file)
+
+    assert copied_file_path in list_files(folder_path=folder_path, data_type='reviews')
+    assert get_most_recent_file(folder_path=folder_path, data_type='reviews') == copied_file_path
+
+    os.remove(copied_file_path)
+    assert len(list_files(folder_path=folder_path, data_type='reviews')) == 1
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+
+import glob
+import json
+import os
+
+from collector.packages.aggregate import aggregate_products_files
+from collector.packages.index import IndexedJsonReader, write_indexed_json
+
+
+def test_offset_index_of_list_shaped_products_saves(tmp_path):
+    products_folder_path = str(tmp_path / 'products')
+    aggregated_products_folder_path = str(tmp_path / 'aggregated_products')
+    os.makedirs(products_folder_path)
+    os.makedirs(aggregated_products_folder_path)
+    saves = [
+        {'product_name': 'crème', 'product_brand': 'Nuxe', 'code_source': '1'},
+        [{'product_name': 'sérum', 'product_brand': 'Vichy', 'code_source': '2'},
+         {'product_name': 'gel', 'product_brand': 'Vichy', 'code_source': '3', 'code_ean': '36'}],
+    ]
+    for second, products in enumerate(saves):
+        with open(os.path.join(products_folder_path,
+                               f"2024_01_31_12_00_0{second}_products_source.json"), 'w') as file:
+            json.dump(products, file)
+
+    aggregate_products_files(source_dict={'source': 'source'},
+                             products_folder_path=products_folder_path,
+                             aggregated_products_folder_path=aggregated_products_folder_path,
+                             offset_index=True)
+
+    file_path, = glob.glob(os.path.join(aggregated_products_folder_path, '*_aggregated_products_*.json'))
+    with IndexedJsonReader(file_path) as reader:
+        assert len(reader) == 2
+        assert reader.find('code_source:1')[0]['code_source'] == '1'
+        assert [product['code_source'] for product in reader.find('code_source:3')[0]] == ['2', '3']
+        assert reader.find('ean:36') == reader.find('code_source:2')
+
+
+def test_key_index_spilled_to_runs(tmp_path):
+    records = [{'code_source': str(number % 7), 'code_ean': str(number)} for number in range(50)]
+    write_indexed_json(file_path=str(tmp_path / 'in_memory.json'), records=records)
+    write_indexed_json(file_path=str(tmp_path / 'spilled.json'), records=records, max_memory_entries=8)
+
+    with open(tmp_path / 'in_memory.json.keys', 'rb') as in_memory_file, \
+         open(tmp_path / 'spilled.json.keys', 'rb') as spilled_file:
+        assert in_memory_file.read() == spilled_file.read()
+    with IndexedJsonReader(str(tmp_path / 'spilled.json')) as reader:
+        assert reader.get_record_numbers('code_source:3') == [3, 10, 17, 24, 31, 38, 45]
+        assert reader.find('ean:42') == [records[42]]
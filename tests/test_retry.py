@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+
+from collector.packages.retry import (BLOCKED, EXTRACTION_FAILURE, PERMANENT_NOT_FOUND,
+                                      TRANSIENT_NETWORK, classify_page)
+
+
+class PageDriver:
+    """Driver of a loaded page, with its title and its HTTP status code if exposed."""
+
+    def __init__(self, title, status_code=None):
+        self.title = title
+        self.status_code = status_code
+
+    def execute_script(self, script, *args):
+        return self.status_code
+
+
+def test_classify_page_from_error_titles():
+    assert classify_page(driver=PageDriver(title="404 Page introuvable")) == PERMANENT_NOT_FOUND
+    assert classify_page(driver=PageDriver(title="Page not found | Site")) == PERMANENT_NOT_FOUND
+    assert classify_page(driver=PageDriver(title="Captcha - are you a robot?")) == BLOCKED
+    assert classify_page(driver=PageDriver(title="Crème Nuxe - Avis")) == EXTRACTION_FAILURE
+
+
+def test_classify_page_keeps_product_titles_retryable():
+    # Keywords of the error pages in product names aren't certain enough to stop the retries
+    assert classify_page(driver=PageDriver(title="Not Found Eau de Parfum - Site")) == TRANSIENT_NETWORK
+    assert classify_page(driver=PageDriver(title="Pack 404 - Site")) == TRANSIENT_NETWORK
+    assert classify_page(driver=PageDriver(title="Air Max 4040 - Site")) == EXTRACTION_FAILURE
+    assert classify_page(driver=PageDriver(title="Unblocked Serum - Site")) == EXTRACTION_FAILURE
+
+
+def test_classify_page_from_status_codes():
+    assert classify_page(driver=PageDriver(title="Site", status_code=404)) == PERMANENT_NOT_FOUND
+    assert classify_page(driver=PageDriver(title="Site", status_code=429)) == BLOCKED
+    assert classify_page(driver=PageDriver(title="Site", status_code=503)) == TRANSIENT_NETWORK
+    assert classify_page(driver=PageDriver(title="Pack 404", status_code=200)) == TRANSIENT_NETWORK
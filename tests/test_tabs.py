@@ -0,0 +1,27 @@
+#!/usr/bin/env python
+
+from collector.packages.fakedriver import FakeDriver
+from collector.packages.tabs import dispatch_in_tabs
+from collector.packages import testsite
+
+
+def test_tabs_process_the_page_of_their_url():
+    test_site = testsite.TestSite(n_products=20, latency=0.01)
+    urls = [f"{test_site.base_url}/p/{test_site.get_product(product_number)['code']}"
+            for product_number in range(12)]
+    collected_skus = {}
+
+    def process_url(tab_driver, url):
+        tab_driver.get(url)
+        product = testsite.get_ld_json(tab_driver.page_source, 'Product')
+        collected_skus[url] = product['sku'] if product is not None else None
+
+    driver = FakeDriver(test_site=test_site)
+    try:
+        remaining_urls = dispatch_in_tabs(driver=driver, items=urls, get_url=lambda url: url,
+                                          process_item=process_url, n_tabs=4)
+    finally:
+        driver.quit()
+
+    assert remaining_urls == []
+    assert collected_skus == {url: url.rsplit('/', 1)[1] for url in urls}